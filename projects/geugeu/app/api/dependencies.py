@@ -1,21 +1,18 @@
 from typing import Annotated
 
-import jwt
 from fastapi import Depends, HTTPException
 from fastapi.security import APIKeyHeader
 from jwt.exceptions import InvalidTokenError
 from pydantic import ValidationError
 
-from app.core.config import settings
 from app.core.dependencies import AuthServiceDep
-from app.core.security import ALGORITHM
+from app.core.security import decode_access_token
 from app.models import User
-from app.schemas.auth import TokenPayload
 
 api_key_header = APIKeyHeader(name="Authorization", auto_error=False)
 
 
-def get_current_user_optional(
+async def get_current_user_optional(
     token: Annotated[str | None, Depends(api_key_header)],
     auth_service: AuthServiceDep,
 ) -> User | None:
@@ -25,13 +22,15 @@ def get_current_user_optional(
         token_type, token_value = token.split(" ")
         if token_type != "Bearer":
             return None
-        payload = jwt.decode(token_value, settings.SECRET_KEY, algorithms=[ALGORITHM])
-        token_data = TokenPayload(**payload)
+        sub = await decode_access_token(token_value)
     except (InvalidTokenError, ValidationError, AttributeError, ValueError):
         return None
-    if token_data.sub is None:
+    if sub is None:
         return None
-    user = auth_service.get_user_by_code(token_data.sub)
+    user = await auth_service.get_authenticated_user(sub)
+    if user is not None:
+        # 쓰기 직후의 조회를 primary로 보낼 수 있도록 요청 세션에 유저를 기록합니다.
+        auth_service.db.info["user_id"] = user.id
     return user
 
 
@@ -45,3 +44,12 @@ def get_current_user(
 
 CurrentUserDep = Annotated[User, Depends(get_current_user)]
 CurrentUserOptionalDep = Annotated[User | None, Depends(get_current_user_optional)]
+
+
+def get_current_admin_user(user: CurrentUserDep) -> User:
+    if not user.is_admin:
+        raise HTTPException(status_code=403, detail="Forbidden")
+    return user
+
+
+AdminUserDep = Annotated[User, Depends(get_current_admin_user)]
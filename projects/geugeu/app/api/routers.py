@@ -5,8 +5,10 @@ from app.api.routes import (
     drawing_comments,
     drawings,
     interests,
+    metrics,
     post_comments,
     posts,
+    uploads,
     users,
 )
 
@@ -46,3 +48,13 @@ api_router.include_router(
     interests.router,
     tags=["interests"],
 )
+api_router.include_router(
+    metrics.router,
+    prefix="/metrics",
+    tags=["metrics"],
+)
+api_router.include_router(
+    uploads.router,
+    prefix="/uploads",
+    tags=["uploads"],
+)
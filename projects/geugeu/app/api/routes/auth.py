@@ -6,6 +6,7 @@ from fastapi import APIRouter, Depends, Form, HTTPException, Query, Request
 from fastapi.security import OAuth2PasswordRequestForm
 
 from app.core.dependencies import AuthServiceDep
+from app.core.executors import crypto_executor
 from app.core.security import create_access_token, verify_password
 from app.schemas.auth import Token
 
@@ -17,10 +18,12 @@ async def login(
     form_data: Annotated[OAuth2PasswordRequestForm, Depends()],
     service: AuthServiceDep,
 ):
-    user = service.get_user_by_email(form_data.username)
+    user = await service.get_user_by_email(form_data.username)
     if not user:
         raise HTTPException(status_code=401, detail="Incorrect username or password")
-    if not verify_password(form_data.password, user.password or ""):
+    if not await crypto_executor.run(
+        verify_password, form_data.password, user.password or ""
+    ):
         raise HTTPException(status_code=401, detail="Incorrect username or password")
     return Token(
         access_token=create_access_token(user.code, expires_delta=timedelta(days=1)),
@@ -51,7 +54,7 @@ async def google_oauth_callback(
 ):
     # TODO: state 검증 (CSRF 공격 방지)
     redirect_uri = urljoin(str(request.base_url), "/api/auth/google")
-    return service.google_login(code, redirect_uri)
+    return await service.google_login(code, redirect_uri)
 
 
 @router.post(
@@ -77,4 +80,4 @@ async def apple_oauth_callback(
     code: str = Form(...),
 ):
     redirect_uri = urljoin(str(request.base_url), "/api/auth/apple")
-    return service.apple_login(code, redirect_uri)
+    return await service.apple_login(code, redirect_uri)
@@ -1,8 +1,12 @@
-from fastapi import APIRouter
+from typing import Annotated
+
+from fastapi import APIRouter, Query, Request
 
 from app.api.dependencies import CurrentUserDep
 from app.core.dependencies import DrawingCommentServiceDep
+from app.core.responses import FastJSONResponse
 from app.schemas.drawing_comments import (
+    CommentListFilter,
     CommentListSchema,
     CommentSchema,
     CreateCommentSchema,
@@ -23,7 +27,7 @@ async def create_comment(
     current_user: CurrentUserDep,
     service: DrawingCommentServiceDep,
 ):
-    return service.create_comment(
+    return await service.create_comment(
         user=current_user,
         drawing_code=drawing_code,
         payload=payload,
@@ -33,13 +37,20 @@ async def create_comment(
 @router.get("/{drawing_code}/comments", response_model=CommentListSchema)
 async def get_comments(
     drawing_code: str,
+    request: Request,
     current_user: CurrentUserDep,
     service: DrawingCommentServiceDep,
+    filters: Annotated[CommentListFilter, Query()],
 ):
-    return service.get_comments(
+    validator = await service.get_comments_validator(drawing_code=drawing_code)
+    if response := validator.not_modified(request):
+        return response
+    comments = await service.get_comments(
         user=current_user,
         drawing_code=drawing_code,
+        filters=filters,
     )
+    return validator.apply(FastJSONResponse(comments))
 
 
 @router.get(
@@ -52,11 +63,35 @@ async def get_comment(
     current_user: CurrentUserDep,
     service: DrawingCommentServiceDep,
 ):
-    return service.get_comment(
+    return await service.get_comment(
+        user=current_user,
+        drawing_code=drawing_code,
+        comment_code=comment_code,
+    )
+
+
+@router.get(
+    "/{drawing_code}/comments/{comment_code}/replies",
+    response_model=CommentListSchema,
+)
+async def get_replies(
+    drawing_code: str,
+    comment_code: str,
+    request: Request,
+    current_user: CurrentUserDep,
+    service: DrawingCommentServiceDep,
+    filters: Annotated[CommentListFilter, Query()],
+):
+    validator = await service.get_comments_validator(drawing_code=drawing_code)
+    if response := validator.not_modified(request):
+        return response
+    replies = await service.get_replies(
         user=current_user,
         drawing_code=drawing_code,
         comment_code=comment_code,
+        filters=filters,
     )
+    return validator.apply(FastJSONResponse(replies))
 
 
 @router.put("/{drawing_code}/comments/{comment_code}", response_model=CommentSchema)
@@ -67,7 +102,7 @@ async def update_comment(
     current_user: CurrentUserDep,
     service: DrawingCommentServiceDep,
 ):
-    return service.update_comment(
+    return await service.update_comment(
         user=current_user,
         drawing_code=drawing_code,
         comment_code=comment_code,
@@ -82,7 +117,7 @@ async def delete_comment(
     current_user: CurrentUserDep,
     service: DrawingCommentServiceDep,
 ):
-    service.delete_comment(
+    await service.delete_comment(
         user=current_user,
         drawing_code=drawing_code,
         comment_code=comment_code,
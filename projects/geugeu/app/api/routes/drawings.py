@@ -1,9 +1,10 @@
 from typing import Annotated
 
-from fastapi import APIRouter, File, Form, Query, UploadFile
+from fastapi import APIRouter, File, Form, Query, Request, UploadFile
 
 from app.api.dependencies import CurrentUserDep
 from app.core.dependencies import DrawingServiceDep
+from app.core.responses import FastJSONResponse
 from app.schemas.drawings import DrawingListFilter, DrawingListSchema, DrawingSchema
 
 router = APIRouter()
@@ -15,9 +16,12 @@ async def create_drawing(
     service: DrawingServiceDep,
     post_code: str = Form(...),
     content: str = Form(...),
-    files: list[UploadFile] = File(...),
+    files: list[UploadFile] = File([]),
+    image_keys: list[str] = Form([]),
 ):
-    return service.create_drawing(current_user, post_code, content, files)
+    return await service.create_drawing(
+        current_user, post_code, content, files, image_keys
+    )
 
 
 @router.get("", response_model=DrawingListSchema)
@@ -26,16 +30,24 @@ async def get_drawings(
     service: DrawingServiceDep,
     filters: Annotated[DrawingListFilter, Query()],
 ):
-    return service.get_drawings(filters)
+    return FastJSONResponse(await service.get_drawings(filters))
 
 
 @router.get("/{drawing_code}", response_model=DrawingSchema)
 async def get_drawing(
     drawing_code: str,
+    request: Request,
     current_user: CurrentUserDep,
     service: DrawingServiceDep,
 ):
-    return service.get_drawing(drawing_code)
+    # 상태 행 하나로 304 여부와 캐시 key를 함께 정합니다.
+    state = await service.get_drawing_state(drawing_code)
+    validator = service.get_drawing_validator(state)
+    if response := validator.not_modified(request):
+        return response
+    return validator.apply(
+        FastJSONResponse(await service.get_drawing(drawing_code, state))
+    )
 
 
 @router.put("/{drawing_code}", response_model=DrawingSchema)
@@ -44,13 +56,15 @@ async def update_drawing(
     current_user: CurrentUserDep,
     service: DrawingServiceDep,
     content: str = Form(...),
-    files: list[UploadFile] = File(...),
+    files: list[UploadFile] = File([]),
+    image_keys: list[str] = Form([]),
 ):
-    return service.update_drawing(
+    return await service.update_drawing(
         user=current_user,
         code=drawing_code,
         content=content,
         files=files,
+        image_keys=image_keys,
     )
 
 
@@ -60,4 +74,4 @@ async def delete_drawing(
     current_user: CurrentUserDep,
     service: DrawingServiceDep,
 ):
-    service.delete_drawing(code=drawing_code, user=current_user)
+    await service.delete_drawing(code=drawing_code, user=current_user)
@@ -13,7 +13,7 @@ async def toggle_interest(
     current_user: CurrentUserDep,
     service: InterestServiceDep,
 ):
-    return service.toggle_interest(current_user, post_code)
+    return await service.toggle_interest(current_user, post_code)
 
 
 @router.get(
@@ -27,8 +27,11 @@ async def get_post_interests(
     service: InterestServiceDep,
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=0, le=100),
+    include_count: bool = Query(True),
 ):
-    return service.get_post_interests(post_code, current_user, page, page_size)
+    return await service.get_post_interests(
+        post_code, current_user, page, page_size, include_count
+    )
 
 
 @router.get(
@@ -41,5 +44,6 @@ async def get_user_interests(
     service: InterestServiceDep,
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
+    include_count: bool = Query(True),
 ):
-    return service.get_user_interests(user_code, page, page_size)
+    return await service.get_user_interests(user_code, page, page_size, include_count)
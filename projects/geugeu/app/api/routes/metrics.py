@@ -0,0 +1,31 @@
+from fastapi import APIRouter
+
+from app.api.dependencies import AdminUserDep
+from app.core.cache import caches
+from app.core.clients import http_client_stats, s3_client_stats
+from app.core.db import engine, replica_engine
+from app.core.dependencies import HTTPClientDep, S3ClientDep
+from app.core.executors import executors
+from app.core.pool import pool_stats
+
+router = APIRouter()
+
+
+@router.get("")
+async def get_metrics(
+    current_user: AdminUserDep,
+    s3_client: S3ClientDep,
+    http_client: HTTPClientDep,
+):
+    metrics = {
+        "db": pool_stats(engine.pool),
+        "executors": {executor.name: executor.stats() for executor in executors},
+        "caches": {cache.name: cache.stats() for cache in caches},
+        "clients": {
+            "s3": s3_client_stats(s3_client),
+            "http": http_client_stats(http_client),
+        },
+    }
+    if replica_engine is not None:
+        metrics["db_replica"] = pool_stats(replica_engine.pool)
+    return metrics
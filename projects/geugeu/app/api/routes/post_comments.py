@@ -1,8 +1,12 @@
-from fastapi import APIRouter
+from typing import Annotated
+
+from fastapi import APIRouter, Query, Request
 
 from app.api.dependencies import CurrentUserDep
 from app.core.dependencies import PostCommentServiceDep
+from app.core.responses import FastJSONResponse
 from app.schemas.post_comments import (
+    CommentListFilter,
     CommentListSchema,
     CommentSchema,
     CreateCommentSchema,
@@ -19,7 +23,7 @@ async def create_comment(
     current_user: CurrentUserDep,
     service: PostCommentServiceDep,
 ):
-    return service.create_comment(
+    return await service.create_comment(
         user=current_user,
         post_code=post_code,
         payload=payload,
@@ -29,13 +33,20 @@ async def create_comment(
 @router.get("/{post_code}/comments", response_model=CommentListSchema)
 async def get_comments(
     post_code: str,
+    request: Request,
     current_user: CurrentUserDep,
     service: PostCommentServiceDep,
+    filters: Annotated[CommentListFilter, Query()],
 ):
-    return service.get_comments(
+    validator = await service.get_comments_validator(post_code=post_code)
+    if response := validator.not_modified(request):
+        return response
+    comments = await service.get_comments(
         user=current_user,
         post_code=post_code,
+        filters=filters,
     )
+    return validator.apply(FastJSONResponse(comments))
 
 
 @router.get("/{post_code}/comments/{comment_code}", response_model=CommentSchema)
@@ -45,11 +56,35 @@ async def get_comment(
     current_user: CurrentUserDep,
     service: PostCommentServiceDep,
 ):
-    return service.get_comment(
+    return await service.get_comment(
+        user=current_user,
+        post_code=post_code,
+        comment_code=comment_code,
+    )
+
+
+@router.get(
+    "/{post_code}/comments/{comment_code}/replies",
+    response_model=CommentListSchema,
+)
+async def get_replies(
+    post_code: str,
+    comment_code: str,
+    request: Request,
+    current_user: CurrentUserDep,
+    service: PostCommentServiceDep,
+    filters: Annotated[CommentListFilter, Query()],
+):
+    validator = await service.get_comments_validator(post_code=post_code)
+    if response := validator.not_modified(request):
+        return response
+    replies = await service.get_replies(
         user=current_user,
         post_code=post_code,
         comment_code=comment_code,
+        filters=filters,
     )
+    return validator.apply(FastJSONResponse(replies))
 
 
 @router.put("/{post_code}/comments/{comment_code}", response_model=CommentSchema)
@@ -60,7 +95,7 @@ async def update_comment(
     current_user: CurrentUserDep,
     service: PostCommentServiceDep,
 ):
-    return service.update_comment(
+    return await service.update_comment(
         user=current_user,
         post_code=post_code,
         comment_code=comment_code,
@@ -75,7 +110,7 @@ async def delete_comment(
     current_user: CurrentUserDep,
     service: PostCommentServiceDep,
 ):
-    service.delete_comment(
+    await service.delete_comment(
         user=current_user,
         post_code=post_code,
         comment_code=comment_code,
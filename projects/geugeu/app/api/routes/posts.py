@@ -1,9 +1,10 @@
 from typing import Annotated
 
-from fastapi import APIRouter, File, Form, Query, UploadFile
+from fastapi import APIRouter, File, Form, Query, Request, UploadFile
 
 from app.api.dependencies import CurrentUserDep
 from app.core.dependencies import PostServiceDep
+from app.core.responses import FastJSONResponse
 from app.schemas.posts import PostListFilter, PostListSchema, PostSchema
 
 router = APIRouter()
@@ -15,9 +16,10 @@ async def create_post(
     service: PostServiceDep,
     title: str = Form(...),
     content: str = Form(...),
-    files: list[UploadFile] = File(...),
+    files: list[UploadFile] = File([]),
+    image_keys: list[str] = Form([]),
 ):
-    return service.create_post(current_user, title, content, files)
+    return await service.create_post(current_user, title, content, files, image_keys)
 
 
 @router.get("", response_model=PostListSchema)
@@ -26,16 +28,22 @@ async def get_posts(
     service: PostServiceDep,
     filters: Annotated[PostListFilter, Query()],
 ):
-    return service.get_posts(filters)
+    return FastJSONResponse(await service.get_posts(filters, current_user))
 
 
 @router.get("/{post_code}", response_model=PostSchema)
 async def get_post(
     post_code: str,
+    request: Request,
     current_user: CurrentUserDep,
     service: PostServiceDep,
 ):
-    return service.get_post(post_code)
+    # 상태 행 하나로 304 여부와 캐시 key를 함께 정합니다.
+    state = await service.get_post_state(post_code, current_user)
+    validator = service.get_post_validator(state)
+    if response := validator.not_modified(request):
+        return response
+    return validator.apply(FastJSONResponse(await service.get_post(post_code, state)))
 
 
 @router.put("/{post_code}", response_model=PostSchema)
@@ -45,14 +53,16 @@ async def update_post(
     service: PostServiceDep,
     title: str = Form(...),
     content: str = Form(...),
-    files: list[UploadFile] = File(...),
+    files: list[UploadFile] = File([]),
+    image_keys: list[str] = Form([]),
 ):
-    return service.update_post(
+    return await service.update_post(
         code=post_code,
         user=current_user,
         title=title,
         content=content,
         files=files,
+        image_keys=image_keys,
     )
 
 
@@ -62,4 +72,4 @@ async def delete_post(
     current_user: CurrentUserDep,
     service: PostServiceDep,
 ):
-    service.delete_post(code=post_code, user=current_user)
+    await service.delete_post(code=post_code, user=current_user)
@@ -0,0 +1,18 @@
+from fastapi import APIRouter
+
+from app.api.dependencies import CurrentUserDep
+from app.core.dependencies import UploadServiceDep
+from app.schemas.uploads import UploadCreateSchema, UploadListSchema
+
+router = APIRouter()
+
+
+@router.post("", status_code=201, response_model=UploadListSchema)
+async def create_uploads(
+    payload: UploadCreateSchema,
+    current_user: CurrentUserDep,
+    service: UploadServiceDep,
+):
+    # 발급한 URL로 S3에 직접 올린 뒤, 게시글/그림/프로필 이미지를 만들거나 수정할 때
+    # 파일 대신 key를 보냅니다.
+    return await service.create_uploads(current_user, payload)
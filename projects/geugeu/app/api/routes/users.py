@@ -1,4 +1,4 @@
-from fastapi import APIRouter, File, UploadFile
+from fastapi import APIRouter, File, Form, UploadFile
 
 from app.api.dependencies import CurrentUserDep
 from app.core.dependencies import UserServiceDep
@@ -12,7 +12,7 @@ async def sign_up(
     payload: SignupSchema,
     service: UserServiceDep,
 ):
-    return service.create_user(payload)
+    return await service.create_user(payload)
 
 
 @router.get("/me", response_model=UserSchema)
@@ -26,16 +26,17 @@ async def update_me(
     current_user: CurrentUserDep,
     service: UserServiceDep,
 ):
-    return service.update_user(current_user, payload)
+    return await service.update_user(current_user, payload)
 
 
 @router.put("/me/profile-image", response_model=UserSchema)
 async def upload_profile_image(
     current_user: CurrentUserDep,
     service: UserServiceDep,
-    file: UploadFile = File(...),
+    file: UploadFile | None = File(None),
+    image_key: str | None = Form(None),
 ):
-    return service.update_profile_image(current_user, file)
+    return await service.update_profile_image(current_user, file, image_key)
 
 
 @router.delete("/me", status_code=204)
@@ -43,4 +44,4 @@ async def delete_me(
     current_user: CurrentUserDep,
     service: UserServiceDep,
 ):
-    service.delete_user(current_user)
+    await service.delete_user(current_user)
@@ -0,0 +1,212 @@
+import hashlib
+import json
+import logging
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Protocol
+
+from redis import RedisError
+from redis.asyncio import Redis
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class Cache(Protocol):
+    name: str
+
+    async def get(self, key: str) -> Any | None: ...
+
+    async def set(self, key: str, value: Any, *, ttl: float | None = None) -> None: ...
+
+    async def delete(self, key: str) -> None: ...
+
+    def stats(self) -> dict[str, Any]: ...
+
+
+class LRUCache:
+    """프로세스 안에서만 쓰는 TTL + LRU 캐시.
+
+    max_size를 넘으면 가장 오래 사용하지 않은 항목부터 버립니다.
+    """
+
+    def __init__(self, name: str, *, max_size: int, ttl: float):
+        self.name = name
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    async def get(self, key: str) -> Any | None:
+        entry = self._entries.get(key)
+        if entry is None or entry[0] <= time.monotonic():
+            if entry is not None:
+                del self._entries[key]
+            self._misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self._hits += 1
+        return entry[1]
+
+    async def set(self, key: str, value: Any, *, ttl: float | None = None) -> None:
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self._evictions += 1
+
+    async def delete(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "backend": "memory",
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self._hits,
+            "misses": self._misses,
+            "hit_ratio": _hit_ratio(self._hits, self._misses),
+            "evictions": self._evictions,
+        }
+
+
+class RedisCache:
+    """여러 워커가 함께 쓰는 Redis 캐시. 값은 JSON으로 저장합니다.
+
+    Redis에 접근하지 못하면 캐시가 없는 것처럼 동작합니다.
+    """
+
+    def __init__(self, name: str, client: Redis, *, ttl: float):
+        self.name = name
+        self.ttl = ttl
+        self._client = client
+        self._prefix = f"geugeu:{name}:"
+        self._hits = 0
+        self._misses = 0
+        self._errors = 0
+
+    async def get(self, key: str) -> Any | None:
+        try:
+            raw = await self._client.get(self._prefix + key)
+        except RedisError:
+            logger.warning("Failed to read %s cache", self.name, exc_info=True)
+            self._errors += 1
+            raw = None
+        if raw is None:
+            self._misses += 1
+            return None
+        self._hits += 1
+        return json.loads(raw)
+
+    async def set(self, key: str, value: Any, *, ttl: float | None = None) -> None:
+        ttl = self.ttl if ttl is None else ttl
+        try:
+            await self._client.set(
+                self._prefix + key, json.dumps(value), px=int(ttl * 1000)
+            )
+        except RedisError:
+            logger.warning("Failed to write %s cache", self.name, exc_info=True)
+            self._errors += 1
+
+    async def delete(self, key: str) -> None:
+        try:
+            await self._client.delete(self._prefix + key)
+        except RedisError:
+            # 지우지 못한 항목은 TTL이 지나면 사라집니다.
+            logger.error("Failed to invalidate %s cache", self.name, exc_info=True)
+            self._errors += 1
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "backend": "redis",
+            "hits": self._hits,
+            "misses": self._misses,
+            "hit_ratio": _hit_ratio(self._hits, self._misses),
+            "errors": self._errors,
+        }
+
+
+def _hit_ratio(hits: int, misses: int) -> float:
+    return hits / (hits + misses) if hits + misses else 0.0
+
+
+def versioned_key(key: str, *versions: datetime | None) -> str:
+    """key 뒤에 updated_at들의 해시를 붙입니다.
+
+    값이 바뀌면 키도 바뀌므로 다른 워커의 LRU 캐시에 남은 이전 항목을 읽지 않고,
+    지우지 않은 이전 항목은 TTL이나 max_size에 따라 버려집니다.
+    """
+    parts = [version and version.isoformat() for version in versions]
+    digest = hashlib.sha1(repr(parts).encode(), usedforsecurity=False).hexdigest()
+    return f"{key}:{digest[:16]}"
+
+
+_redis = Redis.from_url(settings.CACHE_REDIS_URL) if settings.CACHE_REDIS_URL else None
+
+
+async def close_redis() -> None:
+    if _redis is not None:
+        await _redis.aclose()
+
+
+def create_cache(name: str, *, max_size: int, ttl: float, local: bool = False) -> Cache:
+    """CACHE_REDIS_URL이 있으면 Redis, 없으면 프로세스 안의 LRU 캐시를 만듭니다.
+
+    local=True면 CACHE_REDIS_URL과 관계없이 프로세스 안에만 캐시합니다.
+    """
+    cache: Cache
+    if _redis is not None and not local:
+        cache = RedisCache(name, _redis, ttl=ttl)
+    else:
+        cache = LRUCache(name, max_size=max_size, ttl=ttl)
+    caches.append(cache)
+    return cache
+
+
+caches: list[Cache] = []
+
+# 인증된 유저의 스냅샷 (key: 유저 code)
+user_cache = create_cache(
+    "users",
+    max_size=settings.USER_CACHE_MAX_SIZE,
+    ttl=settings.USER_CACHE_TTL_SECONDS,
+)
+
+# 서명을 검증한 액세스 토큰의 subject (key: 토큰의 SHA-256)
+# 인증 정보가 워커 밖으로 나가지 않도록 프로세스 안에만 저장합니다.
+token_cache = create_cache(
+    "tokens",
+    max_size=settings.TOKEN_CACHE_MAX_SIZE,
+    ttl=settings.TOKEN_CACHE_TTL_SECONDS,
+    local=True,
+)
+
+# 최근에 쓰기를 한 유저 (key: 유저 id)
+# 항목이 있는 동안 read_replica로 감싼 조회도 primary에서 읽습니다. Redis를 쓰면 다음
+# 요청이 다른 워커로 가도 자신이 쓴 내용을 읽을 수 있습니다.
+writer_cache = create_cache(
+    "writers",
+    max_size=settings.POSTGRES_REPLICA_STICKY_MAX_USERS,
+    ttl=settings.POSTGRES_REPLICA_STICKY_SECONDS,
+)
+
+# post, drawing 상세 응답에서 관심/댓글/그림 수와 관심 여부를 뺀 값
+# (key: versioned_key(code, 본문, 작성자, 이미지의 updated_at))
+post_cache = create_cache(
+    "posts",
+    max_size=settings.DETAIL_CACHE_MAX_SIZE,
+    ttl=settings.DETAIL_CACHE_TTL_SECONDS,
+)
+drawing_cache = create_cache(
+    "drawings",
+    max_size=settings.DETAIL_CACHE_MAX_SIZE,
+    ttl=settings.DETAIL_CACHE_TTL_SECONDS,
+)
@@ -0,0 +1,108 @@
+import threading
+from typing import TYPE_CHECKING, Any
+
+import boto3
+import httpx
+from botocore.config import Config
+
+from app.core.config import settings
+
+if TYPE_CHECKING:
+    from mypy_boto3_s3 import S3Client
+
+
+class HTTPClientMetrics:
+    """httpx 클라이언트가 보낸 요청 수와 새로 연 커넥션 수.
+
+    요청 수에서 커넥션 수를 뺀 만큼 keep-alive 커넥션을 재사용한 것입니다.
+    """
+
+    def __init__(self) -> None:
+        self.requests = 0
+        self.connections = 0
+
+    async def on_request(self, request: httpx.Request) -> None:
+        self.requests += 1
+        request.extensions["trace"] = self._trace
+
+    async def _trace(self, event_name: str, info: dict[str, Any]) -> None:
+        if event_name == "connection.connect_tcp.complete":
+            self.connections += 1
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "requests": self.requests,
+            "connections": self.connections,
+            "reused": self.requests - self.connections,
+        }
+
+
+class S3ClientMetrics:
+    """boto3 클라이언트가 호출한 API 수와 보낸 HTTP 요청 수.
+
+    botocore의 공개 이벤트로 셉니다. 재시도한 요청도 HTTP 요청으로 세므로 요청 수에서
+    호출 수를 뺀 만큼 재시도한 것입니다. s3_executor의 여러 스레드가 함께 부르므로
+    락으로 보호합니다.
+    """
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.requests = 0
+        self._lock = threading.Lock()
+
+    def register(self, client: "S3Client") -> None:
+        events = client.meta.events
+        events.register("before-send.s3", self._on_send)
+        events.register("after-call.s3", self._on_call)
+        events.register("after-call-error.s3", self._on_call)
+
+    def _on_send(self, **kwargs: Any) -> None:
+        # None을 돌려줘야 botocore가 요청을 그대로 보냅니다.
+        with self._lock:
+            self.requests += 1
+
+    def _on_call(self, **kwargs: Any) -> None:
+        with self._lock:
+            self.calls += 1
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "requests": self.requests,
+                "retries": max(0, self.requests - self.calls),
+            }
+
+
+def create_s3_client() -> "S3Client":
+    # boto3 클라이언트는 스레드에 안전하므로 s3_executor의 스레드가 함께 사용합니다.
+    client = boto3.session.Session().client(
+        "s3",
+        config=Config(max_pool_connections=settings.S3_EXECUTOR_MAX_WORKERS),
+    )
+    metrics = S3ClientMetrics()
+    metrics.register(client)
+    client.metrics = metrics  # type: ignore[attr-defined]
+    return client
+
+
+def create_http_client() -> httpx.AsyncClient:
+    metrics = HTTPClientMetrics()
+    client = httpx.AsyncClient(
+        limits=httpx.Limits(
+            max_connections=settings.HTTP_CLIENT_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.HTTP_CLIENT_MAX_CONNECTIONS,
+        ),
+        timeout=settings.HTTP_CLIENT_TIMEOUT_SECONDS,
+        event_hooks={"request": [metrics.on_request]},
+    )
+    client.metrics = metrics  # type: ignore[attr-defined]
+    return client
+
+
+def s3_client_stats(client: "S3Client") -> dict[str, int]:
+    return client.metrics.stats()  # type: ignore[attr-defined]
+
+
+def http_client_stats(client: httpx.AsyncClient) -> dict[str, int]:
+    return client.metrics.stats()  # type: ignore[attr-defined]
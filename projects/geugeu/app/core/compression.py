@@ -0,0 +1,134 @@
+"""응답 본문을 Accept-Encoding에 맞춰 br 또는 gzip으로 압축하는 ASGI 미들웨어.
+
+목록 응답은 같은 키와 URL이 반복되는 JSON이라 압축하면 크기가 크게 줄어듭니다.
+COMPRESSION_MINIMUM_SIZE보다 작은 본문은 압축해도 줄어드는 양이 헤더 수준이므로
+그대로 보내고, COMPRESSION_OFFLOAD_SIZE 이상인 본문은 이벤트 루프를 막지 않도록
+compression_executor의 스레드에서 압축합니다(zlib와 brotli 모두 압축하는 동안 GIL을
+놓습니다). 본문을 여러 번 나눠 보내는 스트리밍 응답은 압축하지 않습니다.
+"""
+
+import gzip
+
+import brotli
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.executors import BoundedExecutor
+
+# 클라이언트가 같은 q로 받겠다고 하면 앞의 인코딩을 고릅니다.
+ENCODINGS = ("br", "gzip")
+
+
+def choose_encoding(accept_encoding: str) -> str | None:
+    """Accept-Encoding 헤더에서 응답에 쓸 인코딩을 고릅니다. 압축하지 않으면 None."""
+    qualities: dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        name, *params = (part.strip() for part in item.split(";"))
+        quality = 1.0
+        for param in params:
+            key, _, value = param.partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if name:
+            qualities[name.lower()] = quality
+
+    default = qualities.get("*", 0.0)
+    quality, encoding = max(
+        ((qualities.get(encoding, default), encoding) for encoding in ENCODINGS),
+        key=lambda candidate: candidate[0],
+    )
+    return encoding if quality > 0 else None
+
+
+def compress(body: bytes, encoding: str, gzip_level: int, brotli_quality: int) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=brotli_quality)
+    # mtime을 고정해서 같은 본문은 항상 같은 바이트로 압축합니다.
+    return gzip.compress(body, compresslevel=gzip_level, mtime=0)
+
+
+class CompressionMiddleware:
+    def __init__(
+        self,
+        app: ASGIApp,
+        *,
+        executor: BoundedExecutor,
+        minimum_size: int,
+        content_types: list[str],
+        offload_size: int,
+        gzip_level: int,
+        brotli_quality: int,
+    ):
+        self.app = app
+        self.executor = executor
+        self.minimum_size = minimum_size
+        self.content_types = {content_type.lower() for content_type in content_types}
+        self.offload_size = offload_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = choose_encoding(Headers(scope=scope).get("Accept-Encoding", ""))
+        start: Message = {}
+        started = False
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal start, started
+            if message["type"] == "http.response.start":
+                # 본문을 보고 압축 여부를 정한 뒤 헤더를 보냅니다.
+                start = message
+                return
+            if message["type"] != "http.response.body" or started:
+                await send(message)
+                return
+
+            started = True
+            headers = MutableHeaders(scope=start)
+            body = message.get("body", b"")
+            if not self._is_compressible(headers):
+                await send(start)
+                await send(message)
+                return
+
+            # 같은 URL이 Accept-Encoding에 따라 다른 본문을 돌려주므로 캐시에 알립니다.
+            headers.add_vary_header("Accept-Encoding")
+            if (
+                encoding is None
+                or message.get("more_body", False)
+                or len(body) < self.minimum_size
+            ):
+                await send(start)
+                await send(message)
+                return
+
+            body = await self._compress(body, encoding)
+            headers["Content-Encoding"] = encoding
+            headers["Content-Length"] = str(len(body))
+            # 바이트가 달라지므로 강한 ETag는 약한 ETag로 바꿉니다.
+            etag = headers.get("ETag")
+            if etag is not None and not etag.startswith("W/"):
+                headers["ETag"] = f"W/{etag}"
+            await send(start)
+            await send({"type": "http.response.body", "body": body})
+
+        await self.app(scope, receive, send_compressed)
+
+    def _is_compressible(self, headers: MutableHeaders) -> bool:
+        if "Content-Encoding" in headers:
+            return False
+        content_type = headers.get("Content-Type", "").split(";")[0].strip().lower()
+        return content_type in self.content_types
+
+    async def _compress(self, body: bytes, encoding: str) -> bytes:
+        if len(body) >= self.offload_size:
+            return await self.executor.run(
+                compress, body, encoding, self.gzip_level, self.brotli_quality
+            )
+        return compress(body, encoding, self.gzip_level, self.brotli_quality)
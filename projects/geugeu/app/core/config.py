@@ -17,6 +17,23 @@ class Settings(BaseSettings):
     POSTGRES_PORT: int
     POSTGRES_DB: str
 
+    # 워커 프로세스마다 만들어지는 커넥션 풀 설정
+    POSTGRES_POOL_SIZE: int = 5
+    POSTGRES_MAX_OVERFLOW: int = 10
+    POSTGRES_POOL_TIMEOUT: float = 30.0
+    POSTGRES_POOL_RECYCLE: int = 1800
+    POSTGRES_POOL_PRE_PING: bool = True
+    # PgBouncer(transaction pooling) 뒤에서 실행할 때는 NullPool을 사용합니다.
+    POSTGRES_PGBOUNCER: bool = False
+    # 읽기 전용 조회를 보낼 replica. 설정하지 않으면 모든 쿼리를 primary로 보냅니다.
+    POSTGRES_REPLICA_HOST: str | None = None
+    POSTGRES_REPLICA_PORT: int | None = None
+    # 쓰기를 한 유저의 조회를 primary로 고정하는 시간(초)
+    POSTGRES_REPLICA_STICKY_SECONDS: float = 5.0
+    # 워커마다 메모리에 기억하는 최근 쓰기 유저 수. CACHE_REDIS_URL이 있으면 모든 워커가
+    # Redis를 함께 씁니다.
+    POSTGRES_REPLICA_STICKY_MAX_USERS: int = 10000
+
     AWS_DEFAULT_REGION: str = "ap-northeast-2"
     AWS_S3_BUCKET_NAME: str
 
@@ -28,6 +45,82 @@ class Settings(BaseSettings):
     APPLE_KEY_ID: str
     APPLE_PRIVATE_KEY: str
 
+    # 필터 없는 목록의 전체 개수를 pg_class 통계로 추정하기 시작하는 행 수.
+    # 설정하지 않으면 항상 COUNT로 정확히 셉니다.
+    ESTIMATED_COUNT_MIN_ROWS: int | None = None
+
+    # 댓글 스레드를 읽을 최대 깊이(최상위 댓글이 1)
+    COMMENT_THREAD_MAX_DEPTH: int = 10
+    # 댓글 목록에서 댓글마다 함께 보여줄 답글 수
+    COMMENT_REPLY_PREVIEW_SIZE: int = 3
+
+    # 여러 워커가 함께 쓸 캐시 저장소. 설정하지 않으면 워커마다 메모리에 캐시합니다.
+    CACHE_REDIS_URL: str | None = None
+    # 인증된 유저 캐시. 유저 정보를 바꾸거나 탈퇴하면 바로 지웁니다.
+    USER_CACHE_TTL_SECONDS: float = 60.0
+    USER_CACHE_MAX_SIZE: int = 10000
+    # 검증한 액세스 토큰 캐시. 토큰의 exp가 지나면 TTL보다 먼저 버립니다.
+    TOKEN_CACHE_TTL_SECONDS: float = 3600.0
+    TOKEN_CACHE_MAX_SIZE: int = 10000
+    # post, drawing 상세 캐시. 내용이 바뀌면 키가 바뀌므로 TTL은 메모리를 비우는 용도입니다.
+    DETAIL_CACHE_TTL_SECONDS: float = 600.0
+    DETAIL_CACHE_MAX_SIZE: int = 10000
+
+    # 외부 API(OAuth 등)를 호출하는 httpx 클라이언트의 커넥션 수와 타임아웃
+    HTTP_CLIENT_MAX_CONNECTIONS: int = 20
+    HTTP_CLIENT_TIMEOUT_SECONDS: float = 10.0
+
+    # 백그라운드 작업 워커가 동시에 처리할 작업 수와 빈 큐를 다시 확인하는 간격
+    JOB_WORKER_CONCURRENCY: int = 4
+    JOB_POLL_INTERVAL_SECONDS: float = 1.0
+    # 실패한 작업은 BASE * 2^(시도 횟수 - 1)초(최대 MAX초) 뒤에 다시 시도합니다.
+    JOB_MAX_ATTEMPTS: int = 5
+    JOB_RETRY_BASE_SECONDS: float = 5.0
+    JOB_RETRY_MAX_SECONDS: float = 600.0
+
+    # 이벤트 루프 밖에서 실행할 동기 작업의 스레드 풀 크기
+    CRYPTO_EXECUTOR_MAX_WORKERS: int = 4
+    S3_EXECUTOR_MAX_WORKERS: int = 8
+    # 이미지 축소본을 만드는 프로세스 수
+    IMAGE_EXECUTOR_MAX_WORKERS: int = 2
+    # 큰 응답 본문을 압축하는 스레드 수
+    COMPRESSION_EXECUTOR_MAX_WORKERS: int = 2
+    # 요청 하나가 동시에 업로드할 수 있는 파일 수
+    S3_UPLOAD_CONCURRENCY: int = 4
+    # 이 크기(bytes)보다 큰 파일은 청크 크기만큼 나눠 multipart upload로 올립니다.
+    # S3는 마지막을 제외한 청크가 5MiB 이상이어야 합니다.
+    S3_MULTIPART_THRESHOLD: int = 8 * 1024 * 1024
+    S3_MULTIPART_CHUNK_SIZE: int = 8 * 1024 * 1024
+
+    # 클라이언트가 S3에 직접 올릴 때 한 번에 받을 수 있는 URL 수와 URL 유효 시간
+    UPLOAD_MAX_FILES: int = 10
+    UPLOAD_URL_EXPIRES_SECONDS: int = 600
+    # 업로드한 이미지마다 만드는 축소본의 너비(px)와 품질
+    IMAGE_DERIVATIVE_WIDTHS: list[int] = [320, 640, 1280]
+    IMAGE_DERIVATIVE_QUALITY: int = 80
+    # 업로드할 수 있는 이미지의 최대 크기(bytes)와 Content-Type
+    UPLOAD_MAX_SIZE: int = 20 * 1024 * 1024
+    UPLOAD_ALLOWED_CONTENT_TYPES: list[str] = [
+        "image/png",
+        "image/jpeg",
+        "image/gif",
+        "image/webp",
+        "image/heic",
+    ]
+
+    # 이 크기(bytes) 이상이고 Content-Type이 목록에 있는 응답만 압축합니다.
+    COMPRESSION_MINIMUM_SIZE: int = 1024
+    COMPRESSION_CONTENT_TYPES: list[str] = [
+        "application/json",
+        "text/plain",
+        "text/html",
+    ]
+    # 이 크기(bytes) 이상인 본문은 이벤트 루프를 막지 않도록 스레드에서 압축합니다.
+    COMPRESSION_OFFLOAD_SIZE: int = 64 * 1024
+    # 압축 수준. 응답마다 압축하므로 빠른 수준을 씁니다.
+    COMPRESSION_GZIP_LEVEL: int = 4
+    COMPRESSION_BROTLI_QUALITY: int = 4
+
     @property
     def POSTGRES_DATABASE_URL(self) -> str:
         return MultiHostUrl.build(
@@ -39,5 +132,29 @@ class Settings(BaseSettings):
             path=self.POSTGRES_DB,
         ).unicode_string()
 
+    @property
+    def POSTGRES_REPLICA_ASYNC_DATABASE_URL(self) -> str | None:
+        if not self.POSTGRES_REPLICA_HOST:
+            return None
+        return MultiHostUrl.build(
+            scheme="postgresql+asyncpg",
+            username=self.POSTGRES_USER,
+            password=self.POSTGRES_PASSWORD,
+            host=self.POSTGRES_REPLICA_HOST,
+            port=self.POSTGRES_REPLICA_PORT or self.POSTGRES_PORT,
+            path=self.POSTGRES_DB,
+        ).unicode_string()
+
+    @property
+    def POSTGRES_ASYNC_DATABASE_URL(self) -> str:
+        return MultiHostUrl.build(
+            scheme="postgresql+asyncpg",
+            username=self.POSTGRES_USER,
+            password=self.POSTGRES_PASSWORD,
+            host=self.POSTGRES_HOST,
+            port=self.POSTGRES_PORT,
+            path=self.POSTGRES_DB,
+        ).unicode_string()
+
 
 settings = Settings()  # type: ignore
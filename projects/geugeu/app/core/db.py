@@ -1,18 +1,195 @@
-from collections.abc import Generator
+import functools
+from collections.abc import AsyncGenerator, Awaitable, Callable
+from typing import Any, Concatenate, ParamSpec, Protocol, TypeVar
+from uuid import uuid4
 
-from sqlalchemy import create_engine
+from sqlalchemy import Delete, Insert, Select, Update, func, text
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.orm import DeclarativeBase, Session
+from sqlalchemy.sql import visitors
 
+from app.core.cache import writer_cache
 from app.core.config import settings
+from app.core.pool import InstrumentedNullPool, InstrumentedQueuePool, instrument_pool
+
+P = ParamSpec("P")
+T = TypeVar("T")
 
 
 class Base(DeclarativeBase):
     pass
 
 
-engine = create_engine(settings.POSTGRES_DATABASE_URL)
+def create_db_engine(url: str) -> AsyncEngine:
+    if settings.POSTGRES_PGBOUNCER:
+        # PgBouncer transaction pooling에서는 트랜잭션마다 서버 커넥션이 바뀔 수 있으므로
+        # 커넥션 풀링은 PgBouncer에 맡기고 서버 측 prepared statement를 사용하지 않습니다.
+        engine = create_async_engine(
+            url,
+            poolclass=InstrumentedNullPool,
+            connect_args={
+                "statement_cache_size": 0,
+                "prepared_statement_cache_size": 0,
+                "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+            },
+        )
+    else:
+        engine = create_async_engine(
+            url,
+            poolclass=InstrumentedQueuePool,
+            pool_size=settings.POSTGRES_POOL_SIZE,
+            max_overflow=settings.POSTGRES_MAX_OVERFLOW,
+            pool_timeout=settings.POSTGRES_POOL_TIMEOUT,
+            pool_recycle=settings.POSTGRES_POOL_RECYCLE,
+            pool_pre_ping=settings.POSTGRES_POOL_PRE_PING,
+        )
+    instrument_pool(engine.pool)
+    return engine
+
+
+engine = create_db_engine(settings.POSTGRES_ASYNC_DATABASE_URL)
+replica_engine = (
+    create_db_engine(settings.POSTGRES_REPLICA_ASYNC_DATABASE_URL)
+    if settings.POSTGRES_REPLICA_ASYNC_DATABASE_URL
+    else None
+)
+
+
+class RoutingSession(Session):
+    """read_replica로 감싼 서비스 메서드의 조회만 replica로 보내는 세션.
+
+    flush와 INSERT/UPDATE/DELETE는 CTE 안에서 실행하더라도 항상 primary로 보냅니다.
+    """
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if self._flushing or _is_write(clause):
+            self.info["wrote"] = True
+        elif replica_engine is not None and self.info.get("use_replica"):
+            return replica_engine.sync_engine
+        return super().get_bind(mapper=mapper, clause=clause, **kwargs)
+
+    def rollback(self) -> None:
+        super().rollback()
+        self.info.pop("wrote", None)
+
+
+def _is_write(clause: Any) -> bool:
+    if isinstance(clause, (Insert, Update, Delete)):
+        return True
+    # SELECT에 붙인 CTE로 INSERT/UPDATE/DELETE를 실행하는 쿼리도 쓰기입니다.
+    return isinstance(clause, Select) and any(
+        isinstance(element, (Insert, Update, Delete))
+        for element in visitors.iterate(clause)
+    )
+
+
+class RoutingAsyncSession(AsyncSession):
+    """쓰기를 커밋한 유저를 writer_cache에 기록하는 세션."""
+
+    async def commit(self) -> None:
+        await super().commit()
+        user_id = self.info.get("user_id")
+        if self.info.pop("wrote", False) and user_id is not None:
+            await writer_cache.set(str(user_id), True)
+
+
+async def _is_sticky(user_id: int | None) -> bool:
+    if user_id is None:
+        return False
+    return await writer_cache.get(str(user_id)) is not None
+
+
+class _HasSession(Protocol):
+    db: AsyncSession
+
+
+S = TypeVar("S", bound=_HasSession)
+
+
+def read_replica(
+    method: Callable[Concatenate[S, P], Awaitable[T]],
+) -> Callable[Concatenate[S, P], Awaitable[T]]:
+    """읽기 전용 서비스 메서드의 조회를 replica로 보냅니다.
+
+    방금 쓰기를 한 유저는 복제 지연 때문에 자신의 변경 사항을 못 볼 수 있으므로
+    POSTGRES_REPLICA_STICKY_SECONDS 동안은 primary에서 읽습니다. 쓰기를 한 유저는
+    writer_cache에 기록하므로 CACHE_REDIS_URL을 설정하면 다른 워커에서도 primary로 읽습니다.
+    """
+
+    @functools.wraps(method)
+    async def wrapper(self: S, *args: P.args, **kwargs: P.kwargs) -> T:
+        info: dict[str, Any] = self.db.info
+        if replica_engine is None or await _is_sticky(info.get("user_id")):
+            return await method(self, *args, **kwargs)
+        info["use_replica"] = True
+        try:
+            return await method(self, *args, **kwargs)
+        finally:
+            info.pop("use_replica", None)
+
+    return wrapper
+
+
+async def count_rows(
+    session: AsyncSession,
+    stmt: Select,
+    *,
+    estimate_table: type[Base] | None = None,
+) -> int:
+    """목록 쿼리의 전체 행 수를 셉니다.
+
+    eager load와 정렬을 뺀 SELECT count(*)로 세고, estimate_table이 주어지면
+    (필터 없는 목록) 통계상 행 수가 ESTIMATED_COUNT_MIN_ROWS 이상일 때 추정치를 씁니다.
+    """
+    if estimate_table is not None and settings.ESTIMATED_COUNT_MIN_ROWS is not None:
+        estimated = await estimate_live_rows(session, estimate_table)
+        if estimated is not None and estimated >= settings.ESTIMATED_COUNT_MIN_ROWS:
+            return estimated
+    count_stmt = stmt.with_only_columns(
+        func.count(), maintain_column_froms=True
+    ).order_by(None)
+    return (await session.execute(count_stmt)).scalar_one()
+
+
+async def estimate_live_rows(session: AsyncSession, model: type[Base]) -> int | None:
+    """pg_class.reltuples와 deleted_at의 NULL 비율로 삭제되지 않은 행 수를 추정합니다.
+
+    ANALYZE(autovacuum 포함)가 한 번도 실행되지 않은 테이블은 None을 반환합니다.
+    """
+    result = await session.execute(
+        text(
+            """
+            SELECT c.reltuples * coalesce(s.null_frac, 1)
+            FROM pg_class c
+            LEFT JOIN pg_stats s
+              ON s.schemaname = current_schema()
+             AND s.tablename = c.relname
+             AND s.attname = 'deleted_at'
+            WHERE c.oid = to_regclass(quote_ident(:table))
+            """
+        ),
+        {"table": model.__tablename__},
+    )
+    estimated = result.scalar_one_or_none()
+    if estimated is None or estimated < 0:
+        return None
+    return round(estimated)
+
+
+# 커밋 후 속성이 만료되면 응답 직렬화 시점에 lazy load가 발생하므로 만료시키지 않습니다.
+SessionLocal = async_sessionmaker(
+    engine,
+    class_=RoutingAsyncSession,
+    expire_on_commit=False,
+    sync_session_class=RoutingSession,
+)
 
 
-def get_db() -> Generator[Session, None, None]:
-    with Session(engine) as session:
+async def get_db() -> AsyncGenerator[AsyncSession, None]:
+    async with SessionLocal() as session:
         yield session
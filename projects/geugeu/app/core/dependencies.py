@@ -1,7 +1,9 @@
 from typing import Annotated
 
-from fastapi import Depends
-from sqlalchemy.orm import Session
+import httpx
+from botocore.client import BaseClient
+from fastapi import Depends, Request
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.db import get_db
 from app.services.auth import AuthService
@@ -10,28 +12,43 @@ from app.services.drawings import DrawingService
 from app.services.interests import InterestService
 from app.services.post_comments import PostCommentService
 from app.services.posts import PostService
+from app.services.uploads import UploadService
 from app.services.users import UserService
 
 # Database dependency
-DatabaseDep = Annotated[Session, Depends(get_db)]
+DatabaseDep = Annotated[AsyncSession, Depends(get_db)]
+
+
+# Client dependencies
+# 워커마다 lifespan에서 한 번 만든 클라이언트를 요청끼리 함께 사용합니다.
+def get_s3_client(request: Request) -> BaseClient:
+    return request.app.state.s3_client
+
+
+def get_http_client(request: Request) -> httpx.AsyncClient:
+    return request.app.state.http_client
+
+
+S3ClientDep = Annotated[BaseClient, Depends(get_s3_client)]
+HTTPClientDep = Annotated[httpx.AsyncClient, Depends(get_http_client)]
 
 
 # Service factory functions
 # These create new service instances for each request with the request-scoped DB session
-def get_user_service(db: DatabaseDep) -> UserService:
-    return UserService(db)
+def get_user_service(db: DatabaseDep, s3_client: S3ClientDep) -> UserService:
+    return UserService(db, s3_client)
 
 
-def get_auth_service(db: DatabaseDep) -> AuthService:
-    return AuthService(db)
+def get_auth_service(db: DatabaseDep, http_client: HTTPClientDep) -> AuthService:
+    return AuthService(db, http_client)
 
 
-def get_post_service(db: DatabaseDep) -> PostService:
-    return PostService(db)
+def get_post_service(db: DatabaseDep, s3_client: S3ClientDep) -> PostService:
+    return PostService(db, s3_client)
 
 
-def get_drawing_service(db: DatabaseDep) -> DrawingService:
-    return DrawingService(db)
+def get_drawing_service(db: DatabaseDep, s3_client: S3ClientDep) -> DrawingService:
+    return DrawingService(db, s3_client)
 
 
 def get_post_comment_service(db: DatabaseDep) -> PostCommentService:
@@ -46,6 +63,10 @@ def get_interest_service(db: DatabaseDep) -> InterestService:
     return InterestService(db)
 
 
+def get_upload_service(s3_client: S3ClientDep) -> UploadService:
+    return UploadService(s3_client)
+
+
 # Service dependency annotations
 UserServiceDep = Annotated[UserService, Depends(get_user_service)]
 AuthServiceDep = Annotated[AuthService, Depends(get_auth_service)]
@@ -56,3 +77,4 @@ DrawingCommentServiceDep = Annotated[
     DrawingCommentService, Depends(get_drawing_comment_service)
 ]
 InterestServiceDep = Annotated[InterestService, Depends(get_interest_service)]
+UploadServiceDep = Annotated[UploadService, Depends(get_upload_service)]
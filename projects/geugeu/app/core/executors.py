@@ -0,0 +1,125 @@
+import asyncio
+import contextvars
+import multiprocessing
+import threading
+from collections.abc import Callable
+from concurrent.futures import (
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+)
+from typing import Any, ParamSpec, TypeVar
+
+from app.core.config import settings
+
+P = ParamSpec("P")
+T = TypeVar("T")
+
+
+class BoundedExecutor:
+    """자원 종류별로 크기가 제한된 스레드 풀.
+
+    이벤트 루프를 막는 동기 호출(bcrypt, boto3 등)을 자원 종류마다 다른 풀에서 실행해서
+    한 종류의 작업이 몰려도 다른 요청이 스레드를 기다리지 않도록 합니다.
+    """
+
+    def __init__(self, name: str, max_workers: int):
+        self.name = name
+        self.max_workers = max_workers
+        self._executor = self._create_executor()
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._running = 0
+        self._completed = 0
+        self._max_queued = 0
+
+    def _create_executor(self) -> Executor:
+        return ThreadPoolExecutor(
+            max_workers=self.max_workers,
+            thread_name_prefix=f"{self.name}-executor",
+        )
+
+    async def run(self, func: Callable[P, T], *args: P.args, **kwargs: P.kwargs) -> T:
+        with self._lock:
+            self._queued += 1
+            self._max_queued = max(self._max_queued, self._queued)
+        context = contextvars.copy_context()
+        future = self._executor.submit(self._call, context, func, *args, **kwargs)
+        future.add_done_callback(self._on_done)
+        return await asyncio.wrap_future(future)
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "queued": self._queued,
+                "running": self._running,
+                "completed": self._completed,
+                "max_queued": self._max_queued,
+            }
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+    def _call(
+        self,
+        context: contextvars.Context,
+        func: Callable[..., T],
+        *args: Any,
+        **kwargs: Any,
+    ) -> T:
+        with self._lock:
+            self._queued -= 1
+            self._running += 1
+        try:
+            return context.run(func, *args, **kwargs)
+        finally:
+            with self._lock:
+                self._running -= 1
+                self._completed += 1
+
+    def _on_done(self, future: Future) -> None:
+        # 실행되기 전에 취소된 작업은 _call을 거치지 않으므로 대기열에서 직접 뺍니다.
+        if future.cancelled():
+            with self._lock:
+                self._queued -= 1
+
+
+class BoundedProcessExecutor(BoundedExecutor):
+    """CPU를 오래 쓰는 작업(이미지 변환 등)을 GIL 밖에서 실행하는 프로세스 풀.
+
+    함수와 인자는 pickle해서 자식 프로세스로 보내므로 모듈 최상위 함수만 실행할 수 있습니다.
+    자식 프로세스에서 실행 중인 작업은 알 수 없으므로 끝나지 않은 작업은 모두 queued로 셉니다.
+    """
+
+    def _create_executor(self) -> Executor:
+        # 스레드가 도는 프로세스를 fork하지 않도록 spawn으로 자식 프로세스를 만듭니다.
+        return ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+
+    async def run(self, func: Callable[P, T], *args: P.args, **kwargs: P.kwargs) -> T:
+        with self._lock:
+            self._queued += 1
+            self._max_queued = max(self._max_queued, self._queued)
+        future = self._executor.submit(func, *args, **kwargs)
+        future.add_done_callback(self._on_process_done)
+        return await asyncio.wrap_future(future)
+
+    def _on_process_done(self, future: Future) -> None:
+        with self._lock:
+            self._queued -= 1
+            if not future.cancelled():
+                self._completed += 1
+
+
+crypto_executor = BoundedExecutor("crypto", settings.CRYPTO_EXECUTOR_MAX_WORKERS)
+s3_executor = BoundedExecutor("s3", settings.S3_EXECUTOR_MAX_WORKERS)
+image_executor = BoundedProcessExecutor("image", settings.IMAGE_EXECUTOR_MAX_WORKERS)
+compression_executor = BoundedExecutor(
+    "compression", settings.COMPRESSION_EXECUTOR_MAX_WORKERS
+)
+
+executors = [crypto_executor, s3_executor, image_executor, compression_executor]
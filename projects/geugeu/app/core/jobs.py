@@ -0,0 +1,107 @@
+import logging
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from typing import TYPE_CHECKING, Any
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.models import Job
+
+if TYPE_CHECKING:
+    from mypy_boto3_s3 import S3Client
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class JobContext:
+    # 작업을 꺼낸 트랜잭션의 세션. 작업이 성공하면 작업 삭제와 함께 커밋합니다.
+    db: AsyncSession
+    s3_client: "S3Client"
+
+
+JobHandler = Callable[[JobContext, dict[str, Any]], Awaitable[None]]
+
+# kind별 작업 함수
+handlers: dict[str, JobHandler] = {}
+
+
+def job_handler(kind: str) -> Callable[[JobHandler], JobHandler]:
+    def decorator(func: JobHandler) -> JobHandler:
+        handlers[kind] = func
+        return func
+
+    return decorator
+
+
+def enqueue(db: AsyncSession, kind: str, payload: dict[str, Any]) -> Job:
+    """작업을 세션에 추가합니다.
+
+    요청의 쓰기와 같은 트랜잭션에 들어가므로 커밋해야 워커에게 보이고,
+    롤백하면 작업도 함께 사라집니다.
+    """
+    job = Job(kind=kind, payload=payload, max_attempts=settings.JOB_MAX_ATTEMPTS)
+    db.add(job)
+    return job
+
+
+def retry_delay(attempts: int) -> timedelta:
+    # 실패할 때마다 대기 시간을 두 배로 늘립니다.
+    seconds = settings.JOB_RETRY_BASE_SECONDS * 2 ** (attempts - 1)
+    return timedelta(seconds=min(seconds, settings.JOB_RETRY_MAX_SECONDS))
+
+
+async def run_next_job(
+    session_factory: async_sessionmaker[AsyncSession], s3_client: "S3Client"
+) -> bool:
+    """실행할 차례인 작업 하나를 처리합니다. 처리할 작업이 없으면 False를 돌려줍니다.
+
+    작업을 처리하는 동안 행 잠금을 유지하므로 다른 워커는 SKIP LOCKED로 다음 작업을
+    가져갑니다. 워커가 죽으면 잠금이 풀려 다른 워커가 다시 처리합니다.
+    """
+    async with session_factory() as db:
+        result = await db.execute(
+            select(Job)
+            .where(Job.failed_at.is_(None), Job.run_at <= func.now())
+            .order_by(Job.run_at, Job.id)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+        )
+        job = result.scalar_one_or_none()
+        if job is None:
+            await db.rollback()
+            return False
+
+        try:
+            handler = handlers[job.kind]
+            # 작업이 실패하면 작업의 쓰기만 되돌리고 작업 행의 잠금은 유지합니다.
+            async with db.begin_nested():
+                await handler(JobContext(db, s3_client), job.payload)
+        except Exception as e:
+            job.attempts += 1
+            job.last_error = repr(e)
+            if job.attempts >= job.max_attempts:
+                logger.exception("Job %s(%s) failed", job.kind, job.id)
+                job.failed_at = datetime.now(UTC)
+            else:
+                logger.warning(
+                    "Job %s(%s) failed, retrying", job.kind, job.id, exc_info=True
+                )
+                job.run_at = datetime.now(UTC) + retry_delay(job.attempts)
+        else:
+            await db.delete(job)
+        await db.commit()
+        return True
+
+
+async def run_pending_jobs(
+    session_factory: async_sessionmaker[AsyncSession], s3_client: "S3Client"
+) -> int:
+    """지금 실행할 수 있는 작업을 모두 처리하고 처리한 수를 돌려줍니다."""
+    count = 0
+    while await run_next_job(session_factory, s3_client):
+        count += 1
+    return count
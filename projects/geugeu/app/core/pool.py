@@ -0,0 +1,102 @@
+import time
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.pool import AsyncAdaptedQueuePool, ConnectionPoolEntry, NullPool, Pool
+
+# 커넥션을 얻기까지 기다린 시간(초)의 히스토그램 구간
+WAIT_TIME_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+
+class PoolMetrics:
+    def __init__(self) -> None:
+        self.created = 0
+        self.invalidated = 0
+        self.checked_out = 0
+        self.wait_count = 0
+        self.wait_sum = 0.0
+        self.wait_buckets = [0] * (len(WAIT_TIME_BUCKETS) + 1)
+
+    def observe_wait(self, seconds: float) -> None:
+        self.wait_count += 1
+        self.wait_sum += seconds
+        for i, bound in enumerate(WAIT_TIME_BUCKETS):
+            if seconds <= bound:
+                self.wait_buckets[i] += 1
+                return
+        self.wait_buckets[-1] += 1
+
+    def stats(self) -> dict[str, Any]:
+        # 누적 히스토그램으로 변환합니다. (각 구간은 해당 값 이하인 대기 횟수)
+        histogram, total = {}, 0
+        for bound, count in zip(
+            [*map(str, WAIT_TIME_BUCKETS), "+Inf"], self.wait_buckets, strict=True
+        ):
+            total += count
+            histogram[bound] = total
+        return {
+            "checked_out": self.checked_out,
+            "created": self.created,
+            "invalidated": self.invalidated,
+            "wait_seconds": {
+                "count": self.wait_count,
+                "sum": self.wait_sum,
+                "buckets": histogram,
+            },
+        }
+
+
+class _InstrumentedPoolMixin(Pool):
+    metrics: PoolMetrics
+
+    def _do_get(self) -> ConnectionPoolEntry:
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            self.metrics.observe_wait(time.perf_counter() - started)
+
+    def recreate(self) -> Pool:
+        # engine.dispose()로 풀을 다시 만들어도 누적 지표는 유지합니다.
+        pool = super().recreate()
+        pool.metrics = self.metrics  # type: ignore[attr-defined]
+        return pool
+
+
+class InstrumentedQueuePool(_InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+class InstrumentedNullPool(_InstrumentedPoolMixin, NullPool):
+    pass
+
+
+def instrument_pool(pool: Pool) -> None:
+    metrics = PoolMetrics()
+    pool.metrics = metrics  # type: ignore[attr-defined]
+
+    @event.listens_for(pool, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        metrics.created += 1
+
+    @event.listens_for(pool, "invalidate")
+    def on_invalidate(dbapi_connection, connection_record, exception):
+        metrics.invalidated += 1
+
+    @event.listens_for(pool, "checkout")
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        metrics.checked_out += 1
+
+    @event.listens_for(pool, "checkin")
+    def on_checkin(dbapi_connection, connection_record):
+        metrics.checked_out -= 1
+
+
+def pool_stats(pool: Pool) -> dict[str, Any]:
+    stats: dict[str, Any] = {"pool": type(pool).__name__}
+    if isinstance(pool, AsyncAdaptedQueuePool):
+        stats["size"] = pool.size()
+        stats["checked_in"] = pool.checkedin()
+        stats["overflow"] = max(pool.overflow(), 0)
+    stats.update(pool.metrics.stats())  # type: ignore[attr-defined]
+    return stats
@@ -0,0 +1,81 @@
+import hashlib
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from email.utils import format_datetime
+from typing import Any
+
+import orjson
+from fastapi import Request, Response
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel
+
+
+class FastJSONResponse(ORJSONResponse):
+    """orjson으로 직렬화하는 응답.
+
+    앱의 기본 응답 클래스로 쓰고, 라우트가 서비스가 만든 스키마를 이 응답으로 감싸서
+    직접 돌려주면 FastAPI가 response_model로 다시 검증하고 dict로 바꾸는 단계를
+    건너뜁니다. 이미 인코딩한 bytes(캐시 등)는 그대로 보냅니다.
+
+    pydantic의 JSON 직렬화와 같도록 UTC 시각은 Z로 끝나게 씁니다.
+    """
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        if isinstance(content, BaseModel):
+            content = content.model_dump()
+        return orjson.dumps(
+            content,
+            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z,
+        )
+
+
+@dataclass(frozen=True)
+class Validator:
+    """조건부 GET에 쓰는 ETag와 Last-Modified.
+
+    응답 본문을 만들지 않고 updated_at 등 몇 개의 값만 읽어서 만듭니다. 관심 수처럼
+    updated_at을 바꾸지 않는 값도 ETag에는 넣으므로 304 여부는 If-None-Match로만
+    판단합니다.
+    """
+
+    etag: str
+    last_modified: datetime
+
+    @classmethod
+    def create(cls, timestamps: list[datetime | None], *values: Any) -> "Validator":
+        # timestamps에는 None이 아닌 값이 하나 이상 있어야 합니다.
+        parts = [timestamp and timestamp.isoformat() for timestamp in timestamps]
+        digest = hashlib.sha1(
+            repr((parts, values)).encode(), usedforsecurity=False
+        ).hexdigest()
+        return cls(
+            etag=f'W/"{digest}"',
+            last_modified=max(t for t in timestamps if t is not None),
+        )
+
+    @property
+    def headers(self) -> dict[str, str]:
+        return {
+            "ETag": self.etag,
+            "Last-Modified": format_datetime(
+                self.last_modified.astimezone(UTC), usegmt=True
+            ),
+            # 유저마다 응답이 다를 수 있으므로 공유 캐시에 두지 않고 매번 검증합니다.
+            "Cache-Control": "private, no-cache",
+        }
+
+    def not_modified(self, request: Request) -> Response | None:
+        # 클라이언트가 가진 ETag와 같으면 본문 없이 304로 응답합니다.
+        header = request.headers.get("If-None-Match")
+        if header is None:
+            return None
+        tags = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+        if "*" in tags or self.etag.removeprefix("W/") in tags:
+            return Response(status_code=304, headers=self.headers)
+        return None
+
+    def apply(self, response: Response) -> Response:
+        response.headers.update(self.headers)
+        return response
@@ -1,10 +1,14 @@
+import hashlib
+import time
 from datetime import UTC, datetime, timedelta
 from typing import Any
 
 import bcrypt
 import jwt
 
+from app.core.cache import token_cache
 from app.core.config import settings
+from app.schemas.auth import TokenPayload
 
 ALGORITHM = "HS256"
 
@@ -16,6 +20,28 @@ def create_access_token(subject: str | Any, expires_delta: timedelta) -> str:
     return encoded_jwt
 
 
+async def decode_access_token(token: str) -> str | None:
+    """액세스 토큰의 subject를 돌려줍니다. 토큰이 유효하지 않으면 InvalidTokenError나
+    ValidationError가 발생합니다.
+
+    같은 토큰이 반복해서 들어오므로 한 번 검증한 토큰은 exp까지 캐시에서 읽습니다.
+    """
+    key = hashlib.sha256(token.encode()).hexdigest()
+    sub = await token_cache.get(key)
+    if sub is not None:
+        return sub
+
+    payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[ALGORITHM])
+    token_data = TokenPayload(**payload)
+    if token_data.sub is None:
+        return None
+    ttl = None
+    if "exp" in payload:
+        ttl = min(payload["exp"] - time.time(), settings.TOKEN_CACHE_TTL_SECONDS)
+    await token_cache.set(key, token_data.sub, ttl=ttl)
+    return token_data.sub
+
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return bcrypt.checkpw(
         password=plain_password.encode(),
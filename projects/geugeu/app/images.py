@@ -0,0 +1,65 @@
+"""업로드한 이미지의 크기를 읽고 목록용 축소본을 만듭니다.
+
+이미지 디코딩과 인코딩은 CPU를 오래 쓰므로 image_executor의 프로세스에서 실행합니다.
+자식 프로세스가 가볍게 import할 수 있도록 앱 설정이나 DB에 의존하지 않습니다.
+"""
+
+import io
+from dataclasses import dataclass
+
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+# 축소본 포맷과 Content-Type
+FORMATS = {
+    "webp": ("WEBP", "image/webp"),
+    "jpeg": ("JPEG", "image/jpeg"),
+}
+
+
+@dataclass
+class Derivative:
+    format: str
+    content_type: str
+    width: int
+    height: int
+    data: bytes
+
+
+@dataclass
+class ImageInfo:
+    width: int
+    height: int
+    derivatives: list[Derivative]
+
+
+def make_derivatives(data: bytes, widths: list[int], quality: int) -> ImageInfo | None:
+    """원본의 크기를 읽고 widths마다 WebP와 JPEG 축소본을 만듭니다.
+
+    원본보다 큰 크기로는 늘리지 않으며, Pillow가 읽을 수 없는 이미지(HEIC 등)나
+    픽셀 수가 Image.MAX_IMAGE_PIXELS의 두 배를 넘는 이미지면 None을 돌려줍니다.
+    """
+    try:
+        with Image.open(io.BytesIO(data)) as original:
+            # 휴대폰 사진은 EXIF 방향 정보를 반영해야 가로세로가 맞습니다.
+            image = ImageOps.exif_transpose(original)
+            image.load()
+    except (UnidentifiedImageError, OSError, Image.DecompressionBombError):
+        # 다시 시도해도 결과가 같으므로 작업은 끝난 것으로 처리합니다.
+        return None
+
+    derivatives = []
+    for width in sorted(set(widths)):
+        if width >= image.width:
+            continue
+        height = max(1, round(image.height * width / image.width))
+        resized = image.resize((width, height), Image.Resampling.LANCZOS)
+        for fmt, (pil_format, content_type) in FORMATS.items():
+            frame = resized
+            if pil_format == "JPEG" and frame.mode not in ("RGB", "L"):
+                frame = frame.convert("RGB")
+            buffer = io.BytesIO()
+            frame.save(buffer, format=pil_format, quality=quality)
+            derivatives.append(
+                Derivative(fmt, content_type, width, height, buffer.getvalue())
+            )
+    return ImageInfo(image.width, image.height, derivatives)
@@ -1,6 +1,43 @@
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 
 from app.api.routers import api_router
+from app.core.cache import close_redis
+from app.core.clients import create_http_client, create_s3_client
+from app.core.compression import CompressionMiddleware
+from app.core.config import settings
+from app.core.db import engine, replica_engine
+from app.core.executors import compression_executor, executors
+from app.core.responses import FastJSONResponse
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    # 외부 서비스 클라이언트는 워커마다 한 번 만들어 커넥션을 재사용합니다.
+    app.state.s3_client = create_s3_client()
+    app.state.http_client = create_http_client()
+    yield
+    await app.state.http_client.aclose()
+    app.state.s3_client.close()
+    for executor in executors:
+        executor.shutdown()
+    await close_redis()
+    await engine.dispose()
+    if replica_engine is not None:
+        await replica_engine.dispose()
+
 
-app = FastAPI()
+# 서비스가 만든 스키마를 그대로 돌려주는 라우트는 response_model 검증도 건너뜁니다.
+app = FastAPI(lifespan=lifespan, default_response_class=FastJSONResponse)
+app.add_middleware(
+    CompressionMiddleware,
+    executor=compression_executor,
+    minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+    content_types=settings.COMPRESSION_CONTENT_TYPES,
+    offload_size=settings.COMPRESSION_OFFLOAD_SIZE,
+    gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+    brotli_quality=settings.COMPRESSION_BROTLI_QUALITY,
+)
 app.include_router(api_router, prefix="/api")
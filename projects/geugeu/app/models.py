@@ -1,6 +1,6 @@
 from datetime import datetime
 from enum import StrEnum
-from typing import List, Optional
+from typing import Any, List, Optional
 
 from nanoid import generate
 from sqlalchemy import (
@@ -10,11 +10,14 @@ from sqlalchemy import (
     Enum,
     ForeignKey,
     Identity,
+    Index,
+    Integer,
     String,
     Text,
     and_,
 )
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column, relationship, remote
 from sqlalchemy.sql import func
 
 from app.core.db import Base
@@ -118,6 +121,16 @@ class Post(Base):
     )
     title: Mapped[str] = mapped_column(String(255), nullable=False)
     content: Mapped[str] = mapped_column(Text, nullable=False)
+    # 삭제되지 않은 관심, 댓글(답글 포함), 그림 수. app.services.counters에서 관리합니다.
+    interest_count: Mapped[int] = mapped_column(
+        Integer(), nullable=False, default=0, server_default="0"
+    )
+    comment_count: Mapped[int] = mapped_column(
+        Integer(), nullable=False, default=0, server_default="0"
+    )
+    drawing_count: Mapped[int] = mapped_column(
+        Integer(), nullable=False, default=0, server_default="0"
+    )
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
         nullable=False,
@@ -188,6 +201,10 @@ class Drawing(Base):
         nullable=False,
     )
     content: Mapped[str] = mapped_column(Text, nullable=False)
+    # 삭제되지 않은 댓글(답글 포함) 수. app.services.counters에서 관리합니다.
+    comment_count: Mapped[int] = mapped_column(
+        Integer(), nullable=False, default=0, server_default="0"
+    )
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
         nullable=False,
@@ -241,6 +258,17 @@ class Image(Base):
         nullable=True,
     )
     url: Mapped[str] = mapped_column(String(2083), nullable=False)
+    # 원본의 크기. Pillow가 읽을 수 없는 이미지(HEIC 등)는 width, height가 없습니다.
+    width: Mapped[int | None] = mapped_column(Integer())
+    height: Mapped[int | None] = mapped_column(Integer())
+    size: Mapped[int | None] = mapped_column(BigInteger())
+    # 목록용 축소본. [{"url", "format", "width", "height", "size"}, ...]
+    variants: Mapped[list[dict[str, Any]]] = mapped_column(
+        JSONB(),
+        nullable=False,
+        default=list,
+        server_default="[]",
+    )
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
         nullable=False,
@@ -311,7 +339,13 @@ class Comment(Base):
         back_populates="replies", remote_side=[id]
     )
     replies: Mapped[List["Comment"]] = relationship(
-        back_populates="parent", cascade="all, delete-orphan"
+        "Comment",
+        primaryjoin=lambda: and_(
+            remote(Comment.parent_id) == Comment.id,
+            remote(Comment.deleted_at).is_(None),
+        ),
+        back_populates="parent",
+        cascade="all, delete-orphan",
     )
 
 
@@ -345,3 +379,155 @@ class Interest(Base):
     # Relationships
     user: Mapped["User"] = relationship(back_populates="interests")
     post: Mapped["Post"] = relationship(back_populates="interests")
+
+
+class Job(Base):
+    """커밋한 뒤에 처리할 작업. 워커가 SELECT ... FOR UPDATE SKIP LOCKED로 가져갑니다.
+
+    성공한 작업은 지우고, 실패한 작업은 run_at을 미뤄 다시 시도합니다.
+    max_attempts번 실패하면 failed_at을 기록하고 더 이상 시도하지 않습니다.
+    """
+
+    __tablename__ = "job"
+
+    id: Mapped[int] = mapped_column(BigInteger(), Identity(), primary_key=True)
+    kind: Mapped[str] = mapped_column(String(255), nullable=False)
+    payload: Mapped[dict[str, Any]] = mapped_column(JSONB(), nullable=False)
+    attempts: Mapped[int] = mapped_column(
+        Integer(),
+        nullable=False,
+        default=0,
+        server_default="0",
+    )
+    max_attempts: Mapped[int] = mapped_column(Integer(), nullable=False)
+    run_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=func.now(),
+    )
+    last_error: Mapped[str | None] = mapped_column(Text())
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=func.now(),
+    )
+    failed_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+
+
+# 목록 조회용 부분 인덱스. 조회는 항상 삭제되지 않은 행만 대상으로 하므로
+# deleted_at IS NULL인 행만 색인하고, 정렬 컬럼을 포함해 정렬 없이 LIMIT까지 읽습니다.
+Index(
+    "ix_post_author_id_id",
+    Post.author_id,
+    Post.id.desc(),
+    postgresql_where=Post.deleted_at.is_(None),
+)
+Index(
+    "ix_drawing_post_id_id",
+    Drawing.post_id,
+    Drawing.id.desc(),
+    postgresql_where=Drawing.deleted_at.is_(None),
+)
+# 유저는 post마다 삭제되지 않은 drawing을 하나만 만들 수 있습니다.
+Index(
+    "uq_drawing_post_id_author_id",
+    Drawing.post_id,
+    Drawing.author_id,
+    unique=True,
+    postgresql_where=Drawing.deleted_at.is_(None),
+)
+Index(
+    "ix_drawing_author_id_id",
+    Drawing.author_id,
+    Drawing.id.desc(),
+    postgresql_where=Drawing.deleted_at.is_(None),
+)
+Index(
+    "ix_image_post_id",
+    Image.post_id,
+    postgresql_where=Image.deleted_at.is_(None),
+)
+Index(
+    "ix_image_drawing_id",
+    Image.drawing_id,
+    postgresql_where=Image.deleted_at.is_(None),
+)
+# 클라이언트가 직접 올린 파일을 이미 다른 이미지에 붙였는지 url로 찾습니다.
+Index(
+    "ix_image_url",
+    Image.url,
+)
+Index(
+    "ix_comment_top_level_post_id_created_at",
+    Comment.post_id,
+    Comment.created_at,
+    Comment.id,
+    postgresql_where=and_(Comment.parent_id.is_(None), Comment.deleted_at.is_(None)),
+)
+Index(
+    "ix_comment_post_id_parent_id_created_at",
+    Comment.post_id,
+    Comment.parent_id,
+    Comment.created_at,
+    Comment.id,
+    postgresql_where=Comment.deleted_at.is_(None),
+)
+Index(
+    "ix_comment_top_level_drawing_id_created_at",
+    Comment.drawing_id,
+    Comment.created_at,
+    Comment.id,
+    postgresql_where=and_(Comment.parent_id.is_(None), Comment.deleted_at.is_(None)),
+)
+Index(
+    "ix_comment_drawing_id_parent_id_created_at",
+    Comment.drawing_id,
+    Comment.parent_id,
+    Comment.created_at,
+    Comment.id,
+    postgresql_where=Comment.deleted_at.is_(None),
+)
+# 댓글 목록의 ETag를 만들 때 댓글 수와 가장 최근 updated_at, 작성자를 댓글 행을 읽지
+# 않고 인덱스만 읽어 구합니다. 작성자의 updated_at은 user의 기본 키로 찾습니다.
+Index(
+    "ix_comment_post_id_updated_at",
+    Comment.post_id,
+    Comment.updated_at,
+    postgresql_include=["author_id"],
+    postgresql_where=Comment.deleted_at.is_(None),
+)
+Index(
+    "ix_comment_drawing_id_updated_at",
+    Comment.drawing_id,
+    Comment.updated_at,
+    postgresql_include=["author_id"],
+    postgresql_where=Comment.deleted_at.is_(None),
+)
+Index(
+    "ix_interest_post_id_created_at",
+    Interest.post_id,
+    Interest.created_at.desc(),
+    postgresql_where=Interest.deleted_at.is_(None),
+)
+Index(
+    "ix_interest_user_id_created_at",
+    Interest.user_id,
+    Interest.created_at.desc(),
+    postgresql_where=Interest.deleted_at.is_(None),
+)
+# 같은 유저가 같은 post에 관심을 두 번 누르지 못하게 합니다. 삭제된 관심은 제외합니다.
+Index(
+    "uq_interest_user_id_post_id",
+    Interest.user_id,
+    Interest.post_id,
+    unique=True,
+    postgresql_where=Interest.deleted_at.is_(None),
+)
+
+# 워커가 실행할 차례인 작업을 run_at 순서로 찾습니다.
+Index(
+    "ix_job_run_at_id",
+    Job.run_at,
+    Job.id,
+    postgresql_where=Job.failed_at.is_(None),
+)
@@ -0,0 +1,36 @@
+"""Post, Drawing에 비정규화한 관심, 댓글, 그림 수를 실제 행 수로 다시 계산합니다.
+
+배포 직후나 DB를 직접 고친 뒤처럼 수가 어긋났을 수 있을 때 실행합니다.
+
+    uv run python -m app.reconcile_counts --batch-size 1000
+"""
+
+import argparse
+import asyncio
+import logging
+
+from app.core.db import SessionLocal, engine
+from app.services.counters import reconcile_counts
+
+logger = logging.getLogger(__name__)
+
+
+async def reconcile(batch_size: int) -> None:
+    try:
+        async with SessionLocal() as session:
+            fixed = await reconcile_counts(session, batch_size=batch_size)
+        logger.info("Reconciled counts of %d rows", fixed)
+    finally:
+        await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Recompute denormalized counts.")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(reconcile(args.batch_size))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 from app.models import Comment
 
@@ -22,11 +22,13 @@ class CommentSchema(BaseModel):
     author: UserSchema
     content: str
     replies: list["CommentSchema"]
+    reply_count: int
     created_at: datetime
     updated_at: datetime
 
     @classmethod
-    def from_model(cls, comment: Comment):
+    def from_model(cls, comment: Comment, reply_counts: dict[int, int] | None = None):
+        # reply_counts가 없으면 replies에 모든 답글이 들어 있습니다.
         return cls(
             code=comment.code,
             author=UserSchema(
@@ -36,15 +38,33 @@ class CommentSchema(BaseModel):
                 profile_image_url=comment.author.profile_image_url,
             ),
             content=comment.content,
-            replies=[CommentSchema.from_model(reply) for reply in comment.replies],
+            replies=[
+                CommentSchema.from_model(reply, reply_counts)
+                for reply in comment.replies
+            ],
+            reply_count=(
+                len(comment.replies)
+                if reply_counts is None
+                else reply_counts[comment.id]
+            ),
             created_at=comment.created_at,
             updated_at=comment.updated_at,
         )
 
 
 class CommentListSchema(BaseModel):
-    count: int
+    count: int | None = None
     items: list[CommentSchema]
+    next_cursor: str | None = None
+
+
+class CommentListFilter(BaseModel):
+    # 전체 개수가 필요 없으면 false로 COUNT 쿼리를 생략합니다.
+    include_count: bool = True
+
+    cursor: str | None = None
+    # 인기 있는 글의 댓글을 한 번에 모두 읽지 않도록 페이지 크기를 제한합니다.
+    page_size: int = Field(20, ge=1, le=100)
 
 
 class UpdateCommentSchema(BaseModel):
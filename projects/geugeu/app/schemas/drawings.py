@@ -1,6 +1,8 @@
 from datetime import datetime
+from typing import Any
 
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, Field
+from sqlalchemy import Row
 
 from app.models import Drawing
 
@@ -16,8 +18,21 @@ class UserSchema(BaseModel):
     profile_image_url: str = ""
 
 
+class ImageVariantSchema(BaseModel):
+    url: str
+    format: str
+    width: int
+    height: int
+    size: int
+
+
 class ImageSchema(BaseModel):
     url: str
+    width: int | None = None
+    height: int | None = None
+    size: int | None = None
+    # 너비가 작은 순서의 축소본. 클라이언트는 화면에 맞는 크기를 골라 씁니다.
+    variants: list[ImageVariantSchema] = []
     created_at: datetime
     updated_at: datetime
 
@@ -28,6 +43,7 @@ class DrawingSchema(BaseModel):
     author: UserSchema
     content: str
     images: list[ImageSchema]
+    comment_count: int = 0
     created_at: datetime
     updated_at: datetime
 
@@ -46,24 +62,55 @@ class DrawingSchema(BaseModel):
             images=[
                 ImageSchema(
                     url=image.url,
+                    width=image.width,
+                    height=image.height,
+                    size=image.size,
+                    variants=image.variants,
                     created_at=image.created_at,
                     updated_at=image.updated_at,
                 )
                 for image in drawing.images
             ],
+            comment_count=drawing.comment_count,
             created_at=drawing.created_at,
             updated_at=drawing.updated_at,
         )
 
+    @classmethod
+    def from_row(cls, row: Row[Any]):
+        # app.services.projections로 읽은 행. images는 JSON 배열입니다.
+        return cls(
+            code=row.code,
+            post=PostSchema(code=row.post_code),
+            author=UserSchema(
+                code=row.author_code,
+                email=row.author_email,
+                nickname=row.author_nickname,
+                profile_image_url=row.author_profile_image_url,
+            ),
+            content=row.content,
+            images=row.images,
+            comment_count=row.comment_count,
+            created_at=row.created_at,
+            updated_at=row.updated_at,
+        )
+
 
 class DrawingListSchema(BaseModel):
-    count: int
+    count: int | None = None
     items: list[DrawingSchema]
+    next_cursor: str | None = None
 
 
 class DrawingListFilter(BaseModel):
     post_code: str | None = None
     author_code: str | None = None
 
-    page: int = 1
-    page_size: int = 10
+    # 전체 개수가 필요 없으면 false로 COUNT 쿼리를 생략합니다.
+    include_count: bool = True
+
+    # cursor가 있으면 page 대신 커서 다음부터 읽습니다.
+    cursor: str | None = None
+    page: int = Field(1, ge=1)
+    # 0이면 목록 없이 개수만 돌려줍니다.
+    page_size: int = Field(10, ge=0, le=100)
@@ -1,8 +1,8 @@
 from datetime import datetime
+from typing import Any
 
 from pydantic import BaseModel, EmailStr
-
-from app.models import Interest
+from sqlalchemy import Row
 
 
 class UserSchema(BaseModel):
@@ -24,20 +24,18 @@ class InterestSchema(BaseModel):
     created_at: datetime
 
     @classmethod
-    def from_model(cls, interest: Interest):
+    def from_row(cls, row: Row[Any]):
+        # app.services.projections로 읽은 행
         return cls(
-            code=interest.code,
+            code=row.code,
             user=UserSchema(
-                code=interest.user.code,
-                email=interest.user.email,
-                nickname=interest.user.nickname,
-                profile_image_url=interest.user.profile_image_url,
-            ),
-            post=PostSchema(
-                code=interest.post.code,
-                title=interest.post.title,
+                code=row.user_code,
+                email=row.user_email,
+                nickname=row.user_nickname,
+                profile_image_url=row.user_profile_image_url,
             ),
-            created_at=interest.created_at,
+            post=PostSchema(code=row.post_code, title=row.post_title),
+            created_at=row.created_at,
         )
 
 
@@ -53,5 +51,5 @@ class InterestResponseSchema(BaseModel):
 
 class InterestListSchema(BaseModel):
     items: list[InterestSchema]
-    count: int
+    count: int | None = None
     is_interested: bool | None = None
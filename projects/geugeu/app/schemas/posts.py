@@ -1,6 +1,8 @@
 from datetime import datetime
+from typing import Any
 
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, Field
+from sqlalchemy import Row
 
 from app.models import Post
 
@@ -12,8 +14,21 @@ class UserSchema(BaseModel):
     profile_image_url: str = ""
 
 
+class ImageVariantSchema(BaseModel):
+    url: str
+    format: str
+    width: int
+    height: int
+    size: int
+
+
 class ImageSchema(BaseModel):
     url: str
+    width: int | None = None
+    height: int | None = None
+    size: int | None = None
+    # 너비가 작은 순서의 축소본. 클라이언트는 화면에 맞는 크기를 골라 씁니다.
+    variants: list[ImageVariantSchema] = []
     created_at: datetime
     updated_at: datetime
 
@@ -24,11 +39,16 @@ class PostSchema(BaseModel):
     title: str
     content: str
     images: list[ImageSchema]
+    interest_count: int = 0
+    comment_count: int = 0
+    drawing_count: int = 0
+    # 현재 유저가 관심을 눌렀는지. 유저 없이 조회하면 None입니다.
+    is_interested: bool | None = None
     created_at: datetime
     updated_at: datetime
 
     @classmethod
-    def from_model(cls, post: Post):
+    def from_model(cls, post: Post, is_interested: bool | None = None):
         return cls(
             code=post.code,
             author=UserSchema(
@@ -42,23 +62,60 @@ class PostSchema(BaseModel):
             images=[
                 ImageSchema(
                     url=image.url,
+                    width=image.width,
+                    height=image.height,
+                    size=image.size,
+                    variants=image.variants,
                     created_at=image.created_at,
                     updated_at=image.updated_at,
                 )
                 for image in post.images
             ],
+            interest_count=post.interest_count,
+            comment_count=post.comment_count,
+            drawing_count=post.drawing_count,
+            is_interested=is_interested,
             created_at=post.created_at,
             updated_at=post.updated_at,
         )
 
+    @classmethod
+    def from_row(cls, row: Row[Any], is_interested: bool | None = None):
+        # app.services.projections로 읽은 행. images는 JSON 배열입니다.
+        return cls(
+            code=row.code,
+            author=UserSchema(
+                code=row.author_code,
+                email=row.author_email,
+                nickname=row.author_nickname,
+                profile_image_url=row.author_profile_image_url,
+            ),
+            title=row.title,
+            content=row.content,
+            images=row.images,
+            interest_count=row.interest_count,
+            comment_count=row.comment_count,
+            drawing_count=row.drawing_count,
+            is_interested=is_interested,
+            created_at=row.created_at,
+            updated_at=row.updated_at,
+        )
+
 
 class PostListSchema(BaseModel):
-    count: int
+    count: int | None = None
     items: list[PostSchema]
+    next_cursor: str | None = None
 
 
 class PostListFilter(BaseModel):
     author_code: str | None = None
 
-    page: int = 1
-    page_size: int = 10
+    # 전체 개수가 필요 없으면 false로 COUNT 쿼리를 생략합니다.
+    include_count: bool = True
+
+    # cursor가 있으면 page 대신 커서 다음부터 읽습니다.
+    cursor: str | None = None
+    page: int = Field(1, ge=1)
+    # 0이면 목록 없이 개수만 돌려줍니다.
+    page_size: int = Field(10, ge=0, le=100)
@@ -0,0 +1,26 @@
+from pydantic import BaseModel, Field
+
+from app.core.config import settings
+
+
+class UploadFileSchema(BaseModel):
+    filename: str = Field(min_length=1)
+    content_type: str
+    size: int = Field(gt=0)
+
+
+class UploadCreateSchema(BaseModel):
+    files: list[UploadFileSchema] = Field(
+        min_length=1, max_length=settings.UPLOAD_MAX_FILES
+    )
+
+
+class UploadSchema(BaseModel):
+    key: str
+    url: str
+    # 업로드할 때 그대로 보내야 하는 헤더
+    headers: dict[str, str]
+
+
+class UploadListSchema(BaseModel):
+    items: list[UploadSchema]
@@ -1,41 +1,73 @@
 import time
-from datetime import timedelta
+from datetime import datetime, timedelta
+from typing import Any
 
 import httpx
 import jwt
 from fastapi import HTTPException
 from sqlalchemy import select
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import make_transient_to_detached
 
+from app.core.cache import user_cache
 from app.core.config import settings
+from app.core.executors import crypto_executor
 from app.core.security import create_access_token
 from app.models import User
 from app.schemas.auth import AppleToken, GoogleToken, GoogleUser, Token
 
 
 class AuthService:
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession, http_client: httpx.AsyncClient):
         self.db = db
+        self.http_client = http_client
 
-    def get_user_by_code(self, code: str) -> User | None:
-        return self.db.execute(
+    async def get_user_by_code(self, code: str) -> User | None:
+        result = await self.db.execute(
             select(User).where(
                 User.code == code,
                 User.deleted_at.is_(None),
             )
-        ).scalar_one_or_none()
+        )
+        return result.scalar_one_or_none()
+
+    async def get_authenticated_user(self, code: str) -> User | None:
+        """토큰의 유저를 캐시에서 읽고, 없으면 DB에서 읽어 캐시에 넣습니다.
+
+        캐시에는 비밀번호를 뺀 스냅샷만 저장하고, 돌려주는 User는 요청 세션에 붙여서
+        DB에서 읽은 유저와 똑같이 다룰 수 있게 합니다.
+        """
+        snapshot = await user_cache.get(code)
+        if snapshot is None:
+            user = await self.get_user_by_code(code)
+            if user is not None:
+                await user_cache.set(code, _snapshot(user))
+            return user
+
+        user = User(
+            **{
+                **snapshot,
+                "auth_provider": User.AuthProvider(snapshot["auth_provider"]),
+                "created_at": datetime.fromisoformat(snapshot["created_at"]),
+                "updated_at": datetime.fromisoformat(snapshot["updated_at"]),
+                "deleted_at": None,
+            }
+        )
+        make_transient_to_detached(user)
+        return await self.db.merge(user, load=False)
 
-    def get_user_by_email(self, email: str) -> User | None:
-        return self.db.execute(
+    async def get_user_by_email(self, email: str) -> User | None:
+        result = await self.db.execute(
             select(User).where(
                 User.email == email,
                 User.deleted_at.is_(None),
             )
-        ).scalar_one_or_none()
+        )
+        return result.scalar_one_or_none()
 
-    def google_login(self, code: str, redirect_uri: str) -> Token:
+    async def google_login(self, code: str, redirect_uri: str) -> Token:
         # 구글 액세스 토큰 요청
-        response = httpx.post(
+        response = await self.http_client.post(
             "https://oauth2.googleapis.com/token",
             data={
                 "code": code,
@@ -48,7 +80,7 @@ class AuthService:
         google_token = GoogleToken.model_validate(response.json())
 
         # 구글 계정 조회 및 이메일 추출
-        response = httpx.get(
+        response = await self.http_client.get(
             "https://www.googleapis.com/oauth2/v2/userinfo",
             headers={
                 "Authorization": f"{google_token.token_type} {google_token.access_token}"
@@ -63,9 +95,10 @@ class AuthService:
             )
 
         # 이메일로 유저 조회
-        user = self.db.execute(
+        result = await self.db.execute(
             select(User).where(User.email == google_user.email)
-        ).scalar_one_or_none()
+        )
+        user = result.scalar_one_or_none()
 
         # 유저가 삭제된 경우 예외 처리
         if user and user.deleted_at:
@@ -84,8 +117,8 @@ class AuthService:
                 auth_provider=User.AuthProvider.GOOGLE,
             )
             self.db.add(user)
-            self.db.commit()
-            self.db.refresh(user)
+            await self.db.commit()
+            await self.db.refresh(user)
 
         # 해당 유저의 토큰 발행
         return Token(
@@ -95,9 +128,9 @@ class AuthService:
             token_type="Bearer",
         )
 
-    def apple_login(self, code: str, redirect_uri: str) -> Token:
-        client_secret = self._generate_apple_client_secret()
-        response = httpx.post(
+    async def apple_login(self, code: str, redirect_uri: str) -> Token:
+        client_secret = await crypto_executor.run(self._generate_apple_client_secret)
+        response = await self.http_client.post(
             "https://appleid.apple.com/auth/oauth2/v2/token",
             data={
                 "client_id": settings.APPLE_CLIENT_ID,
@@ -115,9 +148,8 @@ class AuthService:
             raise HTTPException(status_code=401, detail="Apple account is not verified")
 
         # 이메일로 유저 조회
-        user = self.db.execute(
-            select(User).where(User.email == email)
-        ).scalar_one_or_none()
+        result = await self.db.execute(select(User).where(User.email == email))
+        user = result.scalar_one_or_none()
 
         # 유저가 삭제된 경우 예외 처리
         if user and user.deleted_at:
@@ -134,8 +166,8 @@ class AuthService:
                 auth_provider=User.AuthProvider.APPLE,
             )
             self.db.add(user)
-            self.db.commit()
-            self.db.refresh(user)
+            await self.db.commit()
+            await self.db.refresh(user)
 
         return Token(
             access_token=create_access_token(
@@ -163,3 +195,17 @@ class AuthService:
             headers=headers,
         )
         return token
+
+
+def _snapshot(user: User) -> dict[str, Any]:
+    return {
+        "id": user.id,
+        "code": user.code,
+        "email": user.email,
+        "nickname": user.nickname,
+        "is_admin": user.is_admin,
+        "profile_image_url": user.profile_image_url,
+        "auth_provider": user.auth_provider.value,
+        "created_at": user.created_at.isoformat(),
+        "updated_at": user.updated_at.isoformat(),
+    }
@@ -0,0 +1,266 @@
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Protocol
+
+from sqlalchemy import ColumnElement, Select, func, literal, select, tuple_, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased, joinedload
+from sqlalchemy.orm.attributes import set_committed_value
+
+from app.core.config import settings
+from app.core.db import count_rows
+from app.core.responses import Validator
+from app.models import Comment, User
+from app.utils import decode_created_at_cursor, encode_cursor
+
+
+class CommentListFilter(Protocol):
+    include_count: bool
+    cursor: str | None
+    page_size: int
+
+    def model_dump(self, **kwargs: Any) -> dict[str, Any]: ...
+
+
+@dataclass
+class CommentPage:
+    comments: list[Comment]
+    # 댓글 id별 삭제되지 않은 답글 수
+    reply_counts: dict[int, int]
+    count: int | None
+    next_cursor: str | None
+
+
+async def load_comment_threads(db: AsyncSession, *root_criteria: Any) -> list[Comment]:
+    """root_criteria에 맞는 댓글과 하위 댓글을 재귀 쿼리 한 번으로 읽어 트리로 만듭니다.
+
+    삭제된 댓글과 그 하위 댓글은 제외하고, COMMENT_THREAD_MAX_DEPTH보다 깊은
+    댓글은 읽지 않습니다. 각 댓글의 replies는 작성순으로 채워집니다.
+    """
+    roots = (
+        select(Comment.id, literal(1).label("depth"))
+        .where(*root_criteria, Comment.deleted_at.is_(None))
+        .cte("thread", recursive=True)
+    )
+    replies = (
+        select(Comment.id, (roots.c.depth + 1).label("depth"))
+        .join(roots, Comment.parent_id == roots.c.id)
+        .where(
+            Comment.deleted_at.is_(None),
+            roots.c.depth < settings.COMMENT_THREAD_MAX_DEPTH,
+        )
+    )
+    thread = roots.union_all(replies)
+    result = await db.execute(
+        select(Comment, thread.c.depth)
+        .join(thread, Comment.id == thread.c.id)
+        .options(joinedload(Comment.author))
+        .order_by(Comment.created_at, Comment.id)
+        .execution_options(populate_existing=True)
+    )
+    rows = result.all()
+
+    threads: list[Comment] = []
+    children: defaultdict[int, list[Comment]] = defaultdict(list)
+    for comment, depth in rows:
+        if depth == 1:
+            threads.append(comment)
+        else:
+            children[comment.parent_id].append(comment)
+    # 이미 읽은 값으로 채우므로 lazy load나 flush 대상 변경이 생기지 않습니다.
+    for comment, _ in rows:
+        set_committed_value(comment, "replies", children[comment.id])
+    return threads
+
+
+async def lock_reply_parent(
+    db: AsyncSession, scope: ColumnElement[bool], code: str
+) -> int | None:
+    """답글을 달 부모 댓글의 id를 돌려줍니다. 부모나 상위 댓글이 삭제되었으면 None입니다.
+
+    스레드를 삭제할 때는 삭제할 댓글을 잠근 뒤 하위 댓글을 한 번에 삭제하므로, 부모만
+    잠그면 더 위의 댓글이 삭제되는 동안 답글이 달려 삭제되지 않고 남을 수 있습니다.
+    부모부터 최상위 댓글까지 모두 공유 잠금을 걸고, 삭제 중이면 삭제가 끝난 뒤 다시
+    확인합니다. 삭제와 교착되지 않도록 삭제와 같은 순서로 위에서부터 잠급니다.
+    """
+    path = (
+        select(Comment.id, Comment.parent_id, literal(0).label("depth"))
+        .where(scope, Comment.code == code)
+        .cte("path", recursive=True)
+    )
+    path = path.union_all(
+        select(Comment.id, Comment.parent_id, path.c.depth + 1).join(
+            path, Comment.id == path.c.parent_id
+        )
+    )
+    result = await db.execute(
+        select(Comment.id, Comment.deleted_at)
+        .join(path, Comment.id == path.c.id)
+        .order_by(path.c.depth.desc())
+        .with_for_update(read=True, of=Comment)
+    )
+    rows = result.all()
+    if not rows or any(row.deleted_at is not None for row in rows):
+        return None
+    return rows[-1].id
+
+
+async def delete_comment_thread(
+    db: AsyncSession, comment_id: int, deleted_at: datetime
+) -> int:
+    """댓글과 삭제되지 않은 하위 댓글을 모두 삭제하고 삭제한 댓글 수를 돌려줍니다.
+
+    삭제된 댓글의 답글은 목록에 나오지 않으므로 함께 삭제해서 댓글 수와 목록을 맞춥니다.
+    동시에 하위 댓글을 삭제해도 deleted_at 조건을 다시 확인하므로 한 번만 셉니다.
+    호출하기 전에 댓글을 FOR UPDATE로 잠가야 합니다. 답글을 달 때는 lock_reply_parent가
+    부모부터 최상위 댓글까지 공유 잠금을 걸므로, 삭제하는 동안 어느 깊이에도 답글이
+    새로 달리지 않습니다.
+    """
+    thread = (
+        select(Comment.id).where(Comment.id == comment_id).cte("thread", recursive=True)
+    )
+    thread = thread.union_all(
+        select(Comment.id)
+        .join(thread, Comment.parent_id == thread.c.id)
+        .where(Comment.deleted_at.is_(None))
+    )
+    result = await db.execute(
+        update(Comment)
+        .where(Comment.id.in_(select(thread.c.id)), Comment.deleted_at.is_(None))
+        .values(deleted_at=deleted_at)
+        .returning(Comment.id)
+        .execution_options(synchronize_session="fetch")
+    )
+    return len(result.all())
+
+
+async def load_comment_page(
+    db: AsyncSession,
+    filters: CommentListFilter,
+    *,
+    scope: ColumnElement[bool],
+    parent_id: int | None = None,
+) -> CommentPage:
+    """scope(게시글 또는 그림) 안에서 parent_id의 답글(None이면 최상위 댓글)을 한 페이지 읽습니다.
+
+    (created_at, id) 순의 커서로 페이지를 나누고, 각 댓글에는 처음
+    COMMENT_REPLY_PREVIEW_SIZE개의 답글만 채웁니다. 나머지 답글은 답글 목록 API로
+    이어서 읽습니다.
+    """
+    stmt = (
+        select(Comment)
+        .where(
+            scope,
+            Comment.parent_id.is_(None)
+            if parent_id is None
+            else Comment.parent_id == parent_id,
+            Comment.deleted_at.is_(None),
+        )
+        .order_by(Comment.created_at, Comment.id)
+    )
+    count = await count_rows(db, stmt) if filters.include_count else None
+
+    if filters.cursor:
+        created_at, last_id = decode_created_at_cursor(filters.cursor, filters)
+        stmt = stmt.where(
+            tuple_(Comment.created_at, Comment.id) > tuple_(created_at, last_id)
+        )
+    result = await db.execute(
+        stmt.options(joinedload(Comment.author))
+        .limit(filters.page_size + 1)
+        .execution_options(populate_existing=True)
+    )
+    comments = list(result.scalars().all())
+    next_cursor = None
+    if len(comments) > filters.page_size:
+        comments = comments[: filters.page_size]
+        last = comments[-1]
+        next_cursor = encode_cursor(last.id, filters, created_at=last.created_at)
+
+    # 댓글마다 작성순으로 번호를 매겨 처음 몇 개의 답글만 읽습니다.
+    ranked = (
+        select(
+            Comment,
+            func.row_number()
+            .over(
+                partition_by=Comment.parent_id,
+                order_by=(Comment.created_at, Comment.id),
+            )
+            .label("rank"),
+        )
+        .where(
+            scope,
+            Comment.parent_id.in_([comment.id for comment in comments]),
+            Comment.deleted_at.is_(None),
+        )
+        .subquery()
+    )
+    reply = aliased(Comment, ranked)
+    result = await db.execute(
+        select(reply)
+        .options(joinedload(reply.author))
+        .where(ranked.c.rank <= settings.COMMENT_REPLY_PREVIEW_SIZE)
+        .order_by(ranked.c.created_at, ranked.c.id)
+        .execution_options(populate_existing=True)
+    )
+    replies = result.scalars().all()
+
+    children: defaultdict[int, list[Comment]] = defaultdict(list)
+    for comment in replies:
+        children[comment.parent_id].append(comment)
+    for comment in comments:
+        set_committed_value(comment, "replies", children[comment.id])
+    for comment in replies:
+        set_committed_value(comment, "replies", [])
+
+    # 페이지의 댓글과 미리 읽은 답글 모두의 답글 수를 한 번에 셉니다.
+    ids = [comment.id for comment in comments] + [reply.id for reply in replies]
+    result = await db.execute(
+        select(Comment.parent_id, func.count())
+        .where(
+            scope,
+            Comment.parent_id.in_(ids),
+            Comment.deleted_at.is_(None),
+        )
+        .group_by(Comment.parent_id)
+    )
+    reply_counts = {comment_id: 0 for comment_id in ids}
+    reply_counts.update(result.tuples().all())
+
+    return CommentPage(
+        comments=comments,
+        reply_counts=reply_counts,
+        count=count,
+        next_cursor=next_cursor,
+    )
+
+
+def comment_list_state(scope: ColumnElement[bool]) -> Select:
+    """scope의 삭제되지 않은 댓글 수, 가장 최근 updated_at, 작성자의 가장 최근 updated_at.
+
+    댓글 쪽은 (post_id|drawing_id, updated_at) INCLUDE (author_id) 부분 인덱스만
+    읽고, 작성자는 user의 기본 키로 찾습니다.
+    """
+    return (
+        select(func.count(), func.max(Comment.updated_at), func.max(User.updated_at))
+        .join(User, Comment.author_id == User.id)
+        .where(scope, Comment.deleted_at.is_(None))
+    )
+
+
+async def comment_list_validator(
+    db: AsyncSession, scope: ColumnElement[bool], updated_at: datetime
+) -> Validator:
+    """scope(게시글 또는 그림)의 댓글 목록 응답의 ETag와 Last-Modified를 만듭니다.
+
+    댓글을 추가하면 수가, 수정하면 updated_at이, 삭제하면 수가 바뀌므로 삭제되지 않은
+    댓글의 수와 가장 최근 updated_at을 비교합니다. 응답에는 작성자의 닉네임과 프로필
+    이미지도 들어가므로 작성자들의 가장 최근 updated_at도 함께 비교합니다.
+    updated_at은 scope의 updated_at으로, 댓글이 없을 때 Last-Modified로 씁니다.
+    """
+    result = await db.execute(comment_list_state(scope))
+    count, comments_updated_at, authors_updated_at = result.one()
+    return Validator.create(
+        [updated_at, comments_updated_at, authors_updated_at], count
+    )
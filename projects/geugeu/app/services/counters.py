@@ -0,0 +1,108 @@
+"""Post, Drawing에 비정규화한 관심, 댓글, 그림 수.
+
+서비스는 행을 추가하거나 삭제하는 트랜잭션 안에서 update_*_counts로 수를 함께
+바꿉니다. 값을 읽어 계산하지 않고 UPDATE 한 번으로 더하므로 동시에 바꿔도 잃는 값이
+없습니다. 어긋난 수는 reconcile_counts(python -m app.reconcile_counts)로 다시 셉니다.
+"""
+
+from collections.abc import Callable
+from typing import Any
+
+from sqlalchemy import ColumnElement, Update, func, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+
+from app.models import Comment, Drawing, Interest, Post
+
+
+def update_post_counts(post_id: int | ColumnElement[Any], **deltas: Any) -> Update:
+    return _update_counts(Post, post_id, deltas)
+
+
+def update_drawing_counts(
+    drawing_id: int | ColumnElement[Any], **deltas: Any
+) -> Update:
+    return _update_counts(Drawing, drawing_id, deltas)
+
+
+def _update_counts(
+    model: type[Post] | type[Drawing],
+    id_: int | ColumnElement[Any],
+    deltas: dict[str, Any],
+) -> Update:
+    # 수만 바뀐 것은 수정이 아니므로 updated_at은 그대로 둡니다.
+    return (
+        update(model)
+        .where(model.id == id_)
+        .values(
+            {name: getattr(model, name) + delta for name, delta in deltas.items()}
+            | {"updated_at": model.updated_at}
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+
+def _post_counts(post: type[Post]) -> dict[str, Any]:
+    return {
+        "interest_count": select(func.count())
+        .where(Interest.post_id == post.id, Interest.deleted_at.is_(None))
+        .scalar_subquery(),
+        "comment_count": select(func.count())
+        .where(Comment.post_id == post.id, Comment.deleted_at.is_(None))
+        .scalar_subquery(),
+        "drawing_count": select(func.count())
+        .where(Drawing.post_id == post.id, Drawing.deleted_at.is_(None))
+        .scalar_subquery(),
+    }
+
+
+def _drawing_counts(drawing: type[Drawing]) -> dict[str, Any]:
+    return {
+        "comment_count": select(func.count())
+        .where(Comment.drawing_id == drawing.id, Comment.deleted_at.is_(None))
+        .scalar_subquery(),
+    }
+
+
+async def reconcile_counts(db: AsyncSession, *, batch_size: int = 1000) -> int:
+    """모든 post와 drawing의 수를 실제 행 수로 다시 계산하고, 고친 행 수를 돌려줍니다.
+
+    잠금을 오래 잡지 않도록 id 구간마다 나눠 커밋하고, 값이 다른 행만 갱신합니다.
+    """
+    fixed = 0
+    for model, counts_of in [(Post, _post_counts), (Drawing, _drawing_counts)]:
+        max_id = await db.scalar(select(func.max(model.id))) or 0
+        for start in range(0, max_id, batch_size):
+            fixed += await _reconcile_batch(
+                db, model, counts_of, start, start + batch_size
+            )
+            await db.commit()
+    return fixed
+
+
+async def _reconcile_batch(
+    db: AsyncSession,
+    model: type[Post] | type[Drawing],
+    counts_of: Callable[[Any], dict[str, Any]],
+    start: int,
+    end: int,
+) -> int:
+    row = aliased(model)
+    counts = counts_of(row)
+    actual = (
+        select(row.id, *(count.label(name) for name, count in counts.items()))
+        .where(row.id > start, row.id <= end)
+        .subquery()
+    )
+    result = await db.execute(
+        update(model)
+        .where(
+            model.id == actual.c.id,
+            or_(*(getattr(model, name) != actual.c[name] for name in counts)),
+        )
+        .values(
+            {name: actual.c[name] for name in counts} | {"updated_at": model.updated_at}
+        )
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount
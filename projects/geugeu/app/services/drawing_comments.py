@@ -2,46 +2,54 @@ from datetime import UTC, datetime
 
 from fastapi import HTTPException
 from sqlalchemy import select
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.db import read_replica
+from app.core.responses import Validator
 from app.models import Comment, Drawing, User
 from app.schemas.drawing_comments import (
+    CommentListFilter,
     CommentListSchema,
     CommentSchema,
     CreateCommentSchema,
     UpdateCommentSchema,
 )
+from app.services.comment_threads import (
+    comment_list_validator,
+    delete_comment_thread,
+    load_comment_page,
+    load_comment_threads,
+    lock_reply_parent,
+)
+from app.services.counters import update_drawing_counts
 
 
 class DrawingCommentService:
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
 
-    def create_comment(
+    async def create_comment(
         self,
         *,
         user: User,
         drawing_code: str,
         payload: CreateCommentSchema,
     ) -> CommentSchema:
-        drawing = self.db.execute(
+        result = await self.db.execute(
             select(Drawing).where(
                 Drawing.code == drawing_code,
                 Drawing.deleted_at.is_(None),
             )
-        ).scalar_one_or_none()
+        )
+        drawing = result.scalar_one_or_none()
         if not drawing:
             raise HTTPException(status_code=404, detail="Drawing not found")
         if payload.parent_code:
-            parent = self.db.execute(
-                select(Comment).where(
-                    Comment.code == payload.parent_code,
-                    Comment.deleted_at.is_(None),
-                )
-            ).scalar_one_or_none()
-            if not parent:
+            parent_id = await lock_reply_parent(
+                self.db, Comment.drawing_id == drawing.id, payload.parent_code
+            )
+            if not parent_id:
                 raise HTTPException(status_code=400, detail="Invalid parent code")
-            parent_id = parent.id
         else:
             parent_id = None
         comment = Comment(
@@ -51,68 +59,126 @@ class DrawingCommentService:
             content=payload.content,
         )
         self.db.add(comment)
-        self.db.commit()
-        return CommentSchema.from_model(comment)
+        await self.db.execute(update_drawing_counts(drawing.id, comment_count=1))
+        await self.db.commit()
+        return CommentSchema.from_model(
+            await self._get_comment(comment.code, drawing.id)
+        )
+
+    @read_replica
+    async def get_comments_validator(self, *, drawing_code: str) -> Validator:
+        # 답글 목록도 같은 drawing의 댓글이므로 get_comments, get_replies가 함께 씁니다.
+        result = await self.db.execute(
+            select(Drawing.id, Drawing.updated_at).where(
+                Drawing.code == drawing_code,
+                Drawing.deleted_at.is_(None),
+            )
+        )
+        drawing = result.one_or_none()
+        if not drawing:
+            raise HTTPException(status_code=404, detail="Drawing not found")
+        return await comment_list_validator(
+            self.db, Comment.drawing_id == drawing.id, drawing.updated_at
+        )
 
-    def get_comments(
+    @read_replica
+    async def get_comments(
         self,
         *,
         user: User,
         drawing_code: str,
+        filters: CommentListFilter,
     ) -> CommentListSchema:
-        drawing = self.db.execute(
+        result = await self.db.execute(
             select(Drawing).where(
                 Drawing.code == drawing_code,
                 Drawing.deleted_at.is_(None),
             )
-        ).scalar_one_or_none()
+        )
+        drawing = result.scalar_one_or_none()
         if not drawing:
             raise HTTPException(status_code=404, detail="Drawing not found")
-        comments = (
-            self.db.execute(
-                select(Comment)
-                .options(joinedload(Comment.author))
-                .where(
-                    Comment.drawing_id == drawing.id,
-                    Comment.deleted_at.is_(None),
-                )
-            )
-            .scalars()
-            .all()
+        # 답글은 최상위 댓글의 replies에 담기므로 최상위 댓글만 나열합니다.
+        page = await load_comment_page(
+            self.db,
+            filters,
+            scope=Comment.drawing_id == drawing.id,
         )
         return CommentListSchema(
-            count=len(comments),
-            items=[CommentSchema.from_model(comment) for comment in comments],
+            count=page.count,
+            items=[
+                CommentSchema.from_model(comment, page.reply_counts)
+                for comment in page.comments
+            ],
+            next_cursor=page.next_cursor,
         )
 
-    def get_comment(
+    @read_replica
+    async def get_replies(
         self,
         *,
         user: User,
         drawing_code: str,
         comment_code: str,
-    ) -> CommentSchema:
-        drawing = self.db.execute(
+        filters: CommentListFilter,
+    ) -> CommentListSchema:
+        result = await self.db.execute(
             select(Drawing).where(
                 Drawing.code == drawing_code,
                 Drawing.deleted_at.is_(None),
             )
-        ).scalar_one_or_none()
+        )
+        drawing = result.scalar_one_or_none()
         if not drawing:
             raise HTTPException(status_code=404, detail="Drawing not found")
-        comment = self.db.execute(
-            select(Comment)
-            .options(joinedload(Comment.author))
-            .where(
+        result = await self.db.execute(
+            select(Comment).where(
                 Comment.code == comment_code,
+                Comment.drawing_id == drawing.id,
                 Comment.deleted_at.is_(None),
             )
-        ).scalar_one_or_none()
+        )
+        comment = result.scalar_one_or_none()
+        if not comment:
+            raise HTTPException(status_code=404, detail="Comment not found")
+        page = await load_comment_page(
+            self.db,
+            filters,
+            scope=Comment.drawing_id == drawing.id,
+            parent_id=comment.id,
+        )
+        return CommentListSchema(
+            count=page.count,
+            items=[
+                CommentSchema.from_model(reply, page.reply_counts)
+                for reply in page.comments
+            ],
+            next_cursor=page.next_cursor,
+        )
+
+    @read_replica
+    async def get_comment(
+        self,
+        *,
+        user: User,
+        drawing_code: str,
+        comment_code: str,
+    ) -> CommentSchema:
+        result = await self.db.execute(
+            select(Drawing).where(
+                Drawing.code == drawing_code,
+                Drawing.deleted_at.is_(None),
+            )
+        )
+        drawing = result.scalar_one_or_none()
+        if not drawing:
+            raise HTTPException(status_code=404, detail="Drawing not found")
+        comment = await self._get_comment(comment_code, drawing.id)
         if not comment:
             raise HTTPException(status_code=404, detail="Comment not found")
         return CommentSchema.from_model(comment)
 
-    def update_comment(
+    async def update_comment(
         self,
         *,
         user: User,
@@ -120,22 +186,16 @@ class DrawingCommentService:
         comment_code: str,
         payload: UpdateCommentSchema,
     ) -> CommentSchema:
-        drawing = self.db.execute(
+        result = await self.db.execute(
             select(Drawing).where(
                 Drawing.code == drawing_code,
                 Drawing.deleted_at.is_(None),
             )
-        ).scalar_one_or_none()
+        )
+        drawing = result.scalar_one_or_none()
         if not drawing:
             raise HTTPException(status_code=404, detail="Drawing not found")
-        comment = self.db.execute(
-            select(Comment)
-            .options(joinedload(Comment.author))
-            .where(
-                Comment.code == comment_code,
-                Comment.deleted_at.is_(None),
-            )
-        ).scalar_one_or_none()
+        comment = await self._get_comment(comment_code, drawing.id)
         if not comment:
             raise HTTPException(status_code=404, detail="Comment not found")
         if comment.author_id == user.id or user.is_admin:
@@ -143,35 +203,50 @@ class DrawingCommentService:
         else:
             raise HTTPException(status_code=403, detail="Forbidden")
         comment.content = payload.content
-        self.db.commit()
-        return CommentSchema.from_model(comment)
+        await self.db.commit()
+        return CommentSchema.from_model(
+            await self._get_comment(comment.code, drawing.id)
+        )
 
-    def delete_comment(
+    async def delete_comment(
         self,
         *,
         user: User,
         drawing_code: str,
         comment_code: str,
     ) -> None:
-        drawing = self.db.execute(
+        result = await self.db.execute(
             select(Drawing).where(
                 Drawing.code == drawing_code,
                 Drawing.deleted_at.is_(None),
             )
-        ).scalar_one_or_none()
+        )
+        drawing = result.scalar_one_or_none()
         if not drawing:
             raise HTTPException(status_code=404, detail="Drawing not found")
-        comment = self.db.execute(
-            select(Comment).where(
+        result = await self.db.execute(
+            select(Comment)
+            .where(
                 Comment.code == comment_code,
+                Comment.drawing_id == drawing.id,
                 Comment.deleted_at.is_(None),
             )
-        ).scalar_one_or_none()
+            # 동시에 삭제해도 댓글 수를 한 번만 빼도록 잠급니다.
+            .with_for_update()
+        )
+        comment = result.scalar_one_or_none()
         if not comment:
             raise HTTPException(status_code=404, detail="Comment not found")
         if comment.author_id == user.id or user.is_admin:
             pass
         else:
             raise HTTPException(status_code=403, detail="Forbidden")
-        comment.deleted_at = datetime.now(UTC)
-        self.db.commit()
+        deleted = await delete_comment_thread(self.db, comment.id, datetime.now(UTC))
+        await self.db.execute(update_drawing_counts(drawing.id, comment_count=-deleted))
+        await self.db.commit()
+
+    async def _get_comment(self, code: str, drawing_id: int) -> Comment | None:
+        comments = await load_comment_threads(
+            self.db, Comment.code == code, Comment.drawing_id == drawing_id
+        )
+        return comments[0] if comments else None
@@ -1,59 +1,105 @@
+from dataclasses import asdict
 from datetime import UTC, datetime
+from typing import TYPE_CHECKING
 
 from fastapi import HTTPException, UploadFile
-from sqlalchemy import exists, func, select
-from sqlalchemy.orm import Session, joinedload, selectinload, with_loader_criteria
+from sqlalchemy import Row, exists, func, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased, joinedload, selectinload, with_loader_criteria
 
+from app.core.cache import drawing_cache, versioned_key
+from app.core.db import count_rows, read_replica
+from app.core.responses import Validator
 from app.models import Drawing, Image, Post, User
 from app.schemas.drawings import DrawingListFilter, DrawingListSchema, DrawingSchema
-from app.utils import upload_file
+from app.services.counters import update_post_counts
+from app.services.jobs import enqueue_image_derivatives, enqueue_image_deletion
+from app.services.projections import image_list, user_columns
+from app.utils import collect_images, decode_cursor, delete_files, encode_cursor
+
+
+if TYPE_CHECKING:
+    from mypy_boto3_s3 import S3Client
+
+
+# 캐시에 넣지 않고 get_drawing마다 읽는 값
+DRAWING_STATE_FIELDS = ("comment_count",)
 
 
 class DrawingService:
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession, s3_client: "S3Client"):
         self.db = db
+        self.s3_client = s3_client
 
-    def create_drawing(
-        self, user: User, post_code: str, content: str, files: list[UploadFile]
+    async def create_drawing(
+        self,
+        user: User,
+        post_code: str,
+        content: str,
+        files: list[UploadFile],
+        image_keys: list[str],
     ) -> DrawingSchema:
-        post = self.db.execute(
+        result = await self.db.execute(
             select(Post).where(
                 Post.code == post_code,
                 Post.deleted_at.is_(None),
             )
-        ).scalar_one()
+        )
+        post = result.scalar_one_or_none()
+        if post is None:
+            raise HTTPException(status_code=404, detail="Post not found")
 
-        if self.db.execute(
-            exists(Drawing.id)
-            .where(Drawing.post_id == post.id, Drawing.deleted_at.is_(None))
-            .select()
+        # 대부분의 중복 요청은 업로드하기 전에 거절하고, 확인과 INSERT 사이에 끼어든
+        # 요청은 uq_drawing_post_id_author_id로 막습니다.
+        if (
+            await self.db.execute(
+                exists(Drawing.id)
+                .where(
+                    Drawing.post_id == post.id,
+                    Drawing.author_id == user.id,
+                    Drawing.deleted_at.is_(None),
+                )
+                .select()
+            )
         ).scalar():
             raise HTTPException(status_code=400, detail="Drawing already exists")
 
-        with self.db.begin_nested():
-            drawing = Drawing(post_id=post.id, author_id=user.id, content=content)
-            self.db.add(drawing)
-            self.db.flush()
+        # 업로드하는 동안 DB 커넥션을 붙잡지 않도록 읽기 트랜잭션을 먼저 끝냅니다.
+        await self.db.commit()
+        uploaded = await collect_images(
+            self.db, self.s3_client, user, files, image_keys
+        )
 
-            images = []
-            for file in files:
-                image_url = upload_file(file)
-                image = Image(drawing_id=drawing.id, url=image_url)
-                images.append(image)
-            self.db.add_all(images)
+        try:
+            async with self.db.begin_nested():
+                drawing = Drawing(post_id=post.id, author_id=user.id, content=content)
+                self.db.add(drawing)
+                await self.db.flush()
+                await self.db.execute(update_post_counts(post.id, drawing_count=1))
+                images = [
+                    Image(drawing_id=drawing.id, **asdict(image)) for image in uploaded
+                ]
+                self.db.add_all(images)
+                await self.db.flush()
+                enqueue_image_derivatives(self.db, images)
+        except IntegrityError as e:
+            if "uq_drawing_post_id_author_id" not in str(e.orig):
+                raise
+            # 이 요청이 올린 파일(collect_images 결과의 앞쪽)만 지우고, 클라이언트가 직접
+            # 올린 파일은 다시 시도할 수 있도록 남겨 둡니다.
+            await delete_files(
+                self.s3_client, [image.url for image in uploaded[: len(files)]]
+            )
+            raise HTTPException(status_code=400, detail="Drawing already exists")
 
-        self.db.commit()
-        return DrawingSchema.from_model(drawing)
+        await self.db.commit()
+        return DrawingSchema.from_model(await self._get_drawing(drawing.code))
 
-    def get_drawings(self, filters: DrawingListFilter) -> DrawingListSchema:
+    @read_replica
+    async def get_drawings(self, filters: DrawingListFilter) -> DrawingListSchema:
         stmt = (
             select(Drawing)
-            .options(
-                joinedload(Drawing.post),
-                joinedload(Drawing.author),
-                selectinload(Drawing.images),
-                with_loader_criteria(Image, Image.deleted_at.is_(None)),
-            )
             .where(Drawing.deleted_at.is_(None))
             .order_by(Drawing.id.desc())
         )
@@ -68,59 +114,121 @@ class DrawingService:
                 User.code == filters.author_code
             )
 
-        offset = (filters.page - 1) * filters.page_size
-        count = self.db.execute(
-            select(func.count()).select_from(stmt.subquery())
-        ).scalar_one()
-        rows = (
-            self.db.execute(stmt.offset(offset).limit(filters.page_size))
-            .scalars()
-            .all()
+        count = None
+        if filters.include_count:
+            count = await count_rows(
+                self.db,
+                stmt,
+                estimate_table=(
+                    None if filters.post_code or filters.author_code else Drawing
+                ),
+            )
+
+        if filters.cursor:
+            # 마지막으로 받은 행 다음부터 읽으므로 앞 페이지를 건너뛰지 않습니다.
+            stmt = stmt.where(Drawing.id < decode_cursor(filters.cursor, filters))
+        else:
+            stmt = stmt.offset((filters.page - 1) * filters.page_size)
+
+        # ORM 객체를 만들지 않고 응답에 필요한 컬럼만 읽습니다.
+        post = aliased(Post)
+        author = aliased(User)
+        stmt = (
+            stmt.with_only_columns(
+                Drawing.id,
+                Drawing.code,
+                Drawing.content,
+                Drawing.comment_count,
+                Drawing.created_at,
+                Drawing.updated_at,
+                post.code.label("post_code"),
+                *user_columns(author, "author"),
+                image_list(Image.drawing_id, Drawing.id),
+            )
+            .join(post, Drawing.post_id == post.id)
+            .join(author, Drawing.author_id == author.id)
         )
+
+        # 다음 페이지가 있는지 알기 위해 한 행을 더 읽습니다.
+        rows = (await self.db.execute(stmt.limit(filters.page_size + 1))).all()
+        next_cursor = None
+        if len(rows) > filters.page_size:
+            rows = rows[: filters.page_size]
+            # page_size가 0이면 돌려줄 행이 없으므로 커서도 만들지 않습니다.
+            if rows:
+                next_cursor = encode_cursor(rows[-1].id, filters)
+
         return DrawingListSchema(
             count=count,
-            items=[DrawingSchema.from_model(row) for row in rows],
+            items=[DrawingSchema.from_row(row) for row in rows],
+            next_cursor=next_cursor,
         )
 
-    def get_drawing(self, code: str) -> DrawingSchema:
-        drawing = self.db.execute(
-            select(Drawing)
-            .options(
-                joinedload(Drawing.post),
-                joinedload(Drawing.author),
-                selectinload(Drawing.images),
-                with_loader_criteria(Image, Image.deleted_at.is_(None)),
-            )
-            .where(
-                Drawing.code == code,
-                Drawing.deleted_at.is_(None),
+    @read_replica
+    async def get_drawing_state(self, code: str) -> Row:
+        """drawing, 작성자, 이미지의 updated_at과 DRAWING_STATE_FIELDS 순서의 값을 읽습니다.
+
+        라우트는 이 행 하나로 get_drawing_validator와 get_drawing을 함께 부릅니다.
+        """
+        author = aliased(User)
+        images_updated_at = (
+            select(func.max(Image.updated_at))
+            .where(Image.drawing_id == Drawing.id, Image.deleted_at.is_(None))
+            .scalar_subquery()
+        )
+        result = await self.db.execute(
+            select(
+                Drawing.updated_at,
+                author.updated_at,
+                images_updated_at,
+                Drawing.comment_count,
             )
-        ).scalar_one_or_none()
-        if drawing is None:
+            .join(author, Drawing.author_id == author.id)
+            .where(Drawing.code == code, Drawing.deleted_at.is_(None))
+        )
+        row = result.one_or_none()
+        if row is None:
             raise HTTPException(status_code=404, detail="Drawing not found")
-        return DrawingSchema.from_model(drawing)
+        return row
+
+    def get_drawing_validator(self, state: Row) -> Validator:
+        """get_drawing_state로 get_drawing 응답의 ETag와 Last-Modified만 만듭니다.
+
+        drawing, 작성자, 이미지의 updated_at과 댓글 수가 같으면 응답도 같습니다.
+        """
+        return Validator.create(list(state[:3]), *state[3:])
+
+    @read_replica
+    async def get_drawing(self, code: str, state: Row) -> DrawingSchema:
+        """drawing을 drawing_cache에서 읽고, 없으면 DB에서 읽어 캐시에 넣습니다.
 
-    def update_drawing(
+        댓글 수는 캐시에 넣지 않고 get_drawing_state로 읽은 값으로 덮어씁니다. 캐시
+        key도 state의 updated_at으로 만듭니다.
+        """
+        key = versioned_key(code, *state[:3])
+        cached = await drawing_cache.get(key)
+        if cached is None:
+            drawing = await self._get_drawing(code)
+            if drawing is None:
+                raise HTTPException(status_code=404, detail="Drawing not found")
+            cached = DrawingSchema.from_model(drawing).model_dump(
+                mode="json", exclude=set(DRAWING_STATE_FIELDS)
+            )
+            await drawing_cache.set(key, cached)
+        return DrawingSchema.model_validate(
+            cached | dict(zip(DRAWING_STATE_FIELDS, state[3:], strict=True))
+        )
+
+    async def update_drawing(
         self,
         *,
         user: User,
         code: str,
         content: str,
         files: list[UploadFile],
+        image_keys: list[str],
     ) -> DrawingSchema:
-        drawing = self.db.execute(
-            select(Drawing)
-            .options(
-                joinedload(Drawing.post),
-                joinedload(Drawing.author),
-                selectinload(Drawing.images),
-                with_loader_criteria(Image, Image.deleted_at.is_(None)),
-            )
-            .where(
-                Drawing.code == code,
-                Drawing.deleted_at.is_(None),
-            )
-        ).scalar_one_or_none()
+        drawing = await self._get_drawing(code)
         if drawing is None:
             raise HTTPException(status_code=404, detail="Drawing not found")
         if drawing.author_id == user.id or user.is_admin:
@@ -128,7 +236,15 @@ class DrawingService:
         else:
             raise HTTPException(status_code=403, detail="Forbidden")
 
-        with self.db.begin_nested():
+        cache_key = _cache_key(drawing)
+
+        # 업로드하는 동안 DB 커넥션을 붙잡지 않도록 읽기 트랜잭션을 먼저 끝냅니다.
+        await self.db.commit()
+        uploaded = await collect_images(
+            self.db, self.s3_client, user, files, image_keys
+        )
+
+        async with self.db.begin_nested():
             # drawing 수정
             drawing.content = content
             self.db.add(drawing)
@@ -139,24 +255,32 @@ class DrawingService:
                 self.db.add(image)
 
             # 새로운 drawing images 생성
-            images = []
-            for file in files:
-                image_url = upload_file(file)
-                image = Image(drawing_id=drawing.id, url=image_url)
-                images.append(image)
+            images = [
+                Image(drawing_id=drawing.id, **asdict(image)) for image in uploaded
+            ]
             self.db.add_all(images)
+            await self.db.flush()
+            enqueue_image_derivatives(self.db, images)
+            # S3의 원본과 축소본은 커밋한 뒤 작업 워커가 지웁니다. 새 이미지가 같은 파일을
+            # 참조하면 지우지 않도록 새 이미지를 추가한 뒤에 고릅니다.
+            await enqueue_image_deletion(self.db, drawing.images)
 
-        self.db.commit()
-        self.db.refresh(drawing)
-        return DrawingSchema.from_model(drawing)
+        await self.db.commit()
+        # 수정하면 키가 바뀌어 이전 항목은 읽히지 않지만, 메모리를 바로 비웁니다.
+        await drawing_cache.delete(cache_key)
+        return DrawingSchema.from_model(await self._get_drawing(code))
 
-    def delete_drawing(self, *, code: str, user: User) -> None:
-        drawing = self.db.execute(
-            select(Drawing).where(
+    async def delete_drawing(self, *, code: str, user: User) -> None:
+        result = await self.db.execute(
+            select(Drawing)
+            .where(
                 Drawing.code == code,
                 Drawing.deleted_at.is_(None),
             )
-        ).scalar_one_or_none()
+            # 동시에 삭제해도 그림 수를 한 번만 빼도록 잠급니다.
+            .with_for_update()
+        )
+        drawing = result.scalar_one_or_none()
         if drawing is None:
             raise HTTPException(status_code=404, detail="Drawing not found")
         if drawing.author_id == user.id or user.is_admin:
@@ -164,4 +288,34 @@ class DrawingService:
         else:
             raise HTTPException(status_code=403, detail="Forbidden")
         drawing.deleted_at = datetime.now(UTC)
-        self.db.commit()
+        await self.db.execute(update_post_counts(drawing.post_id, drawing_count=-1))
+        await self.db.commit()
+        # 삭제한 drawing은 캐시를 읽기 전에 get_drawing_state가 404로 응답하므로 캐시는
+        # TTL이 지나면 사라지도록 둡니다.
+
+    async def _get_drawing(self, code: str) -> Drawing | None:
+        result = await self.db.execute(
+            select(Drawing)
+            .options(
+                joinedload(Drawing.post),
+                joinedload(Drawing.author),
+                selectinload(Drawing.images),
+                with_loader_criteria(Image, Image.deleted_at.is_(None)),
+            )
+            .where(
+                Drawing.code == code,
+                Drawing.deleted_at.is_(None),
+            )
+            .execution_options(populate_existing=True)
+        )
+        return result.scalar_one_or_none()
+
+
+def _cache_key(drawing: Drawing) -> str:
+    # _get_drawing으로 읽은 drawing의 drawing_cache 키. get_drawing_state로 만드는 키와 같습니다.
+    images_updated_at = max(
+        (image.updated_at for image in drawing.images), default=None
+    )
+    return versioned_key(
+        drawing.code, drawing.updated_at, drawing.author.updated_at, images_updated_at
+    )
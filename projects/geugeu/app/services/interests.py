@@ -1,72 +1,119 @@
-from datetime import UTC, datetime
+from collections.abc import Sequence
+from typing import Any
 
 from fastapi import HTTPException
-from sqlalchemy import func, select
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import Row, Select, exists, func, literal, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
 
-from app.models import Interest, Post, User
+from app.core.db import count_rows, read_replica
+from app.models import Interest, Post, User, generate_code
 from app.schemas.interests import (
     InterestListSchema,
     InterestResponseSchema,
     InterestSchema,
 )
+from app.services.counters import update_post_counts
+from app.services.projections import user_columns
 
 
 class InterestService:
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
 
-    def toggle_interest(self, user: User, post_code: str) -> InterestResponseSchema:
-        # Find the post
-        post = self.db.execute(
-            select(Post).where(
-                Post.code == post_code,
-                Post.deleted_at.is_(None),
-            )
-        ).scalar_one_or_none()
-
-        if not post:
-            raise HTTPException(status_code=404, detail="Post not found")
-
-        # Check if interest already exists
-        existing_interest = self.db.execute(
-            select(Interest).where(
+    async def toggle_interest(
+        self, user: User, post_code: str
+    ) -> InterestResponseSchema:
+        """관심을 추가하거나 삭제합니다.
+
+        post 조회, 기존 관심 삭제, 새 관심 추가, post의 관심 수 갱신을 하나의 쿼리로
+        실행합니다.
+        동시에 눌러도 부분 유니크 인덱스(uq_interest_user_id_post_id) 때문에
+        삭제되지 않은 관심은 유저와 post마다 하나만 남습니다.
+        """
+        target = (
+            select(Post.id)
+            .where(Post.code == post_code, Post.deleted_at.is_(None))
+            .cte("target")
+        )
+        removed = (
+            update(Interest)
+            .where(
                 Interest.user_id == user.id,
-                Interest.post_id == post.id,
+                Interest.post_id.in_(select(target.c.id)),
                 Interest.deleted_at.is_(None),
             )
-        ).scalar_one_or_none()
+            .values(deleted_at=func.now())
+            .returning(Interest.id)
+            .cte("removed")
+        )
+        # 지운 관심이 없을 때만 추가합니다. 다른 요청이 먼저 추가했다면 그대로 둡니다.
+        added = (
+            insert(Interest)
+            .from_select(
+                ["code", "user_id", "post_id"],
+                select(literal(generate_code()), literal(user.id), target.c.id).where(
+                    ~exists(select(removed.c.id))
+                ),
+            )
+            .on_conflict_do_nothing(
+                index_elements=[Interest.user_id, Interest.post_id],
+                index_where=Interest.deleted_at.is_(None),
+            )
+            .returning(Interest.id)
+            .cte("added")
+        )
+        counted = (
+            update_post_counts(
+                select(target.c.id).scalar_subquery(),
+                interest_count=select(func.count()).select_from(added).scalar_subquery()
+                - select(func.count()).select_from(removed).scalar_subquery(),
+            )
+            .returning(Post.id)
+            .cte("counted")
+        )
+        row = (
+            await self.db.execute(
+                select(
+                    exists(select(target.c.id)).label("found"),
+                    exists(select(removed.c.id)).label("removed"),
+                ).add_cte(counted)
+            )
+        ).one()
+        await self.db.commit()
 
-        if existing_interest:
-            # Remove interest (soft delete)
-            existing_interest.deleted_at = datetime.now(UTC)
-            self.db.commit()
+        if not row.found:
+            raise HTTPException(status_code=404, detail="Post not found")
+        if row.removed:
             return InterestResponseSchema(
                 success=True,
                 message="Interest removed successfully",
                 is_interested=False,
             )
-        else:
-            # Add interest
-            interest = Interest(user_id=user.id, post_id=post.id)
-            self.db.add(interest)
-            self.db.commit()
-            return InterestResponseSchema(
-                success=True,
-                message="Interest added successfully",
-                is_interested=True,
-            )
+        return InterestResponseSchema(
+            success=True,
+            message="Interest added successfully",
+            is_interested=True,
+        )
 
-    def get_post_interests(
-        self, post_code: str, current_user: User | None, page: int, page_size: int
+    @read_replica
+    async def get_post_interests(
+        self,
+        post_code: str,
+        current_user: User | None,
+        page: int,
+        page_size: int,
+        include_count: bool = True,
     ) -> InterestListSchema:
         # Find the post
-        post = self.db.execute(
+        result = await self.db.execute(
             select(Post).where(
                 Post.code == post_code,
                 Post.deleted_at.is_(None),
             )
-        ).scalar_one_or_none()
+        )
+        post = result.scalar_one_or_none()
 
         if not post:
             raise HTTPException(status_code=404, detail="Post not found")
@@ -74,10 +121,6 @@ class InterestService:
         # Base query for interests
         stmt = (
             select(Interest)
-            .options(
-                joinedload(Interest.user),
-                joinedload(Interest.post),
-            )
             .where(
                 Interest.post_id == post.id,
                 Interest.deleted_at.is_(None),
@@ -86,9 +129,7 @@ class InterestService:
         )
 
         # Count total
-        count = self.db.execute(
-            select(func.count()).select_from(stmt.subquery())
-        ).scalar_one()
+        count = await count_rows(self.db, stmt) if include_count else None
 
         # Prepare response
         result = InterestListSchema(
@@ -98,11 +139,13 @@ class InterestService:
 
         # Add is_interested only if user is authenticated
         if current_user:
-            existing_interest = self.db.execute(
-                select(Interest).where(
-                    Interest.user_id == current_user.id,
-                    Interest.post_id == post.id,
-                    Interest.deleted_at.is_(None),
+            existing_interest = (
+                await self.db.execute(
+                    select(Interest).where(
+                        Interest.user_id == current_user.id,
+                        Interest.post_id == post.id,
+                        Interest.deleted_at.is_(None),
+                    )
                 )
             ).scalar_one_or_none()
             result.is_interested = existing_interest is not None
@@ -113,23 +156,27 @@ class InterestService:
 
         # Get paginated results
         offset = (page - 1) * page_size
-        interests = (
-            self.db.execute(stmt.offset(offset).limit(page_size)).scalars().all()
-        )
+        rows = await self._get_interest_rows(stmt.offset(offset).limit(page_size))
 
-        result.items = [InterestSchema.from_model(interest) for interest in interests]
+        result.items = [InterestSchema.from_row(row) for row in rows]
         return result
 
-    def get_user_interests(
-        self, user_code: str, page: int, page_size: int
+    @read_replica
+    async def get_user_interests(
+        self,
+        user_code: str,
+        page: int,
+        page_size: int,
+        include_count: bool = True,
     ) -> InterestListSchema:
         # Find the user
-        user = self.db.execute(
+        result = await self.db.execute(
             select(User).where(
                 User.code == user_code,
                 User.deleted_at.is_(None),
             )
-        ).scalar_one_or_none()
+        )
+        user = result.scalar_one_or_none()
 
         if not user:
             raise HTTPException(status_code=404, detail="User not found")
@@ -137,10 +184,6 @@ class InterestService:
         # Base query for interests
         stmt = (
             select(Interest)
-            .options(
-                joinedload(Interest.user),
-                joinedload(Interest.post).joinedload(Post.author),
-            )
             .where(
                 Interest.user_id == user.id,
                 Interest.deleted_at.is_(None),
@@ -149,18 +192,31 @@ class InterestService:
         )
 
         # Count total
-        count = self.db.execute(
-            select(func.count()).select_from(stmt.subquery())
-        ).scalar_one()
+        count = await count_rows(self.db, stmt) if include_count else None
 
         # Get paginated results
         offset = (page - 1) * page_size
-        interests = (
-            self.db.execute(stmt.offset(offset).limit(page_size)).scalars().all()
-        )
+        rows = await self._get_interest_rows(stmt.offset(offset).limit(page_size))
 
         return InterestListSchema(
-            items=[InterestSchema.from_model(interest) for interest in interests],
+            items=[InterestSchema.from_row(row) for row in rows],
             count=count,
             # No is_interested field for user interests endpoint
         )
+
+    async def _get_interest_rows(self, stmt: Select) -> Sequence[Row[Any]]:
+        # ORM 객체를 만들지 않고 응답에 필요한 컬럼만 읽습니다.
+        user = aliased(User)
+        post = aliased(Post)
+        result = await self.db.execute(
+            stmt.with_only_columns(
+                Interest.code,
+                Interest.created_at,
+                *user_columns(user, "user"),
+                post.code.label("post_code"),
+                post.title.label("post_title"),
+            )
+            .join(user, Interest.user_id == user.id)
+            .join(post, Interest.post_id == post.id)
+        )
+        return result.all()
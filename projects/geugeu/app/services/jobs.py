@@ -0,0 +1,68 @@
+"""커밋한 뒤에 작업 워커가 처리하는 작업들.
+
+서비스는 enqueue_* 함수로 요청의 트랜잭션 안에서 작업을 추가합니다.
+"""
+
+import asyncio
+from typing import Any
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.executors import s3_executor
+from app.core.jobs import JobContext, enqueue, job_handler
+from app.models import Image
+from app.utils import create_derivatives, delete_file
+
+GENERATE_IMAGE_DERIVATIVES = "generate_image_derivatives"
+DELETE_FILES = "delete_files"
+
+
+def enqueue_image_derivatives(db: AsyncSession, images: list[Image]) -> None:
+    # 이미지 id가 필요하므로 flush한 뒤에 호출합니다.
+    for image in images:
+        enqueue(db, GENERATE_IMAGE_DERIVATIVES, {"image_id": image.id})
+
+
+async def enqueue_image_deletion(db: AsyncSession, images: list[Image]) -> None:
+    # 삭제한 이미지를 flush한 뒤에 호출합니다. 삭제되지 않은 이미지가 아직 같은 원본을
+    # 참조하면 그 원본과 축소본은 지우지 않습니다.
+    if not images:
+        return
+    result = await db.execute(
+        select(Image.url).where(
+            Image.url.in_([image.url for image in images]),
+            Image.deleted_at.is_(None),
+        )
+    )
+    referenced = set(result.scalars().all())
+    urls = [
+        url
+        for image in images
+        if image.url not in referenced
+        for url in [image.url, *(variant["url"] for variant in image.variants)]
+    ]
+    if urls:
+        enqueue(db, DELETE_FILES, {"urls": urls})
+
+
+@job_handler(GENERATE_IMAGE_DERIVATIVES)
+async def generate_image_derivatives(ctx: JobContext, payload: dict[str, Any]) -> None:
+    image = await ctx.db.get(Image, payload["image_id"])
+    if image is None or image.deleted_at is not None:
+        return
+    derivatives = await create_derivatives(ctx.s3_client, image.url)
+    if derivatives is None:
+        return
+    image.width = derivatives.width
+    image.height = derivatives.height
+    image.size = derivatives.size
+    image.variants = derivatives.variants
+
+
+@job_handler(DELETE_FILES)
+async def delete_files(ctx: JobContext, payload: dict[str, Any]) -> None:
+    # 없는 객체를 지워도 성공하므로 일부만 지운 채 실패해도 다시 시도할 수 있습니다.
+    await asyncio.gather(
+        *(s3_executor.run(delete_file, ctx.s3_client, url) for url in payload["urls"])
+    )
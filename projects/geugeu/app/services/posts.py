@@ -1,89 +1,198 @@
+from dataclasses import asdict
 from datetime import UTC, datetime
+from typing import TYPE_CHECKING
 
 from fastapi import HTTPException, UploadFile
-from sqlalchemy import func, select
-from sqlalchemy.orm import Session, joinedload, selectinload, with_loader_criteria
+from sqlalchemy import Row, exists, func, literal, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased, joinedload, selectinload, with_loader_criteria
 
-from app.models import Image, Post, User
+from app.core.cache import post_cache, versioned_key
+from app.core.db import count_rows, read_replica
+from app.core.responses import Validator
+from app.models import Image, Interest, Post, User
 from app.schemas.posts import PostListFilter, PostListSchema, PostSchema
-from app.utils import upload_file
+from app.services.jobs import enqueue_image_derivatives, enqueue_image_deletion
+from app.services.projections import image_list, user_columns
+from app.utils import collect_images, decode_cursor, encode_cursor
+
+
+if TYPE_CHECKING:
+    from mypy_boto3_s3 import S3Client
+
+
+# 캐시에 넣지 않고 get_post마다 읽는 값
+POST_STATE_FIELDS = (
+    "interest_count",
+    "comment_count",
+    "drawing_count",
+    "is_interested",
+)
 
 
 class PostService:
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession, s3_client: "S3Client"):
         self.db = db
+        self.s3_client = s3_client
 
-    def create_post(
+    async def create_post(
         self,
         user: User,
         title: str,
         content: str,
         files: list[UploadFile],
+        image_keys: list[str],
     ) -> PostSchema:
-        with self.db.begin_nested():
+        # 업로드하는 동안 DB 커넥션을 붙잡지 않도록 트랜잭션 밖에서 먼저 올립니다.
+        await self.db.commit()
+        uploaded = await collect_images(
+            self.db, self.s3_client, user, files, image_keys
+        )
+
+        async with self.db.begin_nested():
             post = Post(author_id=user.id, title=title, content=content)
             self.db.add(post)
-            self.db.flush()
-
-            post_images = []
-            for file in files:
-                url = upload_file(file)
-                post_image = Image(post_id=post.id, url=url)
-                post_images.append(post_image)
-            self.db.add_all(post_images)
+            await self.db.flush()
+            images = [Image(post_id=post.id, **asdict(image)) for image in uploaded]
+            self.db.add_all(images)
+            await self.db.flush()
+            enqueue_image_derivatives(self.db, images)
 
-        self.db.commit()
-        return PostSchema.from_model(post)
+        await self.db.commit()
+        return PostSchema.from_model(await self._get_post(post.code))
 
-    def get_posts(self, filters: PostListFilter) -> PostListSchema:
-        stmt = (
-            select(Post)
-            .options(
-                joinedload(Post.author),
-                selectinload(Post.images),
-                with_loader_criteria(Image, Image.deleted_at.is_(None)),
-            )
-            .where(Post.deleted_at.is_(None))
-            .order_by(Post.id.desc())
-        )
+    @read_replica
+    async def get_posts(
+        self, filters: PostListFilter, user: User | None = None
+    ) -> PostListSchema:
+        stmt = select(Post).where(Post.deleted_at.is_(None)).order_by(Post.id.desc())
 
         if filters.author_code:
             stmt = stmt.join(User, Post.author_id == User.id).where(
                 User.code == filters.author_code
             )
 
-        offset = (filters.page - 1) * filters.page_size
-        count = self.db.execute(
-            select(func.count()).select_from(stmt.subquery())
-        ).scalar_one()
-        rows = (
-            self.db.execute(stmt.offset(offset).limit(filters.page_size))
-            .scalars()
-            .all()
-        )
+        count = None
+        if filters.include_count:
+            count = await count_rows(
+                self.db,
+                stmt,
+                estimate_table=None if filters.author_code else Post,
+            )
+
+        if filters.cursor:
+            # 마지막으로 받은 행 다음부터 읽으므로 앞 페이지를 건너뛰지 않습니다.
+            stmt = stmt.where(Post.id < decode_cursor(filters.cursor, filters))
+        else:
+            stmt = stmt.offset((filters.page - 1) * filters.page_size)
+
+        # ORM 객체를 만들지 않고 응답에 필요한 컬럼만 읽습니다.
+        author = aliased(User)
+        stmt = stmt.with_only_columns(
+            Post.id,
+            Post.code,
+            Post.title,
+            Post.content,
+            Post.interest_count,
+            Post.comment_count,
+            Post.drawing_count,
+            Post.created_at,
+            Post.updated_at,
+            *user_columns(author, "author"),
+            image_list(Image.post_id, Post.id),
+        ).join(author, Post.author_id == author.id)
+
+        # 다음 페이지가 있는지 알기 위해 한 행을 더 읽습니다.
+        rows = (await self.db.execute(stmt.limit(filters.page_size + 1))).all()
+        next_cursor = None
+        if len(rows) > filters.page_size:
+            rows = rows[: filters.page_size]
+            # page_size가 0이면 돌려줄 행이 없으므로 커서도 만들지 않습니다.
+            if rows:
+                next_cursor = encode_cursor(rows[-1].id, filters)
+
+        interested = await self._get_interested_post_ids(user, [row.id for row in rows])
         return PostListSchema(
             count=count,
-            items=[PostSchema.from_model(row) for row in rows],
+            items=[
+                PostSchema.from_row(
+                    row, is_interested=None if user is None else row.id in interested
+                )
+                for row in rows
+            ],
+            next_cursor=next_cursor,
         )
 
-    def get_post(self, code: str) -> PostSchema:
-        post = self.db.execute(
-            select(Post)
-            .options(
-                joinedload(Post.author),
-                selectinload(Post.images),
-                with_loader_criteria(Image, Image.deleted_at.is_(None)),
+    @read_replica
+    async def get_post_state(self, code: str, user: User | None = None) -> Row:
+        """post, 작성자, 이미지의 updated_at과 POST_STATE_FIELDS 순서의 값을 읽습니다.
+
+        라우트는 이 행 하나로 get_post_validator와 get_post를 함께 부릅니다.
+        """
+        author = aliased(User)
+        images_updated_at = (
+            select(func.max(Image.updated_at))
+            .where(Image.post_id == Post.id, Image.deleted_at.is_(None))
+            .scalar_subquery()
+        )
+        is_interested = (
+            literal(None)
+            if user is None
+            else exists().where(
+                Interest.user_id == user.id,
+                Interest.post_id == Post.id,
+                Interest.deleted_at.is_(None),
             )
-            .where(
-                Post.code == code,
-                Post.deleted_at.is_(None),
+        )
+        result = await self.db.execute(
+            select(
+                Post.updated_at,
+                author.updated_at,
+                images_updated_at,
+                Post.interest_count,
+                Post.comment_count,
+                Post.drawing_count,
+                is_interested,
             )
-        ).scalar_one_or_none()
-        if post is None:
+            .join(author, Post.author_id == author.id)
+            .where(Post.code == code, Post.deleted_at.is_(None))
+        )
+        row = result.one_or_none()
+        if row is None:
             raise HTTPException(status_code=404, detail="Post not found")
-        return PostSchema.from_model(post)
+        return row
+
+    def get_post_validator(self, state: Row) -> Validator:
+        """get_post_state로 get_post 응답의 ETag와 Last-Modified만 만듭니다.
 
-    def update_post(
+        post, 작성자, 이미지의 updated_at과 관심/댓글/그림 수, 유저의 관심 여부가
+        같으면 응답도 같습니다.
+        """
+        return Validator.create(list(state[:3]), *state[3:])
+
+    @read_replica
+    async def get_post(self, code: str, state: Row) -> PostSchema:
+        """post를 post_cache에서 읽고, 없으면 DB에서 읽어 캐시에 넣습니다.
+
+        캐시에는 유저와 관계없이 잘 바뀌지 않는 부분만 넣고, 관심/댓글/그림 수와 관심
+        여부는 get_post_state로 읽은 값으로 덮어씁니다. 캐시 key도 state의
+        updated_at으로 만듭니다.
+        """
+        key = versioned_key(code, *state[:3])
+        cached = await post_cache.get(key)
+        if cached is None:
+            post = await self._get_post(code)
+            if post is None:
+                raise HTTPException(status_code=404, detail="Post not found")
+            cached = PostSchema.from_model(post).model_dump(
+                mode="json", exclude=set(POST_STATE_FIELDS)
+            )
+            await post_cache.set(key, cached)
+        return PostSchema.model_validate(
+            cached | dict(zip(POST_STATE_FIELDS, state[3:], strict=True))
+        )
+
+    async def update_post(
         self,
         *,
         code: str,
@@ -91,19 +200,9 @@ class PostService:
         title: str,
         content: str,
         files: list[UploadFile],
+        image_keys: list[str],
     ) -> PostSchema:
-        post = self.db.execute(
-            select(Post)
-            .options(
-                joinedload(Post.author),
-                selectinload(Post.images),
-                with_loader_criteria(Image, Image.deleted_at.is_(None)),
-            )
-            .where(
-                Post.code == code,
-                Post.deleted_at.is_(None),
-            )
-        ).scalar_one_or_none()
+        post = await self._get_post(code)
         if post is None:
             raise HTTPException(status_code=404, detail="Post not found")
         if post.author_id == user.id or user.is_admin:
@@ -111,7 +210,15 @@ class PostService:
         else:
             raise HTTPException(status_code=403, detail="Forbidden")
 
-        with self.db.begin_nested():
+        cache_key = _cache_key(post)
+
+        # 업로드하는 동안 DB 커넥션을 붙잡지 않도록 읽기 트랜잭션을 먼저 끝냅니다.
+        await self.db.commit()
+        uploaded = await collect_images(
+            self.db, self.s3_client, user, files, image_keys
+        )
+
+        async with self.db.begin_nested():
             # post 수정
             post.title = title
             post.content = content
@@ -123,24 +230,27 @@ class PostService:
                 self.db.add(image)
 
             # 새로운 post images 생성
-            images = []
-            for file in files:
-                url = upload_file(file)
-                image = Image(post_id=post.id, url=url)
-                images.append(image)
+            images = [Image(post_id=post.id, **asdict(image)) for image in uploaded]
             self.db.add_all(images)
+            await self.db.flush()
+            enqueue_image_derivatives(self.db, images)
+            # S3의 원본과 축소본은 커밋한 뒤 작업 워커가 지웁니다. 새 이미지가 같은 파일을
+            # 참조하면 지우지 않도록 새 이미지를 추가한 뒤에 고릅니다.
+            await enqueue_image_deletion(self.db, post.images)
 
-        self.db.commit()
-        self.db.refresh(post)
-        return PostSchema.from_model(post)
+        await self.db.commit()
+        # 수정하면 키가 바뀌어 이전 항목은 읽히지 않지만, 메모리를 바로 비웁니다.
+        await post_cache.delete(cache_key)
+        return PostSchema.from_model(await self._get_post(code))
 
-    def delete_post(self, *, code: str, user: User) -> None:
-        post = self.db.execute(
+    async def delete_post(self, *, code: str, user: User) -> None:
+        result = await self.db.execute(
             select(Post).where(
                 Post.code == code,
                 Post.deleted_at.is_(None),
             )
-        ).scalar_one_or_none()
+        )
+        post = result.scalar_one_or_none()
         if post is None:
             raise HTTPException(status_code=404, detail="Post not found")
         if post.author_id == user.id or user.is_admin:
@@ -148,4 +258,47 @@ class PostService:
         else:
             raise HTTPException(status_code=403, detail="Forbidden")
         post.deleted_at = datetime.now(UTC)
-        self.db.commit()
+        await self.db.commit()
+        # 삭제한 post는 캐시를 읽기 전에 get_post_state가 404로 응답하므로 캐시는 TTL이
+        # 지나면 사라지도록 둡니다.
+
+    async def _get_interested_post_ids(
+        self, user: User | None, post_ids: list[int]
+    ) -> set[int]:
+        # 페이지의 post들 중 유저가 관심을 누른 post를 한 번에 찾습니다.
+        if user is None or not post_ids:
+            return set()
+        result = await self.db.execute(
+            select(Interest.post_id).where(
+                Interest.user_id == user.id,
+                Interest.post_id.in_(post_ids),
+                Interest.deleted_at.is_(None),
+            )
+        )
+        return set(result.scalars().all())
+
+    async def _get_post(self, code: str) -> Post | None:
+        # AsyncSession에서는 lazy load를 할 수 없으므로 응답에 필요한 관계를 함께 읽고,
+        # 쓰기 직후 identity map에 남은 이전 상태는 populate_existing으로 덮어씁니다.
+        result = await self.db.execute(
+            select(Post)
+            .options(
+                joinedload(Post.author),
+                selectinload(Post.images),
+                with_loader_criteria(Image, Image.deleted_at.is_(None)),
+            )
+            .where(
+                Post.code == code,
+                Post.deleted_at.is_(None),
+            )
+            .execution_options(populate_existing=True)
+        )
+        return result.scalar_one_or_none()
+
+
+def _cache_key(post: Post) -> str:
+    # _get_post로 읽은 post의 post_cache 키. get_post_state로 만드는 키와 같습니다.
+    images_updated_at = max((image.updated_at for image in post.images), default=None)
+    return versioned_key(
+        post.code, post.updated_at, post.author.updated_at, images_updated_at
+    )
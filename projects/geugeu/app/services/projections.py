@@ -0,0 +1,55 @@
+"""목록 API가 ORM 객체 없이 응답에 필요한 컬럼만 읽도록 하는 SELECT 컬럼들.
+
+ORM으로 Post, User, Image를 모두 만든 뒤 스키마로 옮기면 행마다 identity map과
+속성 계측 비용이 듭니다. 목록은 필요한 컬럼만 Core select로 읽고, 이미지는
+json_agg로 한 컬럼에 모아서 행을 그대로 응답 스키마의 from_row에 넘깁니다.
+"""
+
+from typing import Any
+
+from sqlalchemy import ColumnElement, Label, func, literal_column, select
+from sqlalchemy.dialects.postgresql import JSON, aggregate_order_by
+from sqlalchemy.orm import InstrumentedAttribute
+
+from app.models import Image, User
+
+
+def user_columns(user: type[User], prefix: str) -> list[Label[Any]]:
+    # 스키마의 UserSchema에 들어가는 컬럼을 prefix_code, prefix_email처럼 읽습니다.
+    return [
+        user.code.label(f"{prefix}_code"),
+        user.email.label(f"{prefix}_email"),
+        user.nickname.label(f"{prefix}_nickname"),
+        user.profile_image_url.label(f"{prefix}_profile_image_url"),
+    ]
+
+
+def image_list(owner_id: InstrumentedAttribute[Any], id_: Any) -> Label[Any]:
+    """owner_id(Image.post_id 등)가 id_인 삭제되지 않은 이미지를 id 순서의 JSON 배열로 읽습니다."""
+    image = func.json_build_object(
+        "url",
+        Image.url,
+        "width",
+        Image.width,
+        "height",
+        Image.height,
+        "size",
+        Image.size,
+        "variants",
+        Image.variants,
+        "created_at",
+        Image.created_at,
+        "updated_at",
+        Image.updated_at,
+    )
+    images: ColumnElement[Any] = func.coalesce(
+        func.json_agg(aggregate_order_by(image, Image.id)),
+        literal_column("'[]'::json"),
+        type_=JSON,
+    )
+    return (
+        select(images)
+        .where(owner_id == id_, Image.deleted_at.is_(None))
+        .scalar_subquery()
+        .label("images")
+    )
@@ -0,0 +1,42 @@
+import asyncio
+from typing import TYPE_CHECKING
+
+from app.core.executors import s3_executor
+from app.models import User
+from app.schemas.uploads import UploadCreateSchema, UploadListSchema, UploadSchema
+from app.utils import create_upload_url
+
+if TYPE_CHECKING:
+    from mypy_boto3_s3 import S3Client
+
+
+class UploadService:
+    def __init__(self, s3_client: "S3Client"):
+        self.s3_client = s3_client
+
+    async def create_uploads(
+        self, user: User, payload: UploadCreateSchema
+    ) -> UploadListSchema:
+        urls = await asyncio.gather(
+            *(
+                s3_executor.run(
+                    create_upload_url,
+                    self.s3_client,
+                    user.code,
+                    file.filename,
+                    file.content_type,
+                    file.size,
+                )
+                for file in payload.files
+            )
+        )
+        return UploadListSchema(
+            items=[
+                UploadSchema(
+                    key=key,
+                    url=url,
+                    headers={"Content-Type": file.content_type},
+                )
+                for file, (key, url) in zip(payload.files, urls, strict=True)
+            ]
+        )
@@ -1,26 +1,32 @@
 import logging
 from datetime import UTC, datetime
+from typing import TYPE_CHECKING
 
 from fastapi import HTTPException, UploadFile
 from sqlalchemy import select
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.cache import user_cache
+from app.core.executors import crypto_executor, s3_executor
 from app.core.security import get_password_hash
 from app.models import User
 from app.schemas.users import SignupSchema, UserUpdateSchema
-from app.utils import upload_file
+from app.utils import upload_file, verify_uploaded_files
+
+if TYPE_CHECKING:
+    from mypy_boto3_s3 import S3Client
 
 logger = logging.getLogger(__name__)
 
 
 class UserService:
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession, s3_client: "S3Client"):
         self.db = db
+        self.s3_client = s3_client
 
-    def create_user(self, payload: SignupSchema) -> User:
-        user = self.db.execute(
-            select(User).where(User.email == payload.email)
-        ).scalar_one_or_none()
+    async def create_user(self, payload: SignupSchema) -> User:
+        result = await self.db.execute(select(User).where(User.email == payload.email))
+        user = result.scalar_one_or_none()
         if user:
             if user.deleted_at:
                 raise HTTPException(
@@ -32,31 +38,50 @@ class UserService:
             user = User(
                 email=payload.email,
                 nickname=payload.nickname,
-                password=get_password_hash(payload.password),
+                password=await crypto_executor.run(get_password_hash, payload.password),
                 is_admin=False,
                 profile_image_url="",
                 auth_provider=User.AuthProvider.LOCAL,
             )
         self.db.add(user)
-        self.db.commit()
-        self.db.refresh(user)
+        await self.db.commit()
+        await self.db.refresh(user)
         return user
 
-    def update_user(self, user: User, payload: UserUpdateSchema) -> User:
+    async def update_user(self, user: User, payload: UserUpdateSchema) -> User:
         user.nickname = payload.nickname
         self.db.add(user)
-        self.db.commit()
-        self.db.refresh(user)
+        await self.db.commit()
+        await user_cache.delete(user.code)
+        await self.db.refresh(user)
         return user
 
-    def delete_user(self, user: User) -> None:
+    async def delete_user(self, user: User) -> None:
         user.deleted_at = datetime.now(UTC)
         self.db.add(user)
-        self.db.commit()
+        await self.db.commit()
+        await user_cache.delete(user.code)
 
-    def update_profile_image(self, current_user: User, file: UploadFile) -> User:
-        with self.db.begin_nested():
-            url = upload_file(file)
-            current_user.profile_image_url = url
-        self.db.commit()
+    async def update_profile_image(
+        self,
+        current_user: User,
+        file: UploadFile | None,
+        image_key: str | None = None,
+    ) -> User:
+        # 업로드하는 동안 DB 커넥션을 붙잡지 않도록 읽기 트랜잭션을 먼저 끝냅니다.
+        await self.db.commit()
+        if image_key:
+            [image] = await verify_uploaded_files(
+                self.db, self.s3_client, current_user, [image_key]
+            )
+            url = image.url
+        elif file:
+            url = await s3_executor.run(upload_file, self.s3_client, file)
+        else:
+            raise HTTPException(status_code=400, detail="File is required")
+        current_user.profile_image_url = url
+        self.db.add(current_user)
+        await self.db.commit()
+        await user_cache.delete(current_user.code)
+        await self.db.refresh(current_user)
         return current_user
@@ -1,40 +1,418 @@
+import asyncio
+import base64
+import binascii
+import json
 import logging
 import os
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, TypeVar
 from uuid import uuid4
 
-import boto3
-import httpx
-from botocore.exceptions import ClientError
+from boto3.exceptions import S3UploadFailedError
+from boto3.s3.transfer import TransferConfig
+from botocore.exceptions import BotoCoreError, ClientError
 from fastapi import HTTPException, UploadFile
+from pydantic import BaseModel
+from sqlalchemy import exists, select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
+from app.core.executors import image_executor, s3_executor
+from app.images import Derivative, make_derivatives
+from app.models import Image, User
+
+if TYPE_CHECKING:
+    from mypy_boto3_s3 import S3Client
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+# 업로드는 이미 s3_executor에서 파일 단위로 동시에 실행되므로 파일 하나는 한 스레드로 올립니다.
+_TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=settings.S3_MULTIPART_THRESHOLD,
+    multipart_chunksize=settings.S3_MULTIPART_CHUNK_SIZE,
+    use_threads=False,
+)
+
+
+# 파일 앞부분의 시그니처로 실제 이미지 형식을 확인합니다.
+_SNIFF_SIZE = 16
+_HEIC_BRANDS = {b"heic", b"heix", b"hevc", b"hevx", b"heim", b"heis", b"mif1", b"msf1"}
 
-def upload_file(f: UploadFile):
-    if not f.filename:
-        raise HTTPException(status_code=400, detail="File is required")
 
-    _, ext = os.path.splitext(f.filename)
+def upload_file(s3_client: "S3Client", f: UploadFile):
+    return _put_file(s3_client, f, _validate_upload_file(f))
+
+
+def _put_file(s3_client: "S3Client", f: UploadFile, content_type: str) -> str:
+    _, ext = os.path.splitext(f.filename or "")
     key = f"images/{uuid4()}{ext}"
-    presigned_url = _generate_presigned_url(key)
-    response = httpx.put(presigned_url, content=f.file.read())
-    if response.status_code != 200:
-        logger.error(response.text)
-        raise HTTPException(status_code=500, detail="Failed to upload profile image")
+    # 파일 전체를 메모리에 올리지 않고 청크 단위로 보내며,
+    # S3_MULTIPART_THRESHOLD보다 큰 파일은 multipart upload로 나눠 올립니다.
+    try:
+        s3_client.upload_fileobj(
+            f.file,
+            settings.AWS_S3_BUCKET_NAME,
+            key,
+            ExtraArgs={"ContentType": content_type},
+            Config=_TRANSFER_CONFIG,
+        )
+    except (BotoCoreError, ClientError, S3UploadFailedError):
+        logger.exception("Failed to upload %s", key)
+        raise HTTPException(status_code=500, detail="Failed to upload image")
+
+    return _file_url(key)
+
+
+def delete_file(s3_client: "S3Client", url: str) -> None:
+    s3_client.delete_object(Bucket=settings.AWS_S3_BUCKET_NAME, Key=_file_key(url))
+
+
+@dataclass
+class UploadedImage:
+    """S3에 올린 이미지. 필드는 Image의 컬럼과 같습니다.
+
+    업로드할 때는 url과 size만 채우고, 크기와 축소본은 작업 워커가 create_derivatives로
+    채웁니다.
+    """
+
+    url: str
+    size: int
+    width: int | None = None
+    height: int | None = None
+    variants: list[dict[str, Any]] = field(default_factory=list)
+
+    @property
+    def variant_urls(self) -> list[str]:
+        return [variant["url"] for variant in self.variants]
+
+
+async def upload_files(
+    s3_client: "S3Client", files: list[UploadFile]
+) -> list[UploadedImage]:
+    """파일을 S3_UPLOAD_CONCURRENCY개씩 동시에 업로드하고 순서대로 돌려줍니다.
+
+    잘못된 파일이 하나라도 있으면 아무것도 올리지 않도록 모든 파일의 크기와 형식을 먼저
+    확인합니다. 업로드가 하나라도 실패하면 이미 올라간 파일을 지우고 첫 번째 예외를 다시
+    발생시킵니다.
+    """
+    content_types = [_validate_upload_file(file) for file in files]
+    semaphore = asyncio.Semaphore(settings.S3_UPLOAD_CONCURRENCY)
+
+    async def upload(file: UploadFile, content_type: str) -> UploadedImage:
+        async with semaphore:
+            url = await s3_executor.run(_put_file, s3_client, file, content_type)
+            return UploadedImage(url=url, size=file.size or 0)
+
+    return await _gather_uploads(
+        s3_client,
+        [
+            upload(file, content_type)
+            for file, content_type in zip(files, content_types, strict=True)
+        ],
+        lambda image: [image.url],
+    )
+
+
+async def delete_files(s3_client: "S3Client", urls: list[str]) -> None:
+    results = await asyncio.gather(
+        *(s3_executor.run(delete_file, s3_client, url) for url in urls),
+        return_exceptions=True,
+    )
+    for url, result in zip(urls, results, strict=True):
+        if isinstance(result, Exception):
+            # 지우지 못한 파일은 참조하는 행이 없으므로 로그만 남깁니다.
+            logger.error("Failed to delete %s", url, exc_info=result)
+
+
+def create_upload_url(
+    s3_client: "S3Client", user_code: str, filename: str, content_type: str, size: int
+) -> tuple[str, str]:
+    """클라이언트가 S3에 직접 올릴 key와 presigned PUT URL을 만듭니다.
+
+    key는 유저별 경로 아래에 만들어서 다른 유저가 올린 파일을 참조할 수 없게 하고,
+    Content-Type과 Content-Length를 서명에 포함해서 요청한 파일만 올릴 수 있게 합니다.
+    """
+    _validate_image(content_type, size)
+    _, ext = os.path.splitext(filename)
+    key = f"{_upload_prefix(user_code)}{uuid4()}{ext}"
+    return key, _generate_presigned_url(s3_client, key, content_type, size)
+
+
+def get_uploaded_file(s3_client: "S3Client", user_code: str, key: str) -> UploadedImage:
+    """클라이언트가 직접 올린 파일이 S3에 있는지 확인하고 URL을 돌려줍니다.
+
+    앞부분만 Range GET으로 읽어서 전체 크기와 실제 이미지 형식을 함께 확인합니다.
+    """
+    if not key.startswith(_upload_prefix(user_code)):
+        raise HTTPException(status_code=400, detail="Invalid image key")
+    try:
+        s3_object = s3_client.get_object(
+            Bucket=settings.AWS_S3_BUCKET_NAME,
+            Key=key,
+            Range=f"bytes=0-{_SNIFF_SIZE - 1}",
+        )
+    except ClientError as e:
+        code = e.response["Error"]["Code"]
+        if code in ("404", "NoSuchKey"):
+            raise HTTPException(status_code=400, detail="Image is not uploaded")
+        if code == "InvalidRange":
+            # 빈 파일은 범위를 읽을 수 없습니다.
+            raise HTTPException(status_code=415, detail="Unsupported file type")
+        raise
+    head = s3_object["Body"].read()
+    size = int(s3_object["ContentRange"].rsplit("/", 1)[1])
+    _validate_image(_sniff_image_type(head), size)
+    return UploadedImage(url=_file_url(key), size=size)
+
+
+async def verify_uploaded_files(
+    db: AsyncSession, s3_client: "S3Client", user: User, keys: list[str]
+) -> list[UploadedImage]:
+    """클라이언트가 직접 올린 파일을 확인합니다.
+
+    key 하나는 한 번만 붙일 수 있습니다. 이미 이미지나 프로필 이미지로 붙인 key를 다시
+    붙이면 한쪽을 수정하거나 삭제할 때 다른 쪽이 쓰는 파일까지 지워지므로 거절합니다.
+    """
+    urls = [_file_url(key) for key in keys]
+    if len(set(urls)) < len(urls) or user.profile_image_url in urls:
+        raise HTTPException(status_code=400, detail="Image key already used")
+    if urls:
+        used = await db.scalar(select(exists().where(Image.url.in_(urls))))
+        # S3를 확인하는 동안 DB 커넥션을 붙잡지 않도록 읽기 트랜잭션을 끝냅니다.
+        await db.commit()
+        if used:
+            raise HTTPException(status_code=400, detail="Image key already used")
+
+    semaphore = asyncio.Semaphore(settings.S3_UPLOAD_CONCURRENCY)
+
+    async def verify(key: str) -> UploadedImage:
+        async with semaphore:
+            return await s3_executor.run(get_uploaded_file, s3_client, user.code, key)
+
+    return list(await asyncio.gather(*(verify(key) for key in keys)))
 
-    return f"https://{settings.AWS_S3_BUCKET_NAME}.s3.{settings.AWS_DEFAULT_REGION}.amazonaws.com/{key}"
+
+async def collect_images(
+    db: AsyncSession,
+    s3_client: "S3Client",
+    user: User,
+    files: list[UploadFile],
+    image_keys: list[str],
+) -> list[UploadedImage]:
+    """요청으로 받은 파일을 업로드하고, 클라이언트가 직접 올린 파일은 확인만 해서
+    이미지를 모읍니다."""
+    if not files and not image_keys:
+        raise HTTPException(status_code=400, detail="File is required")
+    # 확인은 부작용이 없으므로 업로드보다 먼저 해서 실패해도 지울 파일이 없게 합니다.
+    verified = await verify_uploaded_files(db, s3_client, user, image_keys)
+    return [*await upload_files(s3_client, files), *verified]
+
+
+async def create_derivatives(s3_client: "S3Client", url: str) -> UploadedImage | None:
+    """S3에 올린 원본을 내려받아 크기를 읽고 축소본을 만들어 올립니다.
+
+    Pillow가 읽을 수 없는 이미지면 None을 돌려줍니다. 축소본의 key는 원본마다 같으므로
+    다시 실행해도 같은 객체를 덮어씁니다.
+    """
+    data = await s3_executor.run(_download_file, s3_client, _file_key(url))
+    info = await image_executor.run(
+        make_derivatives,
+        data,
+        settings.IMAGE_DERIVATIVE_WIDTHS,
+        settings.IMAGE_DERIVATIVE_QUALITY,
+    )
+    if info is None:
+        return None
+
+    # 축소본은 원본 key 아래에 "<너비>w.<포맷>"으로 저장합니다.
+    base, _ = os.path.splitext(_file_key(url))
+    urls = await _gather_uploads(
+        s3_client,
+        [
+            s3_executor.run(
+                _put_derivative,
+                s3_client,
+                f"{base}/{derivative.width}w.{derivative.format}",
+                derivative,
+            )
+            for derivative in info.derivatives
+        ],
+        lambda url: [url],
+    )
+    return UploadedImage(
+        url=url,
+        size=len(data),
+        width=info.width,
+        height=info.height,
+        variants=[
+            {
+                "url": derivative_url,
+                "format": derivative.format,
+                "width": derivative.width,
+                "height": derivative.height,
+                "size": len(derivative.data),
+            }
+            for derivative_url, derivative in zip(urls, info.derivatives, strict=True)
+        ],
+    )
+
+
+async def _gather_uploads(
+    s3_client: "S3Client",
+    uploads: list[Awaitable[T]],
+    urls_of: Callable[[T], list[str]],
+) -> list[T]:
+    # 하나라도 실패하면 성공한 업로드의 urls_of(결과)를 지우고 첫 번째 예외를 다시 발생시킵니다.
+    results = await asyncio.gather(*uploads, return_exceptions=True)
+    errors = [result for result in results if isinstance(result, BaseException)]
+    if errors:
+        await delete_files(
+            s3_client,
+            [
+                url
+                for result in results
+                if not isinstance(result, BaseException)
+                for url in urls_of(result)
+            ],
+        )
+        raise errors[0]
+    return results  # type: ignore[return-value]
+
+
+def _download_file(s3_client: "S3Client", key: str) -> bytes:
+    return s3_client.get_object(Bucket=settings.AWS_S3_BUCKET_NAME, Key=key)[
+        "Body"
+    ].read()
 
 
-def _generate_presigned_url(key: str):
-    s3_client = boto3.client("s3")
+def _put_derivative(s3_client: "S3Client", key: str, derivative: Derivative) -> str:
+    s3_client.put_object(
+        Bucket=settings.AWS_S3_BUCKET_NAME,
+        Key=key,
+        Body=derivative.data,
+        ContentType=derivative.content_type,
+    )
+    return _file_url(key)
+
+
+# 커서에 포함하지 않는 페이지 관련 필드
+_PAGINATION_FIELDS = {"cursor", "page", "page_size", "include_count"}
+
+
+def encode_cursor(
+    last_id: int,
+    filters: BaseModel,
+    *,
+    created_at: datetime | None = None,
+) -> str:
+    """마지막으로 응답한 행의 id(와 created_at)와 목록 필터로 다음 페이지 커서를 만듭니다."""
+    payload: dict[str, Any] = {
+        "id": last_id,
+        "filters": filters.model_dump(exclude=_PAGINATION_FIELDS),
+    }
+    if created_at is not None:
+        payload["created_at"] = created_at.isoformat()
+    data = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str, filters: BaseModel) -> int:
+    """커서에서 마지막 행의 id를 꺼냅니다.
+
+    커서를 만들 때와 필터가 다르면 다른 목록의 커서이므로 400을 반환합니다.
+    """
+    return _load_cursor(cursor, filters)["id"]
+
+
+def decode_created_at_cursor(cursor: str, filters: BaseModel) -> tuple[datetime, int]:
+    """(created_at, id) 순으로 정렬한 목록의 커서에서 마지막 행의 위치를 꺼냅니다."""
+    payload = _load_cursor(cursor, filters)
+    try:
+        return datetime.fromisoformat(payload["created_at"]), payload["id"]
+    except (KeyError, TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def _load_cursor(cursor: str, filters: BaseModel) -> dict[str, Any]:
+    try:
+        data = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(data)
+        last_id = payload["id"]
+        cursor_filters = payload["filters"]
+    except (binascii.Error, ValueError, TypeError, KeyError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if not isinstance(last_id, int) or cursor_filters != filters.model_dump(
+        exclude=_PAGINATION_FIELDS
+    ):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return payload
+
+
+def _generate_presigned_url(
+    s3_client: "S3Client", key: str, content_type: str, size: int
+):
     try:
         url = s3_client.generate_presigned_url(
             ClientMethod="put_object",
-            Params={"Bucket": settings.AWS_S3_BUCKET_NAME, "Key": key},
-            ExpiresIn=600,  # 10 minutes
+            Params={
+                "Bucket": settings.AWS_S3_BUCKET_NAME,
+                "Key": key,
+                "ContentType": content_type,
+                "ContentLength": size,
+            },
+            ExpiresIn=settings.UPLOAD_URL_EXPIRES_SECONDS,
         )
     except ClientError:
         raise
     return url
+
+
+def _validate_upload_file(f: UploadFile) -> str:
+    # 요청의 Content-Type 대신 파일 앞부분으로 확인한 형식을 돌려줍니다.
+    if not f.filename:
+        raise HTTPException(status_code=400, detail="File is required")
+    # 파일을 읽기 전에 크기를 확인해서 너무 큰 파일은 바로 거절합니다.
+    size = f.file.seek(0, os.SEEK_END)
+    f.file.seek(0)
+    head = f.file.read(_SNIFF_SIZE)
+    f.file.seek(0)
+    content_type = _sniff_image_type(head)
+    _validate_image(content_type, size)
+    return content_type  # type: ignore[return-value]
+
+
+def _sniff_image_type(head: bytes) -> str | None:
+    if head.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "image/png"
+    if head.startswith(b"\xff\xd8\xff"):
+        return "image/jpeg"
+    if head.startswith((b"GIF87a", b"GIF89a")):
+        return "image/gif"
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "image/webp"
+    if head[4:8] == b"ftyp" and head[8:12] in _HEIC_BRANDS:
+        return "image/heic"
+    return None
+
+
+def _validate_image(content_type: str | None, size: int) -> None:
+    if content_type not in settings.UPLOAD_ALLOWED_CONTENT_TYPES:
+        raise HTTPException(status_code=415, detail="Unsupported file type")
+    if size > settings.UPLOAD_MAX_SIZE:
+        raise HTTPException(status_code=413, detail="File too large")
+
+
+def _upload_prefix(user_code: str) -> str:
+    return f"uploads/{user_code}/"
+
+
+def _file_url(key: str) -> str:
+    return f"https://{settings.AWS_S3_BUCKET_NAME}.s3.{settings.AWS_DEFAULT_REGION}.amazonaws.com/{key}"
+
+
+def _file_key(url: str) -> str:
+    return url.removeprefix(_file_url(""))
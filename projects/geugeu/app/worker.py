@@ -0,0 +1,73 @@
+"""백그라운드 작업 워커.
+
+job 테이블에서 실행할 차례인 작업을 SELECT ... FOR UPDATE SKIP LOCKED로 하나씩 꺼내
+처리합니다. 별도의 브로커 없이 API와 같은 Postgres를 사용하며, 워커 프로세스를
+여러 개 띄워도 한 작업은 한 워커만 처리합니다.
+
+    uv run python -m app.worker --concurrency 4
+"""
+
+import argparse
+import asyncio
+import logging
+import signal
+
+import app.services.jobs  # noqa: F401  작업 함수를 등록합니다.
+from app.core.clients import create_s3_client
+from app.core.config import settings
+from app.core.db import SessionLocal, engine
+from app.core.executors import executors
+from app.core.jobs import run_next_job
+
+logger = logging.getLogger(__name__)
+
+
+async def work(concurrency: int, *, once: bool = False) -> None:
+    s3_client = create_s3_client()
+    stopping = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stopping.set)
+
+    async def run() -> None:
+        while not stopping.is_set():
+            try:
+                if await run_next_job(SessionLocal, s3_client):
+                    continue
+            except Exception:
+                # DB 연결이 끊기는 등 작업 밖에서 난 오류는 잠시 뒤에 다시 시도합니다.
+                logger.exception("Failed to run job")
+            if once:
+                return
+            try:
+                await asyncio.wait_for(
+                    stopping.wait(), timeout=settings.JOB_POLL_INTERVAL_SECONDS
+                )
+            except TimeoutError:
+                pass
+
+    try:
+        # 실행 중인 작업은 끝까지 처리하고 멈춥니다.
+        await asyncio.gather(*(run() for _ in range(concurrency)))
+    finally:
+        s3_client.close()
+        for executor in executors:
+            executor.shutdown()
+        await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run background jobs.")
+    parser.add_argument(
+        "--concurrency", type=int, default=settings.JOB_WORKER_CONCURRENCY
+    )
+    parser.add_argument(
+        "--once", action="store_true", help="exit when the queue is empty"
+    )
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(work(args.concurrency, once=args.once))
+
+
+if __name__ == "__main__":
+    main()
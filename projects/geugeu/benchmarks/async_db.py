@@ -0,0 +1,99 @@
+"""동시 요청 상황에서 동기 Session과 AsyncSession의 응답 지연 시간을 비교합니다.
+
+async 라우트 안에서 동기 Session을 호출하면 쿼리가 이벤트 루프를 막기 때문에
+동시에 들어온 요청이 한 줄로 처리됩니다. 두 경로 모두 같은 쿼리를 같은 도착률로
+실행하고 요청별 지연 시간의 p50/p99를 출력합니다.
+
+    docker compose up -d
+    uv run python -m benchmarks.async_db --rate 200 --requests 1000
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from collections.abc import Awaitable, Callable
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+
+QUERY = text("SELECT pg_sleep(:seconds)")
+
+
+def percentile(values: list[float], p: float) -> float:
+    values = sorted(values)
+    index = min(len(values) - 1, round(p / 100 * (len(values) - 1)))
+    return values[index]
+
+
+async def run(
+    handler: Callable[[], Awaitable[None]], rate: float, requests: int
+) -> tuple[list[float], float]:
+    # 요청은 일정한 간격으로 도착한다고 가정하고, 도착 예정 시각부터 지연 시간을 잽니다.
+    # 이벤트 루프가 막혀 요청 처리가 늦게 시작되는 시간까지 지연 시간에 포함됩니다.
+    latencies: list[float] = []
+
+    async def request(scheduled: float) -> None:
+        await handler()
+        latencies.append(time.perf_counter() - scheduled)
+
+    started = time.perf_counter()
+    tasks = []
+    for i in range(requests):
+        scheduled = started + i / rate
+        delay = scheduled - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.create_task(request(scheduled)))
+    await asyncio.gather(*tasks)
+    return latencies, time.perf_counter() - started
+
+
+def report(name: str, latencies: list[float], elapsed: float) -> None:
+    print(
+        f"{name:<6} "
+        f"p50={percentile(latencies, 50) * 1000:8.1f}ms "
+        f"p99={percentile(latencies, 99) * 1000:8.1f}ms "
+        f"mean={statistics.mean(latencies) * 1000:8.1f}ms "
+        f"throughput={len(latencies) / elapsed:8.1f}req/s"
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rate", type=float, default=200.0)
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--pool-size", type=int, default=20)
+    parser.add_argument("--query-ms", type=float, default=10.0)
+    args = parser.parse_args()
+    params = {"seconds": args.query_ms / 1000}
+
+    sync_engine = create_engine(
+        settings.POSTGRES_DATABASE_URL, pool_size=args.pool_size
+    )
+    async_engine = create_async_engine(
+        settings.POSTGRES_ASYNC_DATABASE_URL, pool_size=args.pool_size
+    )
+
+    async def sync_handler() -> None:
+        # 기존 경로: async 라우트에서 동기 Session을 그대로 호출
+        with Session(sync_engine) as session:
+            session.execute(QUERY, params)
+
+    async def async_handler() -> None:
+        async with AsyncSession(async_engine) as session:
+            await session.execute(QUERY, params)
+
+    for name, handler in [("sync", sync_handler), ("async", async_handler)]:
+        latencies, elapsed = await run(handler, args.rate, args.requests)
+        report(name, latencies, elapsed)
+
+    sync_engine.dispose()
+    await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
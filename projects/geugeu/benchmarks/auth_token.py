@@ -0,0 +1,58 @@
+"""인증 의존성이 액세스 토큰을 해석하는 시간을 캐시 사용 여부에 따라 비교합니다.
+
+같은 토큰으로 반복 요청하는 상황을 가정하고, 매번 서명 검증과 TokenPayload 검증을
+하는 기존 경로와 decode_access_token의 캐시 경로를 같은 횟수만큼 실행합니다.
+유저 조회는 포함하지 않으므로 DB 없이 실행할 수 있습니다.
+
+    uv run python -m benchmarks.auth_token --iterations 100000
+"""
+
+import argparse
+import asyncio
+import time
+from datetime import timedelta
+
+import jwt
+
+from app.core.config import settings
+from app.core.security import ALGORITHM, create_access_token, decode_access_token
+from app.schemas.auth import TokenPayload
+
+
+async def decode_without_cache(token: str) -> str | None:
+    # 기존 경로: 요청마다 서명을 검증하고 payload를 검증합니다.
+    payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[ALGORITHM])
+    return TokenPayload(**payload).sub
+
+
+async def run(decode, token: str, iterations: int) -> float:
+    started = time.perf_counter()
+    for _ in range(iterations):
+        await decode(token)
+    return time.perf_counter() - started
+
+
+def report(name: str, elapsed: float, iterations: int) -> None:
+    print(
+        f"{name:<8} "
+        f"per_call={elapsed / iterations * 1_000_000:8.2f}us "
+        f"throughput={iterations / elapsed:12.1f}calls/s"
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iterations", type=int, default=100_000)
+    args = parser.parse_args()
+    token = create_access_token("benchmark", expires_delta=timedelta(days=1))
+
+    for name, decode in [
+        ("no-cache", decode_without_cache),
+        ("cache", decode_access_token),
+    ]:
+        elapsed = await run(decode, token, args.iterations)
+        report(name, elapsed, args.iterations)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
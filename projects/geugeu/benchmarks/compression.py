@@ -0,0 +1,121 @@
+"""/api/posts 목록 한 페이지를 압축 방식과 수준별로 압축할 때의 CPU 시간과 줄어든 크기를 비교합니다.
+
+항목마다 코드, 이미지 URL, 본문 길이가 다른 PostListSchema 페이지를 FastJSONResponse로
+인코딩한 뒤 gzip 수준과 brotli 품질마다 한 번 압축하는 데 걸린 시간과 압축 후 크기를
+출력합니다. 같은 항목을 반복한 페이지는 압축률이 실제보다 훨씬 높게 나오므로 쓰지 않습니다.
+saved/ms는 CPU 1ms당 줄인 바이트 수입니다. 앱은 COMPRESSION_GZIP_LEVEL,
+COMPRESSION_BROTLI_QUALITY로 수준을 정합니다.
+
+    uv run python -m benchmarks.compression --page-size 20 100 --repeat 200
+"""
+
+import argparse
+import random
+import time
+from datetime import UTC, datetime, timedelta
+
+from nanoid import generate
+
+from app.core.compression import compress
+from app.core.responses import FastJSONResponse
+from app.schemas.posts import PostListSchema
+
+LEVELS = [
+    ("gzip", [1, 4, 6, 9]),
+    ("br", [1, 4, 6, 11]),
+]
+
+WORDS = "오늘 그린 그림 고양이 바다 하늘 연필 수채화 색감 구도 연습 피드백 부탁 드려요".split()
+
+
+def image(created_at: datetime) -> dict:
+    code = generate()
+    width = random.choice([1080, 1280, 2048])
+    height = width * random.choice([3, 4]) // 4
+    return {
+        "url": f"https://geugeu.s3.ap-northeast-2.amazonaws.com/images/{code}.jpg",
+        "width": width,
+        "height": height,
+        "size": random.randint(100_000, 2_000_000),
+        "variants": [
+            {
+                "url": f"https://geugeu.s3.ap-northeast-2.amazonaws.com/images/{code}/{w}w.webp",
+                "format": "WEBP",
+                "width": w,
+                "height": height * w // width,
+                "size": random.randint(5_000, 80_000),
+            }
+            for w in (320, 640, 1280)
+        ],
+        "created_at": created_at,
+        "updated_at": created_at,
+    }
+
+
+def post_page(page_size: int) -> PostListSchema:
+    random.seed(page_size)
+    now = datetime.now(UTC)
+    authors = [
+        {
+            "code": generate(),
+            "email": f"user{i}@example.com",
+            "nickname": f"user{i}",
+            "profile_image_url": f"https://example.com/profile/{generate()}.jpg",
+        }
+        for i in range(page_size // 4 + 1)
+    ]
+    items = []
+    for i in range(page_size):
+        created_at = now - timedelta(minutes=i * 7)
+        items.append(
+            {
+                "code": generate(),
+                "author": random.choice(authors),
+                "title": " ".join(random.choices(WORDS, k=random.randint(2, 6))),
+                "content": " ".join(random.choices(WORDS, k=random.randint(5, 80))),
+                "images": [image(created_at) for _ in range(random.randint(0, 4))],
+                "interest_count": random.randint(0, 500),
+                "comment_count": random.randint(0, 100),
+                "drawing_count": random.randint(0, 20),
+                "is_interested": random.random() < 0.2,
+                "created_at": created_at,
+                "updated_at": created_at,
+            }
+        )
+    return PostListSchema(items=items, next_cursor=generate())
+
+
+def measure(body: bytes, encoding: str, level: int, repeat: int) -> tuple[int, float]:
+    # gzip_level과 brotli_quality 중 encoding에 맞는 값만 쓰입니다.
+    size = len(compress(body, encoding, level, level))  # 준비 실행
+    started = time.perf_counter()
+    for _ in range(repeat):
+        compress(body, encoding, level, level)
+    return size, (time.perf_counter() - started) / repeat
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--page-size", type=int, nargs="+", default=[20, 100])
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    for page_size in args.page_size:
+        body = FastJSONResponse(post_page(page_size)).body
+        print(f"page_size={page_size} body={len(body)}B")
+        for encoding, levels in LEVELS:
+            # quality 11은 느리므로 반복 횟수를 줄입니다.
+            for level in levels:
+                repeat = max(1, args.repeat // 20) if level > 9 else args.repeat
+                size, seconds = measure(body, encoding, level, repeat)
+                saved = len(body) - size
+                print(
+                    f"  {encoding:<4} {level:>2} {size:8d}B "
+                    f"ratio={len(body) / size:6.1f} "
+                    f"{seconds * 1000:7.3f}ms "
+                    f"saved/ms={saved / (seconds * 1000):9.0f}B"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""/api/posts, /api/drawings 응답을 만드는 데 걸리는 시간을 경로별로 비교합니다.
+
+default는 라우트가 스키마를 돌려줄 때 FastAPI가 하는 일(response_model로 다시 검증하고
+dict로 바꾼 뒤 표준 json으로 인코딩)이고, fast는 라우트가 FastJSONResponse로 감싸서
+검증 없이 orjson으로 인코딩하는 경로입니다. DB 없이 이미지 3장짜리 항목으로 채운
+목록 한 페이지를 만들어 인코딩만 잽니다.
+
+    uv run python -m benchmarks.json_response --page-size 100 --repeat 500
+"""
+
+import argparse
+import asyncio
+import time
+from collections.abc import Awaitable, Callable
+from datetime import UTC, datetime
+from typing import Any
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute, serialize_response
+from pydantic import BaseModel
+
+from app.core.responses import FastJSONResponse
+from app.main import app
+from app.schemas.drawings import DrawingListSchema
+from app.schemas.posts import PostListSchema
+
+NOW = datetime.now(UTC)
+USER = {
+    "code": "user-code",
+    "email": "user@example.com",
+    "nickname": "user",
+    "profile_image_url": "https://example.com/profile.jpg",
+}
+IMAGE = {
+    "url": "https://example.com/image.jpg",
+    "width": 1280,
+    "height": 960,
+    "size": 200000,
+    "variants": [
+        {
+            "url": f"https://example.com/image/{width}w.webp",
+            "format": "WEBP",
+            "width": width,
+            "height": width * 3 // 4,
+            "size": width * 30,
+        }
+        for width in (320, 640)
+    ],
+    "created_at": NOW,
+    "updated_at": NOW,
+}
+
+
+def post_page(page_size: int) -> PostListSchema:
+    return PostListSchema(
+        count=1000,
+        items=[
+            {
+                "code": f"post-{i}",
+                "author": USER,
+                "title": f"title {i}",
+                "content": "content " * 20,
+                "images": [IMAGE] * 3,
+                "interest_count": i,
+                "comment_count": i,
+                "drawing_count": 1,
+                "is_interested": i % 2 == 0,
+                "created_at": NOW,
+                "updated_at": NOW,
+            }
+            for i in range(page_size)
+        ],
+    )
+
+
+def drawing_page(page_size: int) -> DrawingListSchema:
+    return DrawingListSchema(
+        count=1000,
+        items=[
+            {
+                "code": f"drawing-{i}",
+                "post": {"code": f"post-{i}"},
+                "author": USER,
+                "content": "content " * 20,
+                "images": [IMAGE] * 3,
+                "comment_count": i,
+                "created_at": NOW,
+                "updated_at": NOW,
+            }
+            for i in range(page_size)
+        ],
+    )
+
+
+def route(path: str) -> APIRoute:
+    return next(
+        r
+        for r in app.routes
+        if isinstance(r, APIRoute) and r.path == path and "GET" in r.methods
+    )
+
+
+async def measure(render: Callable[[], Awaitable[bytes]], repeat: int) -> float:
+    await render()  # 준비 실행
+    started = time.perf_counter()
+    for _ in range(repeat):
+        await render()
+    return (time.perf_counter() - started) / repeat
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=500)
+    args = parser.parse_args()
+
+    pages: list[tuple[str, BaseModel]] = [
+        ("/api/posts", post_page(args.page_size)),
+        ("/api/drawings", drawing_page(args.page_size)),
+    ]
+    for path, page in pages:
+        field = route(path).response_field
+
+        async def default(page: Any = page, field: Any = field) -> bytes:
+            content = await serialize_response(field=field, response_content=page)
+            return JSONResponse(content).body
+
+        async def fast(page: Any = page) -> bytes:
+            return FastJSONResponse(page).body
+
+        # 두 경로는 같은 바이트를 만듭니다.
+        assert await default() == await fast()
+        results = {
+            name: await measure(render, args.repeat)
+            for name, render in [("default", default), ("fast", fast)]
+        }
+        for name, seconds in results.items():
+            print(
+                f"{path:<14} {name:<8} {seconds * 1000:7.3f}ms/page "
+                f"x{results['default'] / seconds:5.2f}"
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
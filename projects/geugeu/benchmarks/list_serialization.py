@@ -0,0 +1,107 @@
+"""post 목록 한 페이지를 ORM 객체로 읽을 때와 컬럼만 읽을 때의 처리량을 비교합니다.
+
+orm은 Post와 author, images를 ORM으로 읽어 PostSchema.from_model로 옮기는 이전 경로이고,
+projection은 PostService.get_posts가 쓰는 Core select + json_agg 경로입니다.
+두 경로 모두 같은 100개짜리 페이지를 반복해서 읽고 초당 처리한 행 수를 출력합니다.
+시드 데이터는 한 트랜잭션 안에서 만들고 끝나면 롤백합니다.
+
+    docker compose up -d
+    uv run python -m benchmarks.list_serialization --page-size 100 --repeat 200
+"""
+
+import argparse
+import asyncio
+import time
+from collections.abc import Awaitable, Callable
+
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import joinedload, selectinload, with_loader_criteria
+
+from app.core.config import settings
+from app.models import Image, Post
+from app.schemas.posts import PostListFilter, PostSchema
+from app.services.posts import PostService
+
+SEED = [
+    'INSERT INTO "user" (code, email, nickname, is_admin, profile_image_url)'
+    " SELECT 'bench-u' || i, 'bench-u' || i || '@example.com', 'user' || i, false,"
+    " 'https://example.com/profile.jpg' FROM generate_series(1, 100) AS i",
+    "INSERT INTO post (code, author_id, title, content)"
+    " SELECT 'bench-p' || i, (SELECT id FROM \"user\" WHERE code = 'bench-u' || i % 100 + 1),"
+    " 'title ' || i, repeat('content ', 20) FROM generate_series(1, :posts) AS i",
+    "INSERT INTO image (code, post_id, url, width, height, size, variants)"
+    " SELECT 'bench-i' || post.id || '-' || n, post.id,"
+    " 'https://example.com/' || post.id || '-' || n || '.jpg', 1280, 960, 200000,"
+    ' \'[{"url": "https://example.com/320w.webp", "format": "WEBP",'
+    ' "width": 320, "height": 240, "size": 10000}]\''
+    " FROM post, generate_series(1, :images) AS n WHERE post.code LIKE 'bench-p%'",
+    "ANALYZE",
+]
+
+
+async def orm_page(session: AsyncSession, page_size: int) -> int:
+    # 이전 경로: ORM 객체를 만든 뒤 스키마로 옮깁니다.
+    result = await session.execute(
+        select(Post)
+        .where(Post.deleted_at.is_(None))
+        .order_by(Post.id.desc())
+        .options(
+            joinedload(Post.author),
+            selectinload(Post.images),
+            with_loader_criteria(Image, Image.deleted_at.is_(None)),
+        )
+        .limit(page_size)
+        .execution_options(populate_existing=True)
+    )
+    return len([PostSchema.from_model(post) for post in result.scalars().all()])
+
+
+async def projection_page(session: AsyncSession, page_size: int) -> int:
+    filters = PostListFilter(page_size=page_size, include_count=False)
+    return len((await PostService(session, None).get_posts(filters)).items)
+
+
+async def measure(
+    page: Callable[[], Awaitable[int]], repeat: int
+) -> tuple[float, float]:
+    await page()  # 준비 실행
+    rows = 0
+    started = time.perf_counter()
+    for _ in range(repeat):
+        rows += await page()
+    elapsed = time.perf_counter() - started
+    return rows / elapsed, elapsed / repeat
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--images", type=int, default=3)
+    args = parser.parse_args()
+
+    engine = create_async_engine(settings.POSTGRES_ASYNC_DATABASE_URL)
+    async with engine.connect() as connection:
+        transaction = await connection.begin()
+        for statement in SEED:
+            await connection.execute(
+                text(statement), {"posts": args.page_size, "images": args.images}
+            )
+        async with AsyncSession(bind=connection) as session:
+            for name, page in [("orm", orm_page), ("projection", projection_page)]:
+                rows_per_second, seconds_per_page = await measure(
+                    lambda page=page: page(session, args.page_size), args.repeat
+                )
+                session.expunge_all()
+                print(
+                    f"{name:<10} "
+                    f"{rows_per_second:10.0f}rows/s "
+                    f"page={seconds_per_page * 1000:6.2f}ms"
+                )
+        await transaction.rollback()
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
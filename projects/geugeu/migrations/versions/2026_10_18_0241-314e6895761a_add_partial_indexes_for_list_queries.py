@@ -0,0 +1,56 @@
+"""add partial indexes for list queries
+
+Revision ID: 314e6895761a
+Revises: 5d0c3b1e9a72
+Create Date: 2026-10-18 02:41:40.746015
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '314e6895761a'
+down_revision: Union[str, None] = '5d0c3b1e9a72'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (인덱스 이름, 테이블, 컬럼)
+INDEXES = [
+    ('ix_post_author_id_id', 'post', ['author_id', sa.literal_column('id DESC')]),
+    ('ix_drawing_post_id_id', 'drawing', ['post_id', sa.literal_column('id DESC')]),
+    ('ix_drawing_author_id_id', 'drawing', ['author_id', sa.literal_column('id DESC')]),
+    ('ix_image_post_id', 'image', ['post_id']),
+    ('ix_image_drawing_id', 'image', ['drawing_id']),
+    ('ix_comment_post_id_created_at', 'comment', ['post_id', 'created_at']),
+    ('ix_comment_drawing_id_created_at', 'comment', ['drawing_id', 'created_at']),
+    ('ix_interest_post_id_created_at', 'interest', ['post_id', sa.literal_column('created_at DESC')]),
+    ('ix_interest_user_id_created_at', 'interest', ['user_id', sa.literal_column('created_at DESC')]),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # 운영 중인 테이블에 쓰기 잠금을 걸지 않도록 CONCURRENTLY로 만듭니다.
+    # CONCURRENTLY는 트랜잭션 안에서 실행할 수 없으므로 autocommit으로 실행합니다.
+    # 도중에 실패하면 INVALID 인덱스가 남으므로 먼저 지우고 다시 만듭니다.
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
+            op.create_index(
+                name,
+                table,
+                columns,
+                unique=False,
+                postgresql_where=sa.text('deleted_at IS NULL'),
+                postgresql_concurrently=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
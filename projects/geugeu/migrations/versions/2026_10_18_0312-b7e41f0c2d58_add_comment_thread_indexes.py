@@ -0,0 +1,65 @@
+"""add comment thread indexes
+
+Revision ID: b7e41f0c2d58
+Revises: 314e6895761a
+Create Date: 2026-10-18 03:12:05.442187
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e41f0c2d58'
+down_revision: Union[str, None] = '314e6895761a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (인덱스 이름, 컬럼, 조건)
+INDEXES = [
+    ('ix_comment_top_level_post_id_created_at', ['post_id', 'created_at', 'id'], 'parent_id IS NULL AND deleted_at IS NULL'),
+    ('ix_comment_post_id_parent_id_created_at', ['post_id', 'parent_id', 'created_at', 'id'], 'deleted_at IS NULL'),
+    ('ix_comment_top_level_drawing_id_created_at', ['drawing_id', 'created_at', 'id'], 'parent_id IS NULL AND deleted_at IS NULL'),
+    ('ix_comment_drawing_id_parent_id_created_at', ['drawing_id', 'parent_id', 'created_at', 'id'], 'deleted_at IS NULL'),
+]
+# 위 인덱스로 대체되는 인덱스
+REPLACED_INDEXES = [
+    ('ix_comment_post_id_created_at', ['post_id', 'created_at'], 'deleted_at IS NULL'),
+    ('ix_comment_drawing_id_created_at', ['drawing_id', 'created_at'], 'deleted_at IS NULL'),
+]
+
+
+def _create_indexes(indexes) -> None:
+    for name, columns, where in indexes:
+        op.drop_index(name, table_name='comment', postgresql_concurrently=True, if_exists=True)
+        op.create_index(
+            name,
+            'comment',
+            columns,
+            unique=False,
+            postgresql_where=sa.text(where),
+            postgresql_concurrently=True,
+        )
+
+
+def _drop_indexes(indexes) -> None:
+    for name, _, _ in indexes:
+        op.drop_index(name, table_name='comment', postgresql_concurrently=True, if_exists=True)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # 최상위 댓글은 (created_at, id) 순으로, 답글은 부모별로 (created_at, id) 순으로 읽습니다.
+    # parent_id IS NULL 조건은 인덱스 정렬에 쓰이지 않으므로 최상위 댓글 인덱스를 따로 둡니다.
+    with op.get_context().autocommit_block():
+        _create_indexes(INDEXES)
+        _drop_indexes(REPLACED_INDEXES)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        _create_indexes(REPLACED_INDEXES)
+        _drop_indexes(INDEXES)
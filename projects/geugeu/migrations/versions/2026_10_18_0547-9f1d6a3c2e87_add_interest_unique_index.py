@@ -0,0 +1,50 @@
+"""add interest unique index
+
+Revision ID: 9f1d6a3c2e87
+Revises: e5b2c8a41d93
+Create Date: 2026-10-18 05:47:12.318904
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '9f1d6a3c2e87'
+down_revision: Union[str, None] = 'e5b2c8a41d93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # 동시에 눌러서 생긴 중복 관심은 가장 먼저 만든 것만 남기고 삭제 처리합니다.
+    op.execute(
+        """
+        UPDATE interest SET deleted_at = now()
+        WHERE deleted_at IS NULL
+          AND id NOT IN (
+            SELECT min(id) FROM interest
+            WHERE deleted_at IS NULL
+            GROUP BY user_id, post_id
+          )
+        """
+    )
+    with op.get_context().autocommit_block():
+        op.drop_index('uq_interest_user_id_post_id', table_name='interest', postgresql_concurrently=True, if_exists=True)
+        op.create_index(
+            'uq_interest_user_id_post_id',
+            'interest',
+            ['user_id', 'post_id'],
+            unique=True,
+            postgresql_where=sa.text('deleted_at IS NULL'),
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('uq_interest_user_id_post_id', table_name='interest', postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,50 @@
+"""add counts
+
+Revision ID: 4a8e2f7b1c95
+Revises: 9f1d6a3c2e87
+Create Date: 2026-10-18 06:23:41.907215
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '4a8e2f7b1c95'
+down_revision: Union[str, None] = '9f1d6a3c2e87'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('post', sa.Column('interest_count', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('post', sa.Column('comment_count', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('post', sa.Column('drawing_count', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('drawing', sa.Column('comment_count', sa.Integer(), server_default='0', nullable=False))
+    # 기존 행의 수를 채웁니다. 이후에는 서비스가 관리하고, 어긋나면
+    # python -m app.reconcile_counts로 다시 계산합니다.
+    op.execute(
+        """
+        UPDATE post SET
+          interest_count = (SELECT count(*) FROM interest WHERE interest.post_id = post.id AND interest.deleted_at IS NULL),
+          comment_count = (SELECT count(*) FROM comment WHERE comment.post_id = post.id AND comment.deleted_at IS NULL),
+          drawing_count = (SELECT count(*) FROM drawing WHERE drawing.post_id = post.id AND drawing.deleted_at IS NULL)
+        """
+    )
+    op.execute(
+        """
+        UPDATE drawing SET
+          comment_count = (SELECT count(*) FROM comment WHERE comment.drawing_id = drawing.id AND comment.deleted_at IS NULL)
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('drawing', 'comment_count')
+    op.drop_column('post', 'drawing_count')
+    op.drop_column('post', 'comment_count')
+    op.drop_column('post', 'interest_count')
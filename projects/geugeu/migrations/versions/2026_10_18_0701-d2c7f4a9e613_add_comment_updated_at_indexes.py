@@ -0,0 +1,47 @@
+"""add comment updated_at indexes
+
+Revision ID: d2c7f4a9e613
+Revises: 4a8e2f7b1c95
+Create Date: 2026-10-18 07:01:26.584390
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'd2c7f4a9e613'
+down_revision: Union[str, None] = '4a8e2f7b1c95'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (인덱스 이름, 컬럼)
+INDEXES = [
+    ('ix_comment_post_id_updated_at', ['post_id', 'updated_at']),
+    ('ix_comment_drawing_id_updated_at', ['drawing_id', 'updated_at']),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # 댓글 목록의 ETag를 인덱스만 읽어 만듭니다.
+    with op.get_context().autocommit_block():
+        for name, columns in INDEXES:
+            op.drop_index(name, table_name='comment', postgresql_concurrently=True, if_exists=True)
+            op.create_index(
+                name,
+                'comment',
+                columns,
+                unique=False,
+                postgresql_where=sa.text('deleted_at IS NULL'),
+                postgresql_concurrently=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, _ in INDEXES:
+            op.drop_index(name, table_name='comment', postgresql_concurrently=True, if_exists=True)
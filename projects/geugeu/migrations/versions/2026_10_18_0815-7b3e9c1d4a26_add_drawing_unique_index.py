@@ -0,0 +1,57 @@
+"""add drawing unique index
+
+Revision ID: 7b3e9c1d4a26
+Revises: d2c7f4a9e613
+Create Date: 2026-10-18 08:15:41.205733
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '7b3e9c1d4a26'
+down_revision: Union[str, None] = 'd2c7f4a9e613'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # 동시에 만들어서 생긴 중복 drawing은 가장 먼저 만든 것만 남기고 삭제 처리하고,
+    # 삭제 처리한 수만큼 post의 그림 수를 뺍니다.
+    op.execute(
+        """
+        WITH removed AS (
+            UPDATE drawing SET deleted_at = now()
+            WHERE deleted_at IS NULL
+              AND id NOT IN (
+                SELECT min(id) FROM drawing
+                WHERE deleted_at IS NULL
+                GROUP BY post_id, author_id
+              )
+            RETURNING post_id
+        )
+        UPDATE post SET drawing_count = post.drawing_count - r.n
+        FROM (SELECT post_id, count(*) AS n FROM removed GROUP BY post_id) AS r
+        WHERE post.id = r.post_id
+        """
+    )
+    with op.get_context().autocommit_block():
+        op.drop_index('uq_drawing_post_id_author_id', table_name='drawing', postgresql_concurrently=True, if_exists=True)
+        op.create_index(
+            'uq_drawing_post_id_author_id',
+            'drawing',
+            ['post_id', 'author_id'],
+            unique=True,
+            postgresql_where=sa.text('deleted_at IS NULL'),
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('uq_drawing_post_id_author_id', table_name='drawing', postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,31 @@
+"""add image url index
+
+Revision ID: 9e4a2b7c5d18
+Revises: 7b3e9c1d4a26
+Create Date: 2026-10-18 08:40:12.318204
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '9e4a2b7c5d18'
+down_revision: Union[str, None] = '7b3e9c1d4a26'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # 이미 붙인 업로드 key인지, 지울 파일을 아직 참조하는 행이 있는지 url로 찾습니다.
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_image_url', table_name='image', postgresql_concurrently=True, if_exists=True)
+        op.create_index('ix_image_url', 'image', ['url'], unique=False, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_image_url', table_name='image', postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,51 @@
+"""include author_id in comment updated_at indexes
+
+Revision ID: 3f6d8a1e2b47
+Revises: 9e4a2b7c5d18
+Create Date: 2026-10-18 09:00:12.418265
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '3f6d8a1e2b47'
+down_revision: Union[str, None] = '9e4a2b7c5d18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (인덱스 이름, 컬럼)
+INDEXES = [
+    ('ix_comment_post_id_updated_at', ['post_id', 'updated_at']),
+    ('ix_comment_drawing_id_updated_at', ['drawing_id', 'updated_at']),
+]
+
+
+def _recreate_indexes(include: list[str]) -> None:
+    with op.get_context().autocommit_block():
+        for name, columns in INDEXES:
+            op.drop_index(name, table_name='comment', postgresql_concurrently=True, if_exists=True)
+            op.create_index(
+                name,
+                'comment',
+                columns,
+                unique=False,
+                postgresql_include=include,
+                postgresql_where=sa.text('deleted_at IS NULL'),
+                postgresql_concurrently=True,
+            )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # 댓글 목록의 ETag는 작성자의 updated_at도 비교하므로, 작성자를 찾을 때도 댓글 행을
+    # 읽지 않도록 author_id를 인덱스에 넣습니다.
+    _recreate_indexes(['author_id'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    _recreate_indexes([])
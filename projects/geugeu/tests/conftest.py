@@ -1,55 +1,128 @@
+import asyncio
 import os
-from collections.abc import Generator
+from collections.abc import AsyncGenerator, Generator
+from datetime import timedelta
 
 import boto3
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import Session
+from sqlalchemy.pool import NullPool
 from testcontainers.localstack import LocalStackContainer
 from testcontainers.postgres import PostgresContainer
 
 from app.api.dependencies import get_current_user, get_current_user_optional
 from app.core.config import settings
-from app.core.db import Base, get_db
-from app.core.security import get_password_hash
+from app.core import db as core_db
+from app.core.cache import LRUCache, caches
+from app.core.db import Base, RoutingAsyncSession, RoutingSession, get_db
+from app.core.jobs import run_pending_jobs
+from app.core.dependencies import DatabaseDep
+from app.core.security import create_access_token, get_password_hash
 from app.main import app
 from app.models import User
 
 
 @pytest.fixture(scope="session")
-def engine():
+def postgres():
     with PostgresContainer("postgres:16") as postgres_container:
-        engine = create_engine(postgres_container.get_connection_url())
-        Base.metadata.create_all(engine)
-        yield engine
-        Base.metadata.drop_all(engine)
+        yield postgres_container
+
+
+@pytest.fixture(scope="session")
+def engine(postgres):
+    engine = create_engine(postgres.get_connection_url())
+    Base.metadata.create_all(engine)
+    yield engine
+    Base.metadata.drop_all(engine)
+
+
+@pytest.fixture(scope="session")
+def async_session_factory(postgres, engine):
+    # TestClient는 요청마다 이벤트 루프를 새로 만들 수 있으므로
+    # 루프에 묶인 asyncpg 커넥션을 풀에 보관하지 않습니다.
+    async_engine = create_async_engine(
+        postgres.get_connection_url(driver="asyncpg"),
+        poolclass=NullPool,
+    )
+    return async_sessionmaker(
+        async_engine,
+        class_=RoutingAsyncSession,
+        expire_on_commit=False,
+        sync_session_class=RoutingSession,
+    )
+
+
+@pytest.fixture()
+def replica(postgres, engine, monkeypatch):
+    # 같은 DB를 replica로 등록하고, replica로 실행된 쿼리를 기록합니다.
+    replica_engine = create_async_engine(
+        postgres.get_connection_url(driver="asyncpg"),
+        poolclass=NullPool,
+    )
+    statements: list[str] = []
+
+    @event.listens_for(replica_engine.sync_engine, "before_cursor_execute")
+    def on_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    monkeypatch.setattr(core_db, "replica_engine", replica_engine)
+    yield statements
 
 
 @pytest.fixture()
 def db(engine) -> Generator[Session, None, None]:
-    connection = engine.connect()
-    transaction = connection.begin()
+    # 앱은 별도의 asyncpg 커넥션을 사용하므로 테스트 데이터는 즉시 커밋하고
+    # 테스트가 끝나면 테이블을 비웁니다.
+    connection = engine.connect().execution_options(isolation_level="AUTOCOMMIT")
     session = Session(bind=connection)
     yield session
     session.close()
-    transaction.rollback()
+    tables = ", ".join(f'"{table.name}"' for table in Base.metadata.sorted_tables)
+    connection.execute(text(f"TRUNCATE {tables} RESTART IDENTITY CASCADE"))
     connection.close()
 
 
 @pytest.fixture(autouse=True)
-def override_get_db(db: Session):
-    def get_test_db():
-        yield db
+def override_get_db(db: Session, async_session_factory):
+    async def get_test_db() -> AsyncGenerator[AsyncSession, None]:
+        async with async_session_factory() as session:
+            yield session
 
     app.dependency_overrides[get_db] = get_test_db
     yield
     app.dependency_overrides.clear()
 
 
+@pytest.fixture(autouse=True)
+def clear_caches():
+    # 테스트마다 테이블을 비우므로 이전 테스트의 캐시도 지웁니다.
+    for cache in caches:
+        if isinstance(cache, LRUCache):
+            cache.clear()
+
+
+@pytest.fixture(scope="session")
+def app_client(localstack):
+    # lifespan에서 만드는 S3/httpx 클라이언트를 테스트 세션 동안 함께 사용합니다.
+    with TestClient(app) as client:
+        yield client
+
+
 @pytest.fixture()
-def client():
-    return TestClient(app)
+def client(app_client):
+    return app_client
+
+
+@pytest.fixture()
+def run_jobs(app_client, async_session_factory):
+    # 작업 워커 대신 쌓인 작업을 모두 처리하고 처리한 수를 돌려줍니다.
+    def run() -> int:
+        return asyncio.run(run_pending_jobs(async_session_factory, app.state.s3_client))
+
+    return run
 
 
 @pytest.fixture()
@@ -77,9 +150,22 @@ def user(db, hashed_password):
 
 
 @pytest.fixture()
-def authorized_user(user):
-    app.dependency_overrides[get_current_user] = lambda: user
-    app.dependency_overrides[get_current_user_optional] = lambda: user
+def auth_headers(user):
+    # 의존성을 덮어쓰지 않고 실제 토큰으로 인증합니다.
+    token = create_access_token(user.code, expires_delta=timedelta(minutes=5))
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.fixture()
+def authorized_user(db, user):
+    async def get_test_current_user(session: DatabaseDep) -> User | None:
+        # 테스트에서 바꾼 유저 속성(is_admin 등)을 반영한 뒤 요청 세션으로 읽습니다.
+        db.flush()
+        session.info["user_id"] = user.id
+        return await session.get(User, user.id)
+
+    app.dependency_overrides[get_current_user] = get_test_current_user
+    app.dependency_overrides[get_current_user_optional] = get_test_current_user
     yield user
     app.dependency_overrides.clear()
 
@@ -1,4 +1,8 @@
-from datetime import UTC, datetime
+import time
+from datetime import UTC, datetime, timedelta
+
+from app.core.cache import token_cache
+from app.core.security import create_access_token
 
 
 def test_login(client, user):
@@ -55,3 +59,41 @@ def test_login_with_invalid_password(client, user):
     # then
     assert response.status_code == 401
     assert response.json()["detail"] == "Incorrect username or password"
+
+
+def test_authenticate_with_cached_token(client, user, auth_headers):
+    # given
+    client.get("/api/users/me", headers=auth_headers)
+    hits = token_cache.stats()["hits"]
+
+    # when
+    response = client.get("/api/users/me", headers=auth_headers)
+
+    # then
+    assert response.status_code == 200
+    assert token_cache.stats()["hits"] == hits + 1
+
+
+def test_authenticate_with_expired_cached_token(client, user):
+    # given
+    token = create_access_token(user.code, expires_delta=timedelta(seconds=1))
+    headers = {"Authorization": f"Bearer {token}"}
+    assert client.get("/api/users/me", headers=headers).status_code == 200
+
+    # when
+    time.sleep(1.1)
+    response = client.get("/api/users/me", headers=headers)
+
+    # then
+    assert response.status_code == 401
+
+
+def test_authenticate_with_invalid_token(client, user, auth_headers):
+    # given
+    token = auth_headers["Authorization"] + "x"
+
+    # when
+    response = client.get("/api/users/me", headers={"Authorization": token})
+
+    # then
+    assert response.status_code == 401
@@ -1,6 +1,16 @@
+import asyncio
 from datetime import UTC, datetime
 
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import func, select
+
+from app.core.config import settings
 from app.models import Comment, Drawing, Post, User
+from app.schemas.drawing_comments import CreateCommentSchema
+from app.services.comment_threads import delete_comment_thread
+from app.services.counters import update_drawing_counts
+from app.services.drawing_comments import DrawingCommentService
 
 
 def test_create_comment(client, db, authorized_user):
@@ -104,6 +114,147 @@ def test_get_comments(client, db, authorized_user):
     assert len(response.json()["items"]) == 3
 
 
+def test_get_comment_with_replies(client, db, authorized_user, monkeypatch):
+    # given
+    post = Post(
+        author_id=authorized_user.id,
+        title="test title",
+        content="test content",
+    )
+    db.add(post)
+    db.flush()
+
+    drawing = Drawing(
+        post_id=post.id,
+        author_id=authorized_user.id,
+        content="test content",
+    )
+    db.add(drawing)
+    db.flush()
+
+    # 최상위 댓글 > 답글 > 답글의 답글, 삭제된 답글
+    parent_id = None
+    thread = []
+    for depth in range(3):
+        comment = Comment(
+            drawing_id=drawing.id,
+            author_id=authorized_user.id,
+            parent_id=parent_id,
+            content=f"depth {depth}",
+        )
+        db.add(comment)
+        db.flush()
+        thread.append(comment)
+        parent_id = comment.id
+    db.add(
+        Comment(
+            drawing_id=drawing.id,
+            author_id=authorized_user.id,
+            parent_id=thread[0].id,
+            content="deleted reply",
+            deleted_at=datetime.now(UTC),
+        )
+    )
+    db.flush()
+    monkeypatch.setattr(settings, "COMMENT_THREAD_MAX_DEPTH", 2)
+
+    # when
+    response = client.get(f"/api/drawings/{drawing.code}/comments/{thread[0].code}")
+
+    # then
+    assert response.status_code == 200
+    root = response.json()
+    assert root["reply_count"] == 1
+    [reply] = root["replies"]
+    assert reply["code"] == thread[1].code
+    assert reply["replies"] == []
+
+
+def test_get_replies(client, db, authorized_user):
+    # given
+    post = Post(
+        author_id=authorized_user.id,
+        title="test title",
+        content="test content",
+    )
+    db.add(post)
+    db.flush()
+
+    drawing = Drawing(
+        post_id=post.id,
+        author_id=authorized_user.id,
+        content="test content",
+    )
+    db.add(drawing)
+    db.flush()
+
+    comment = Comment(
+        drawing_id=drawing.id,
+        author_id=authorized_user.id,
+        content="test comment",
+    )
+    db.add(comment)
+    db.flush()
+
+    reply = Comment(
+        drawing_id=drawing.id,
+        author_id=authorized_user.id,
+        parent_id=comment.id,
+        content="test reply",
+    )
+    db.add(reply)
+    db.flush()
+
+    nested_reply = Comment(
+        drawing_id=drawing.id,
+        author_id=authorized_user.id,
+        parent_id=reply.id,
+        content="test nested reply",
+    )
+    db.add(nested_reply)
+    db.flush()
+
+    # when
+    response = client.get(
+        f"/api/drawings/{drawing.code}/comments/{comment.code}/replies"
+    )
+
+    # then
+    assert response.status_code == 200
+    assert response.json()["count"] == 1
+    [item] = response.json()["items"]
+    assert item["code"] == reply.code
+    assert item["reply_count"] == 1
+    assert item["replies"][0]["code"] == nested_reply.code
+
+
+@pytest.mark.parametrize("page_size", [0, 101])
+def test_get_comments_with_invalid_page_size(client, db, authorized_user, page_size):
+    # given
+    post = Post(author_id=authorized_user.id, title="title", content="content")
+    db.add(post)
+    db.flush()
+    drawing = Drawing(post_id=post.id, author_id=authorized_user.id, content="d")
+    db.add(drawing)
+    db.flush()
+    comment = Comment(drawing_id=drawing.id, author_id=authorized_user.id, content="c")
+    db.add(comment)
+    db.flush()
+
+    # when
+    comments = client.get(
+        f"/api/drawings/{drawing.code}/comments", params={"page_size": page_size}
+    )
+    replies = client.get(
+        f"/api/drawings/{drawing.code}/comments/{comment.code}/replies",
+        params={"page_size": page_size},
+    )
+
+    # then
+    assert comments.status_code == 422
+    assert replies.status_code == 422
+
+
 def test_get_comments_401(client, user):
     # when
     response = client.get("/api/drawings/abcd123/comments")
@@ -306,9 +457,106 @@ def test_delete_comment(client, db, authorized_user):
 
     # then
     assert response.status_code == 204
+    db.refresh(comment)
     assert comment.deleted_at is not None
 
 
+def test_delete_comment_with_replies(client, db, authorized_user):
+    # given
+    post = Post(
+        author_id=authorized_user.id,
+        title="test title",
+        content="test content",
+    )
+    db.add(post)
+    db.flush()
+
+    drawing = Drawing(
+        post_id=post.id,
+        author_id=authorized_user.id,
+        content="test content",
+        comment_count=2,
+    )
+    db.add(drawing)
+    db.flush()
+
+    comment = Comment(
+        drawing_id=drawing.id,
+        author_id=authorized_user.id,
+        content="test comment",
+    )
+    db.add(comment)
+    db.flush()
+    reply = Comment(
+        drawing_id=drawing.id,
+        author_id=authorized_user.id,
+        parent_id=comment.id,
+        content="test reply",
+    )
+    db.add(reply)
+    db.flush()
+
+    # when
+    response = client.delete(f"/api/drawings/{drawing.code}/comments/{comment.code}")
+
+    # then
+    assert response.status_code == 204
+    db.refresh(reply)
+    assert reply.deleted_at is not None
+    db.refresh(drawing)
+    assert drawing.comment_count == 0
+
+
+def test_delete_comment_of_other_drawing_404(client, db, authorized_user):
+    # given
+    post = Post(
+        author_id=authorized_user.id,
+        title="test title",
+        content="test content",
+    )
+    db.add(post)
+    db.flush()
+
+    other_user = User(
+        email="other@example.com",
+        password="password",
+    )
+    db.add(other_user)
+    db.flush()
+
+    drawing = Drawing(
+        post_id=post.id,
+        author_id=authorized_user.id,
+        content="test content",
+    )
+    other_drawing = Drawing(
+        post_id=post.id,
+        author_id=other_user.id,
+        content="other content",
+        comment_count=1,
+    )
+    db.add_all([drawing, other_drawing])
+    db.flush()
+
+    comment = Comment(
+        drawing_id=other_drawing.id,
+        author_id=authorized_user.id,
+        content="test comment",
+    )
+    db.add(comment)
+    db.flush()
+
+    # when
+    response = client.delete(f"/api/drawings/{drawing.code}/comments/{comment.code}")
+
+    # then
+    assert response.status_code == 404
+    db.refresh(comment)
+    assert comment.deleted_at is None
+    db.refresh(other_drawing)
+    assert other_drawing.comment_count == 1
+
+
 def test_delete_comment_401(client, user):
     # when
     response = client.delete("/api/drawings/abcd123/comments/abcd123")
@@ -357,6 +605,7 @@ def test_delete_comment_403(client, db, authorized_user):
 
     # then
     assert response.status_code == 403
+    db.refresh(comment)
     assert comment.deleted_at is None
 
 
@@ -403,3 +652,149 @@ def test_create_reply_comment(client, db, authorized_user):
     # then
     assert response.status_code == 201
     assert response.json()["content"] == "감사합니다"
+
+
+def test_comment_count(client, db, authorized_user):
+    # given
+    post = Post(
+        author_id=authorized_user.id,
+        title="test title",
+        content="test content",
+    )
+    db.add(post)
+    db.flush()
+    drawing = Drawing(
+        post_id=post.id,
+        author_id=authorized_user.id,
+        content="test content",
+    )
+    db.add(drawing)
+    db.flush()
+
+    # when
+    comment_code = client.post(
+        f"/api/drawings/{drawing.code}/comments",
+        json={"content": "test comment"},
+    ).json()["code"]
+
+    # then
+    assert client.get(f"/api/drawings/{drawing.code}").json()["comment_count"] == 1
+
+    # when
+    client.delete(f"/api/drawings/{drawing.code}/comments/{comment_code}")
+
+    # then
+    assert client.get(f"/api/drawings/{drawing.code}").json()["comment_count"] == 0
+
+
+def test_create_reply_while_deleting_thread(db, async_session_factory, user):
+    # given - 댓글 > 답글 > 답글
+    post = Post(
+        author_id=user.id,
+        title="test title",
+        content="test content",
+    )
+    db.add(post)
+    db.flush()
+    drawing = Drawing(
+        post_id=post.id,
+        author_id=user.id,
+        content="test content",
+        comment_count=3,
+    )
+    db.add(drawing)
+    db.flush()
+    parent_id = None
+    for content in ["test comment", "test reply", "test nested reply"]:
+        comment = Comment(
+            drawing_id=drawing.id,
+            author_id=user.id,
+            parent_id=parent_id,
+            content=content,
+        )
+        db.add(comment)
+        db.flush()
+        parent_id = comment.id
+    root = db.scalar(select(Comment).where(Comment.content == "test comment"))
+
+    async def race():
+        async with (
+            async_session_factory() as deleting,
+            async_session_factory() as replying,
+        ):
+            # 최상위 댓글을 잠그고 삭제하는 중에
+            await deleting.execute(
+                select(Comment).where(Comment.id == root.id).with_for_update()
+            )
+            reply = asyncio.create_task(
+                DrawingCommentService(replying).create_comment(
+                    user=user,
+                    drawing_code=drawing.code,
+                    payload=CreateCommentSchema(
+                        content="late reply", parent_code=comment.code
+                    ),
+                )
+            )
+            await asyncio.sleep(0.5)
+            deleted = await delete_comment_thread(deleting, root.id, datetime.now(UTC))
+            await deleting.execute(
+                update_drawing_counts(drawing.id, comment_count=-deleted)
+            )
+            await deleting.commit()
+            with pytest.raises(HTTPException) as exc_info:
+                await reply
+            return exc_info.value
+
+    # when - 가장 깊은 답글에 답글을 달면
+    error = asyncio.run(race())
+
+    # then - 삭제가 끝난 뒤 다시 확인해서 거절하고, 살아 있는 댓글이 남지 않습니다.
+    assert error.status_code == 400
+    live = db.scalar(
+        select(func.count())
+        .select_from(Comment)
+        .where(Comment.drawing_id == drawing.id, Comment.deleted_at.is_(None))
+    )
+    assert live == 0
+    db.refresh(drawing)
+    assert drawing.comment_count == 0
+
+
+def test_get_comments_not_modified(client, db, authorized_user):
+    # given
+    post = Post(
+        author_id=authorized_user.id,
+        title="test title",
+        content="test content",
+    )
+    db.add(post)
+    db.flush()
+    drawing = Drawing(
+        post_id=post.id,
+        author_id=authorized_user.id,
+        content="test content",
+    )
+    db.add(drawing)
+    db.flush()
+    etag = client.get(f"/api/drawings/{drawing.code}/comments").headers["ETag"]
+
+    # when
+    response = client.get(
+        f"/api/drawings/{drawing.code}/comments", headers={"If-None-Match": etag}
+    )
+
+    # then
+    assert response.status_code == 304
+
+    # when - 댓글이 추가되면 다시 보냅니다.
+    client.post(
+        f"/api/drawings/{drawing.code}/comments",
+        json={"content": "test comment"},
+    )
+    response = client.get(
+        f"/api/drawings/{drawing.code}/comments", headers={"If-None-Match": etag}
+    )
+
+    # then
+    assert response.status_code == 200
+    assert len(response.json()["items"]) == 1
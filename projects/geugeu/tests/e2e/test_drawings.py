@@ -1,8 +1,32 @@
 import io
 from datetime import UTC, datetime
 
+import pytest
+from sqlalchemy import func, select
+
+from app.core.cache import drawing_cache
 from app.core.security import get_password_hash
 from app.models import Drawing, Image, Post, User
+from app.services import drawings
+
+# 업로드는 파일 앞부분의 시그니처로 형식을 확인하므로 PNG 시그니처로 시작합니다.
+IMAGE = b"\x89PNG\r\n\x1a\nimagebytes"
+
+
+def create_drawers(db, count: int) -> list[User]:
+    # 유저는 post마다 drawing을 하나만 만들 수 있으므로 drawing마다 다른 유저를 씁니다.
+    users = [
+        User(
+            email=f"drawer{i}@example.com",
+            nickname=f"drawer{i}",
+            is_admin=False,
+            profile_image_url="",
+        )
+        for i in range(count)
+    ]
+    db.add_all(users)
+    db.flush()
+    return users
 
 
 def test_create_drawing(client, db, authorized_user):
@@ -23,8 +47,8 @@ def test_create_drawing(client, db, authorized_user):
             "content": "test content",
         },
         files=[
-            ("files", ("test1.png", io.BytesIO(b"imagebytes"), "image/png")),
-            ("files", ("test2.png", io.BytesIO(b"imagebytes"), "image/png")),
+            ("files", ("test1.png", io.BytesIO(IMAGE), "image/png")),
+            ("files", ("test2.png", io.BytesIO(IMAGE), "image/png")),
         ],
     )
 
@@ -45,7 +69,7 @@ def test_create_drawing_401(client, user):
             "content": "test content",
         },
         files=[
-            ("files", ("test.png", io.BytesIO(b"imagebytes"), "image/png")),
+            ("files", ("test.png", io.BytesIO(IMAGE), "image/png")),
         ],
     )
 
@@ -79,7 +103,7 @@ def test_create_drawing_twice_fails(client, db, authorized_user):
             "content": "test content",
         },
         files=[
-            ("files", ("test.png", io.BytesIO(b"imagebytes"), "image/png")),
+            ("files", ("test.png", io.BytesIO(IMAGE), "image/png")),
         ],
     )
 
@@ -88,6 +112,76 @@ def test_create_drawing_twice_fails(client, db, authorized_user):
     assert response.json()["detail"] == "Drawing already exists"
 
 
+def test_create_drawing_after_other_users_drawing(client, db, authorized_user):
+    # given
+    post = Post(
+        author_id=authorized_user.id,
+        title="test title",
+        content="test content",
+    )
+    db.add(post)
+    db.flush()
+    db.add(Drawing(post_id=post.id, author_id=create_drawers(db, 1)[0].id, content="c"))
+    db.flush()
+
+    # when
+    response = client.post(
+        "/api/drawings",
+        data={"post_code": post.code, "content": "test content"},
+        files=[("files", ("test.png", io.BytesIO(IMAGE), "image/png"))],
+    )
+
+    # then
+    assert response.status_code == 201
+
+
+def test_create_drawing_concurrently_fails(client, db, authorized_user, monkeypatch):
+    # given
+    post = Post(
+        author_id=authorized_user.id,
+        title="test title",
+        content="test content",
+    )
+    db.add(post)
+    db.flush()
+    collect_images = drawings.collect_images
+
+    async def collect_images_and_race(*args):
+        # 업로드하는 동안 다른 요청이 먼저 drawing을 만듭니다.
+        images = await collect_images(*args)
+        db.add(Drawing(post_id=post.id, author_id=authorized_user.id, content="c"))
+        db.flush()
+        return images
+
+    monkeypatch.setattr(drawings, "collect_images", collect_images_and_race)
+
+    # when
+    response = client.post(
+        "/api/drawings",
+        data={"post_code": post.code, "content": "test content"},
+        files=[("files", ("test.png", io.BytesIO(IMAGE), "image/png"))],
+    )
+
+    # then
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Drawing already exists"
+    assert db.scalar(select(func.count()).select_from(Drawing)) == 1
+    db.refresh(post)
+    assert post.drawing_count == 0
+
+
+def test_create_drawing_404(client, authorized_user):
+    # when
+    response = client.post(
+        "/api/drawings",
+        data={"post_code": "abcd123", "content": "test content"},
+        files=[("files", ("test.png", io.BytesIO(IMAGE), "image/png"))],
+    )
+
+    # then
+    assert response.status_code == 404
+
+
 def test_get_drawings(client, db, authorized_user):
     # given
     post = Post(
@@ -101,10 +195,10 @@ def test_get_drawings(client, db, authorized_user):
     drawings = [
         Drawing(
             post_id=post.id,
-            author_id=authorized_user.id,
+            author_id=drawer.id,
             content="test content",
         )
-        for _ in range(3)
+        for drawer in create_drawers(db, 3)
     ]
     db.add_all(drawings)
     db.flush()
@@ -130,6 +224,81 @@ def test_get_drawings(client, db, authorized_user):
     assert len(response.json()["items"]) == 3
 
 
+def test_get_drawings_with_cursor(client, db, authorized_user):
+    # given
+    post = Post(
+        author_id=authorized_user.id,
+        title="test title",
+        content="test content",
+    )
+    db.add(post)
+    db.flush()
+
+    drawings = [
+        Drawing(post_id=post.id, author_id=drawer.id, content=f"{i}")
+        for i, drawer in enumerate(create_drawers(db, 3))
+    ]
+    db.add_all(drawings)
+    db.flush()
+
+    # when
+    first = client.get(
+        "/api/drawings",
+        params={"post_code": post.code, "page_size": 2},
+    )
+    second = client.get(
+        "/api/drawings",
+        params={
+            "post_code": post.code,
+            "page_size": 2,
+            "cursor": first.json()["next_cursor"],
+        },
+    )
+
+    # then
+    assert [item["code"] for item in first.json()["items"]] == [
+        drawings[2].code,
+        drawings[1].code,
+    ]
+    assert [item["code"] for item in second.json()["items"]] == [drawings[0].code]
+    assert second.json()["next_cursor"] is None
+
+
+def test_get_drawings_with_cursor_400(client, authorized_user):
+    # when
+    response = client.get("/api/drawings", params={"cursor": "invalid"})
+
+    # then
+    assert response.status_code == 400
+
+
+def test_get_drawings_with_zero_page_size(client, db, authorized_user):
+    # given
+    post = Post(author_id=authorized_user.id, title="title", content="content")
+    db.add(post)
+    db.flush()
+    db.add(Drawing(post_id=post.id, author_id=authorized_user.id, content="content"))
+    db.flush()
+
+    # when - page_size가 0이면 개수만 돌려줍니다.
+    response = client.get("/api/drawings", params={"page_size": 0})
+
+    # then
+    assert response.status_code == 200
+    assert response.json()["count"] == 1
+    assert response.json()["items"] == []
+    assert response.json()["next_cursor"] is None
+
+
+@pytest.mark.parametrize("params", [{"page_size": -1}, {"page_size": 101}, {"page": 0}])
+def test_get_drawings_with_invalid_page(client, authorized_user, params):
+    # when
+    response = client.get("/api/drawings", params=params)
+
+    # then
+    assert response.status_code == 422
+
+
 def test_get_drawings_401(client, user):
     # when
     response = client.get("/api/drawings")
@@ -166,7 +335,7 @@ def test_get_drawings_with_post_code(client, db, authorized_user):
 
     drawing2 = Drawing(
         post_id=post1.id,
-        author_id=authorized_user.id,
+        author_id=create_drawers(db, 1)[0].id,
         content="test content",
     )
     db.add(drawing2)
@@ -285,6 +454,70 @@ def test_get_drawing(client, db, authorized_user):
     assert len(response.json()["images"]) == 3
 
 
+def test_get_drawing_from_cache(client, db, authorized_user):
+    # given
+    post = Post(
+        author_id=authorized_user.id,
+        title="test title",
+        content="test content",
+    )
+    db.add(post)
+    db.flush()
+    drawing = Drawing(
+        post_id=post.id,
+        author_id=authorized_user.id,
+        content="test content",
+    )
+    db.add(drawing)
+    db.flush()
+    db.add(Image(drawing_id=drawing.id, url="https://example.com/image.jpg"))
+    db.flush()
+    first = client.get(f"/api/drawings/{drawing.code}")
+    hits = drawing_cache.stats()["hits"]
+
+    # when
+    client.post(
+        f"/api/drawings/{drawing.code}/comments", json={"content": "test comment"}
+    )
+
+    # then
+    response = client.get(f"/api/drawings/{drawing.code}")
+    assert response.json() == first.json() | {"comment_count": 1}
+    assert drawing_cache.stats()["hits"] == hits + 1
+
+
+def test_get_drawing_after_update_not_from_cache(client, db, authorized_user):
+    # given
+    post = Post(
+        author_id=authorized_user.id,
+        title="test title",
+        content="test content",
+    )
+    db.add(post)
+    db.flush()
+    drawing = Drawing(
+        post_id=post.id,
+        author_id=authorized_user.id,
+        content="test content",
+    )
+    db.add(drawing)
+    db.flush()
+    client.get(f"/api/drawings/{drawing.code}")
+
+    # when
+    client.put(
+        f"/api/drawings/{drawing.code}",
+        data={"content": "new content"},
+        files=[("files", ("test.png", io.BytesIO(IMAGE), "image/png"))],
+    )
+
+    # then
+    response = client.get(f"/api/drawings/{drawing.code}")
+    assert response.json()["content"] == "new content"
+    assert len(response.json()["images"]) == 1
+    assert drawing_cache.stats()["size"] == 1
+
+
 def test_get_drawing_401(client, user):
     # when
     response = client.get("/api/drawings/abcd123")
@@ -339,8 +572,8 @@ def test_update_drawing(client, db, authorized_user):
             "content": "new content",
         },
         files=[
-            ("files", ("test1.png", io.BytesIO(b"imagebytes"), "image/png")),
-            ("files", ("test2.png", io.BytesIO(b"imagebytes"), "image/png")),
+            ("files", ("test1.png", io.BytesIO(IMAGE), "image/png")),
+            ("files", ("test2.png", io.BytesIO(IMAGE), "image/png")),
         ],
     )
 
@@ -361,7 +594,7 @@ def test_update_drawing_401(client, user):
             "content": "new content",
         },
         files=[
-            ("files", ("test.png", io.BytesIO(b"imagebytes"), "image/png")),
+            ("files", ("test.png", io.BytesIO(IMAGE), "image/png")),
         ],
     )
 
@@ -401,7 +634,7 @@ def test_update_drawing_403(client, db, authorized_user, hashed_password):
             "content": "new content",
         },
         files=[
-            ("files", ("test.png", io.BytesIO(b"imagebytes"), "image/png")),
+            ("files", ("test.png", io.BytesIO(IMAGE), "image/png")),
         ],
     )
 
@@ -443,7 +676,7 @@ def test_update_drawing_by_admin(client, db, authorized_user, hashed_password):
             "content": "new content",
         },
         files=[
-            ("files", ("test.png", io.BytesIO(b"imagebytes"), "image/png")),
+            ("files", ("test.png", io.BytesIO(IMAGE), "image/png")),
         ],
     )
 
@@ -462,7 +695,7 @@ def test_update_drawing_404(client, authorized_user):
             "content": "new content",
         },
         files=[
-            ("files", ("test.png", io.BytesIO(b"imagebytes"), "image/png")),
+            ("files", ("test.png", io.BytesIO(IMAGE), "image/png")),
         ],
     )
 
@@ -592,3 +825,107 @@ def test_delete_drawing_404(client, authorized_user):
 
     # then
     assert response.status_code == 404
+
+
+def test_drawing_count(client, db, authorized_user):
+    # given
+    post = Post(
+        author_id=authorized_user.id,
+        title="test title",
+        content="test content",
+    )
+    db.add(post)
+    db.flush()
+
+    # when
+    drawing_code = client.post(
+        "/api/drawings",
+        data={"post_code": post.code, "content": "test content"},
+        files=[("files", ("test.png", io.BytesIO(IMAGE), "image/png"))],
+    ).json()["code"]
+
+    # then
+    assert client.get(f"/api/posts/{post.code}").json()["drawing_count"] == 1
+
+    # when
+    client.delete(f"/api/drawings/{drawing_code}")
+
+    # then
+    assert client.get(f"/api/posts/{post.code}").json()["drawing_count"] == 0
+
+
+def test_get_drawings_matches_get_drawing(client, db, authorized_user):
+    # given
+    post = Post(
+        author_id=authorized_user.id,
+        title="test title",
+        content="test content",
+    )
+    db.add(post)
+    db.flush()
+    drawing = Drawing(
+        post_id=post.id,
+        author_id=authorized_user.id,
+        content="test content",
+    )
+    db.add(drawing)
+    db.flush()
+    db.add_all(
+        [
+            Image(drawing_id=drawing.id, url="https://example.com/image.jpg"),
+            Image(
+                drawing_id=drawing.id,
+                url="https://example.com/deleted.jpg",
+                deleted_at=datetime.now(UTC),
+            ),
+        ]
+    )
+    db.flush()
+
+    # when
+    response = client.get(f"/api/drawings?post_code={post.code}")
+
+    # then - 목록은 컬럼만 읽지만 상세 조회와 같은 응답을 돌려줍니다.
+    item = response.json()["items"][0]
+    assert item == client.get(f"/api/drawings/{drawing.code}").json()
+    assert [image["url"] for image in item["images"]] == [
+        "https://example.com/image.jpg"
+    ]
+
+
+def test_get_drawing_not_modified(client, db, authorized_user):
+    # given
+    post = Post(
+        author_id=authorized_user.id,
+        title="test title",
+        content="test content",
+    )
+    db.add(post)
+    db.flush()
+    drawing = Drawing(
+        post_id=post.id,
+        author_id=authorized_user.id,
+        content="test content",
+    )
+    db.add(drawing)
+    db.flush()
+    etag = client.get(f"/api/drawings/{drawing.code}").headers["ETag"]
+
+    # when
+    response = client.get(
+        f"/api/drawings/{drawing.code}", headers={"If-None-Match": etag}
+    )
+
+    # then
+    assert response.status_code == 304
+
+    # when
+    db.add(Image(drawing_id=drawing.id, url="https://example.com/image.jpg"))
+    db.flush()
+    response = client.get(
+        f"/api/drawings/{drawing.code}", headers={"If-None-Match": etag}
+    )
+
+    # then
+    assert response.status_code == 200
+    assert len(response.json()["images"]) == 1
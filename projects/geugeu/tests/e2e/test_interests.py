@@ -1,7 +1,11 @@
+import asyncio
+
 import pytest
+from sqlalchemy import func, select
 
 from app.core.security import get_password_hash
 from app.models import Interest, Post, User
+from app.services.interests import InterestService
 
 
 @pytest.fixture()
@@ -41,6 +45,20 @@ def test_add_interest(client, authorized_user, post):
     assert response.json()["is_interested"] is True
 
 
+def test_toggle_interest_count(client, authorized_user, post):
+    # when
+    client.post(f"/api/posts/{post.code}/interests")
+
+    # then
+    assert client.get(f"/api/posts/{post.code}").json()["interest_count"] == 1
+
+    # when
+    client.post(f"/api/posts/{post.code}/interests")
+
+    # then
+    assert client.get(f"/api/posts/{post.code}").json()["interest_count"] == 0
+
+
 def test_remove_interest(client, db, authorized_user, post):
     # given - user already has interest
     interest = Interest(user_id=authorized_user.id, post_id=post.id)
@@ -228,6 +246,23 @@ def test_get_user_interests(client, db, user, another_user):
     assert "created_at" in first_interest
 
 
+def test_get_user_interests_without_count(client, db, user, post):
+    # given
+    db.add(Interest(user_id=user.id, post_id=post.id))
+    db.flush()
+
+    # when
+    response = client.get(
+        f"/api/users/{user.code}/interests",
+        params={"include_count": False},
+    )
+
+    # then
+    assert response.status_code == 200
+    assert "count" not in response.json()
+    assert len(response.json()["items"]) == 1
+
+
 def test_get_user_interests_user_not_found(client):
     # when
     response = client.get("/api/users/nonexistent_code/interests")
@@ -260,3 +295,31 @@ def test_soft_delete_interest(client, db, authorized_user, post):
     # then - verify count is 1
     response = client.get(f"/api/posts/{post.code}/interests?page_size=0")
     assert response.json()["count"] == 1
+
+
+def test_toggle_interest_concurrently(db, async_session_factory, user, post):
+    # given
+    async def toggle():
+        async with async_session_factory() as session:
+            return await InterestService(session).toggle_interest(user, post.code)
+
+    async def toggle_many(n):
+        return await asyncio.gather(*(toggle() for _ in range(n)))
+
+    # when - 여러 번 동시에 눌러도
+    for _ in range(5):
+        asyncio.run(toggle_many(8))
+
+    # then - 삭제되지 않은 관심은 하나를 넘지 않습니다.
+    active = db.scalar(
+        select(func.count())
+        .select_from(Interest)
+        .where(
+            Interest.user_id == user.id,
+            Interest.post_id == post.id,
+            Interest.deleted_at.is_(None),
+        )
+    )
+    assert active <= 1
+    db.refresh(post)
+    assert post.interest_count == active
@@ -0,0 +1,83 @@
+import io
+
+# 업로드는 파일 앞부분의 시그니처로 형식을 확인하므로 PNG 시그니처로 시작합니다.
+IMAGE = b"\x89PNG\r\n\x1a\nimagebytes"
+
+
+def test_get_metrics(client, db, authorized_user):
+    # given
+    authorized_user.is_admin = True
+
+    # when
+    response = client.get("/api/metrics")
+
+    # then
+    assert response.status_code == 200
+    assert response.json()["db"]["checked_out"] >= 0
+    assert "buckets" in response.json()["db"]["wait_seconds"]
+    assert set(response.json()["executors"]) == {
+        "crypto",
+        "s3",
+        "image",
+        "compression",
+    }
+    assert response.json()["executors"]["crypto"]["queued"] == 0
+    assert "hits" in response.json()["caches"]["users"]
+    assert "hit_ratio" in response.json()["caches"]["posts"]
+
+
+def test_get_metrics_after_login(client, db, user, raw_password, authorized_user):
+    # given
+    authorized_user.is_admin = True
+    before = client.get("/api/metrics").json()["executors"]["crypto"]["completed"]
+
+    # when
+    client.post(
+        "/api/auth/login",
+        data={"username": user.email, "password": raw_password},
+    )
+
+    # then
+    after = client.get("/api/metrics").json()["executors"]["crypto"]["completed"]
+    assert after == before + 1
+
+
+def test_get_metrics_after_uploads(client, db, authorized_user):
+    # given
+    authorized_user.is_admin = True
+    before = client.get("/api/metrics").json()["clients"]["s3"]
+
+    # when
+    for _ in range(2):
+        client.post(
+            "/api/posts",
+            data={"title": "test title", "content": "test content"},
+            files=[("files", ("test.png", io.BytesIO(IMAGE), "image/png"))],
+        )
+
+    # then
+    after = client.get("/api/metrics").json()["clients"]["s3"]
+    assert after["calls"] == before["calls"] + 2
+    assert after["requests"] == before["requests"] + 2
+    assert after["retries"] == before["retries"]
+    assert set(client.get("/api/metrics").json()["clients"]["http"]) == {
+        "requests",
+        "connections",
+        "reused",
+    }
+
+
+def test_get_metrics_403(client, authorized_user):
+    # when
+    response = client.get("/api/metrics")
+
+    # then
+    assert response.status_code == 403
+
+
+def test_get_metrics_401(client, user):
+    # when
+    response = client.get("/api/metrics")
+
+    # then
+    assert response.status_code == 401
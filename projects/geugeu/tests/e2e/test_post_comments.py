@@ -1,6 +1,16 @@
+import asyncio
 from datetime import UTC, datetime
 
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import func, select
+
+from app.core.config import settings
 from app.models import Comment, Post, User
+from app.schemas.post_comments import CreateCommentSchema
+from app.services.comment_threads import delete_comment_thread
+from app.services.counters import update_post_counts
+from app.services.post_comments import PostCommentService
 
 
 def test_create_comment(client, db, authorized_user):
@@ -88,6 +98,222 @@ def test_get_comments(client, db, authorized_user):
     assert len(response.json()["items"]) == 3
 
 
+def test_get_comments_with_replies(client, db, authorized_user):
+    # given
+    post = Post(
+        author_id=authorized_user.id,
+        title="test title",
+        content="test content",
+    )
+    db.add(post)
+    db.flush()
+
+    comment = Comment(
+        post_id=post.id,
+        author_id=authorized_user.id,
+        content="test comment",
+    )
+    db.add(comment)
+    db.flush()
+
+    replies = [
+        Comment(
+            post_id=post.id,
+            author_id=authorized_user.id,
+            parent_id=comment.id,
+            content=f"test reply {i}",
+        )
+        for i in range(2)
+    ]
+    db.add_all(replies)
+    db.flush()
+
+    # when
+    response = client.get(f"/api/posts/{post.code}/comments")
+
+    # then
+    assert response.status_code == 200
+    assert response.json()["count"] == 1
+    [item] = response.json()["items"]
+    assert item["code"] == comment.code
+    assert [reply["code"] for reply in item["replies"]] == [
+        reply.code for reply in replies
+    ]
+
+
+def test_get_comments_with_cursor(client, db, authorized_user):
+    # given
+    post = Post(
+        author_id=authorized_user.id,
+        title="test title",
+        content="test content",
+    )
+    db.add(post)
+    db.flush()
+
+    comments = [
+        Comment(
+            post_id=post.id,
+            author_id=authorized_user.id,
+            content=f"test comment {i}",
+        )
+        for i in range(3)
+    ]
+    db.add_all(comments)
+    db.flush()
+
+    # when
+    first = client.get(f"/api/posts/{post.code}/comments", params={"page_size": 2})
+    second = client.get(
+        f"/api/posts/{post.code}/comments",
+        params={"page_size": 2, "cursor": first.json()["next_cursor"]},
+    )
+
+    # then
+    assert first.json()["count"] == 3
+    assert [item["code"] for item in first.json()["items"]] == [
+        comments[0].code,
+        comments[1].code,
+    ]
+    assert [item["code"] for item in second.json()["items"]] == [comments[2].code]
+    assert second.json()["next_cursor"] is None
+
+
+def test_get_comments_with_reply_preview(client, db, authorized_user, monkeypatch):
+    # given
+    post = Post(
+        author_id=authorized_user.id,
+        title="test title",
+        content="test content",
+    )
+    db.add(post)
+    db.flush()
+
+    comment = Comment(
+        post_id=post.id,
+        author_id=authorized_user.id,
+        content="test comment",
+    )
+    db.add(comment)
+    db.flush()
+
+    replies = [
+        Comment(
+            post_id=post.id,
+            author_id=authorized_user.id,
+            parent_id=comment.id,
+            content=f"test reply {i}",
+        )
+        for i in range(5)
+    ]
+    db.add_all(replies)
+    db.flush()
+    monkeypatch.setattr(settings, "COMMENT_REPLY_PREVIEW_SIZE", 2)
+
+    # when
+    response = client.get(f"/api/posts/{post.code}/comments")
+
+    # then
+    assert response.status_code == 200
+    [item] = response.json()["items"]
+    assert item["reply_count"] == 5
+    assert [reply["code"] for reply in item["replies"]] == [
+        replies[0].code,
+        replies[1].code,
+    ]
+
+
+def test_get_replies(client, db, authorized_user):
+    # given
+    post = Post(
+        author_id=authorized_user.id,
+        title="test title",
+        content="test content",
+    )
+    db.add(post)
+    db.flush()
+
+    comment = Comment(
+        post_id=post.id,
+        author_id=authorized_user.id,
+        content="test comment",
+    )
+    db.add(comment)
+    db.flush()
+
+    replies = [
+        Comment(
+            post_id=post.id,
+            author_id=authorized_user.id,
+            parent_id=comment.id,
+            content=f"test reply {i}",
+        )
+        for i in range(5)
+    ]
+    db.add_all(replies)
+    db.flush()
+
+    # when
+    url = f"/api/posts/{post.code}/comments/{comment.code}/replies"
+    first = client.get(url, params={"page_size": 3})
+    second = client.get(
+        url,
+        params={"page_size": 3, "cursor": first.json()["next_cursor"]},
+    )
+
+    # then
+    assert first.status_code == 200
+    assert first.json()["count"] == 5
+    codes = [
+        item["code"]
+        for response in (first, second)
+        for item in response.json()["items"]
+    ]
+    assert codes == [reply.code for reply in replies]
+    assert second.json()["next_cursor"] is None
+
+
+def test_get_replies_404(client, db, authorized_user):
+    # given
+    post = Post(
+        author_id=authorized_user.id,
+        title="test title",
+        content="test content",
+    )
+    db.add(post)
+    db.flush()
+
+    # when
+    response = client.get(f"/api/posts/{post.code}/comments/abcd123/replies")
+
+    # then
+    assert response.status_code == 404
+
+
+@pytest.mark.parametrize("page_size", [0, 101])
+def test_get_comments_with_invalid_page_size(client, db, authorized_user, page_size):
+    # given
+    post = Post(author_id=authorized_user.id, title="title", content="content")
+    db.add(post)
+    db.flush()
+    comment = Comment(post_id=post.id, author_id=authorized_user.id, content="c")
+    db.add(comment)
+    db.flush()
+
+    # when
+    comments = client.get(
+        f"/api/posts/{post.code}/comments", params={"page_size": page_size}
+    )
+    replies = client.get(
+        f"/api/posts/{post.code}/comments/{comment.code}/replies",
+        params={"page_size": page_size},
+    )
+
+    # then
+    assert comments.status_code == 422
+    assert replies.status_code == 422
+
+
 def test_get_comments_401(client, user):
     # when
     response = client.get("/api/posts/abcd123/comments")
@@ -258,9 +484,93 @@ def test_delete_comment(client, db, authorized_user):
 
     # then
     assert response.status_code == 204
+    db.refresh(comment)
     assert comment.deleted_at is not None
 
 
+def test_delete_comment_with_replies(client, db, authorized_user):
+    # given
+    post = Post(
+        author_id=authorized_user.id,
+        title="test title",
+        content="test content",
+        comment_count=3,
+    )
+    db.add(post)
+    db.flush()
+
+    comment = Comment(
+        post_id=post.id,
+        author_id=authorized_user.id,
+        content="test comment",
+    )
+    db.add(comment)
+    db.flush()
+    reply = Comment(
+        post_id=post.id,
+        author_id=authorized_user.id,
+        parent_id=comment.id,
+        content="test reply",
+    )
+    db.add(reply)
+    db.flush()
+    nested_reply = Comment(
+        post_id=post.id,
+        author_id=authorized_user.id,
+        parent_id=reply.id,
+        content="test nested reply",
+    )
+    db.add(nested_reply)
+    db.flush()
+
+    # when
+    response = client.delete(f"/api/posts/{post.code}/comments/{comment.code}")
+
+    # then
+    assert response.status_code == 204
+    db.refresh(reply)
+    db.refresh(nested_reply)
+    assert reply.deleted_at is not None
+    assert nested_reply.deleted_at is not None
+    db.refresh(post)
+    assert post.comment_count == 0
+
+
+def test_delete_comment_of_other_post_404(client, db, authorized_user):
+    # given
+    post = Post(
+        author_id=authorized_user.id,
+        title="test title",
+        content="test content",
+    )
+    other_post = Post(
+        author_id=authorized_user.id,
+        title="other title",
+        content="other content",
+        comment_count=1,
+    )
+    db.add_all([post, other_post])
+    db.flush()
+
+    comment = Comment(
+        post_id=other_post.id,
+        author_id=authorized_user.id,
+        content="test comment",
+    )
+    db.add(comment)
+    db.flush()
+
+    # when
+    response = client.delete(f"/api/posts/{post.code}/comments/{comment.code}")
+
+    # then
+    assert response.status_code == 404
+    db.refresh(comment)
+    assert comment.deleted_at is None
+    db.refresh(other_post)
+    assert other_post.comment_count == 1
+
+
 def test_delete_comment_401(client, user):
     # when
     response = client.delete("/api/posts/abcd123/comments/abcd123")
@@ -301,6 +611,7 @@ def test_delete_comment_403(client, db, authorized_user):
 
     # then
     assert response.status_code == 403
+    db.refresh(comment)
     assert comment.deleted_at is None
 
 
@@ -339,3 +650,168 @@ def test_create_reply_comment(client, db, authorized_user):
     # then
     assert response.status_code == 201
     assert response.json()["content"] == "test reply"
+
+
+def test_comment_count(client, db, authorized_user):
+    # given
+    post = Post(
+        author_id=authorized_user.id,
+        title="test title",
+        content="test content",
+    )
+    db.add(post)
+    db.flush()
+    comment_code = client.post(
+        f"/api/posts/{post.code}/comments",
+        json={"content": "test comment"},
+    ).json()["code"]
+    client.post(
+        f"/api/posts/{post.code}/comments",
+        json={"content": "test reply", "parent_code": comment_code},
+    )
+    assert client.get(f"/api/posts/{post.code}").json()["comment_count"] == 2
+
+    # when
+    client.delete(f"/api/posts/{post.code}/comments/{comment_code}")
+    response = client.delete(f"/api/posts/{post.code}/comments/{comment_code}")
+
+    # then - 답글도 함께 빼고, 이미 삭제한 댓글은 다시 빼지 않습니다.
+    assert response.status_code == 404
+    assert client.get(f"/api/posts/{post.code}").json()["comment_count"] == 0
+
+
+def test_create_reply_while_deleting_thread(db, async_session_factory, user):
+    # given - 댓글 > 답글 > 답글
+    post = Post(
+        author_id=user.id,
+        title="test title",
+        content="test content",
+        comment_count=3,
+    )
+    db.add(post)
+    db.flush()
+    parent_id = None
+    for content in ["test comment", "test reply", "test nested reply"]:
+        comment = Comment(
+            post_id=post.id,
+            author_id=user.id,
+            parent_id=parent_id,
+            content=content,
+        )
+        db.add(comment)
+        db.flush()
+        parent_id = comment.id
+    root = db.scalar(select(Comment).where(Comment.content == "test comment"))
+
+    async def race():
+        async with (
+            async_session_factory() as deleting,
+            async_session_factory() as replying,
+        ):
+            # 최상위 댓글을 잠그고 삭제하는 중에
+            await deleting.execute(
+                select(Comment).where(Comment.id == root.id).with_for_update()
+            )
+            reply = asyncio.create_task(
+                PostCommentService(replying).create_comment(
+                    user=user,
+                    post_code=post.code,
+                    payload=CreateCommentSchema(
+                        content="late reply", parent_code=comment.code
+                    ),
+                )
+            )
+            await asyncio.sleep(0.5)
+            deleted = await delete_comment_thread(deleting, root.id, datetime.now(UTC))
+            await deleting.execute(update_post_counts(post.id, comment_count=-deleted))
+            await deleting.commit()
+            with pytest.raises(HTTPException) as exc_info:
+                await reply
+            return exc_info.value
+
+    # when - 가장 깊은 답글에 답글을 달면
+    error = asyncio.run(race())
+
+    # then - 삭제가 끝난 뒤 다시 확인해서 거절하고, 살아 있는 댓글이 남지 않습니다.
+    assert error.status_code == 400
+    live = db.scalar(
+        select(func.count())
+        .select_from(Comment)
+        .where(Comment.post_id == post.id, Comment.deleted_at.is_(None))
+    )
+    assert live == 0
+    db.refresh(post)
+    assert post.comment_count == 0
+
+
+def test_get_comments_not_modified(client, db, authorized_user):
+    # given
+    post = Post(
+        author_id=authorized_user.id,
+        title="test title",
+        content="test content",
+    )
+    db.add(post)
+    db.flush()
+    comment_code = client.post(
+        f"/api/posts/{post.code}/comments",
+        json={"content": "test comment"},
+    ).json()["code"]
+    etag = client.get(f"/api/posts/{post.code}/comments").headers["ETag"]
+
+    # when
+    response = client.get(
+        f"/api/posts/{post.code}/comments", headers={"If-None-Match": etag}
+    )
+
+    # then
+    assert response.status_code == 304
+
+    # when - 댓글을 고치면 다시 보냅니다.
+    client.put(
+        f"/api/posts/{post.code}/comments/{comment_code}",
+        json={"content": "new comment"},
+    )
+    response = client.get(
+        f"/api/posts/{post.code}/comments", headers={"If-None-Match": etag}
+    )
+
+    # then
+    assert response.status_code == 200
+    assert response.json()["items"][0]["content"] == "new comment"
+    etag = response.headers["ETag"]
+
+    # when - 답글 목록도 같은 ETag를 씁니다.
+    response = client.get(
+        f"/api/posts/{post.code}/comments/{comment_code}/replies",
+        headers={"If-None-Match": etag},
+    )
+
+    # then
+    assert response.status_code == 304
+
+
+def test_get_comments_after_author_updated(client, db, authorized_user):
+    # given
+    post = Post(
+        author_id=authorized_user.id,
+        title="test title",
+        content="test content",
+    )
+    db.add(post)
+    db.flush()
+    client.post(
+        f"/api/posts/{post.code}/comments",
+        json={"content": "test comment"},
+    )
+    etag = client.get(f"/api/posts/{post.code}/comments").headers["ETag"]
+
+    # when - 작성자가 닉네임을 바꾸면 다시 보냅니다.
+    client.put("/api/users/me", json={"nickname": "new nickname"})
+    response = client.get(
+        f"/api/posts/{post.code}/comments", headers={"If-None-Match": etag}
+    )
+
+    # then
+    assert response.status_code == 200
+    assert response.json()["items"][0]["author"]["nickname"] == "new nickname"
@@ -1,7 +1,23 @@
+import asyncio
 import io
-
+from datetime import UTC, datetime
+
+import boto3
+import pytest
+from boto3.s3.transfer import TransferConfig
+from botocore.exceptions import ClientError
+from fastapi import HTTPException
+from PIL import Image as PILImage
+from sqlalchemy import func, select, text
+
+from app import utils
+from app.core.cache import post_cache, writer_cache
+from app.core.config import settings
 from app.core.security import get_password_hash
-from app.models import Image, Post, User
+from app.models import Image, Interest, Post, User
+
+# 업로드는 파일 앞부분의 시그니처로 형식을 확인하므로 PNG 시그니처로 시작합니다.
+IMAGE = b"\x89PNG\r\n\x1a\nimagebytes"
 
 
 def test_create_post(client, authorized_user):
@@ -14,7 +30,7 @@ def test_create_post(client, authorized_user):
         "/api/posts",
         data={"title": title, "content": content},
         files=[
-            ("files", ("test.png", io.BytesIO(b"imagebytes"), "image/png")),
+            ("files", ("test.png", io.BytesIO(IMAGE), "image/png")),
         ],
     )
 
@@ -25,6 +41,206 @@ def test_create_post(client, authorized_user):
     assert len(response.json()["images"]) == 1
 
 
+def test_create_post_cleans_up_uploaded_images(
+    client, db, authorized_user, monkeypatch
+):
+    # given
+    uploaded = []
+    put_file = utils._put_file
+
+    def put_or_fail(s3_client, file, content_type):
+        if file.filename == "broken.png":
+            raise HTTPException(status_code=500, detail="Failed to upload image")
+        url = put_file(s3_client, file, content_type)
+        uploaded.append(url)
+        return url
+
+    monkeypatch.setattr(utils, "_put_file", put_or_fail)
+
+    # when
+    response = client.post(
+        "/api/posts",
+        data={"title": "test title", "content": "test content"},
+        files=[
+            ("files", ("test1.png", io.BytesIO(IMAGE), "image/png")),
+            ("files", ("broken.png", io.BytesIO(IMAGE), "image/png")),
+            ("files", ("test2.png", io.BytesIO(IMAGE), "image/png")),
+        ],
+    )
+
+    # then
+    assert response.status_code == 500
+    assert db.scalar(select(func.count()).select_from(Post)) == 0
+    assert len(uploaded) == 2
+    s3_client = boto3.client("s3")
+    for url in uploaded:
+        with pytest.raises(ClientError):
+            s3_client.head_object(
+                Bucket=settings.AWS_S3_BUCKET_NAME, Key=utils._file_key(url)
+            )
+
+
+def test_create_post_with_mislabeled_file(client, db, authorized_user, monkeypatch):
+    # given
+    uploaded = []
+    monkeypatch.setattr(
+        utils, "_put_file", lambda *args: uploaded.append(args) or "url"
+    )
+
+    # when - 파일 하나라도 이미지가 아니면 아무것도 올리지 않습니다.
+    response = client.post(
+        "/api/posts",
+        data={"title": "test title", "content": "test content"},
+        files=[
+            ("files", ("test.png", io.BytesIO(IMAGE), "image/png")),
+            ("files", ("script.png", io.BytesIO(b"<script></script>"), "image/png")),
+        ],
+    )
+
+    # then
+    assert response.status_code == 415
+    assert uploaded == []
+    assert db.scalar(select(func.count()).select_from(Post)) == 0
+
+
+def test_create_post_stores_sniffed_content_type(client, authorized_user):
+    # given
+    buffer = io.BytesIO()
+    PILImage.new("RGB", (10, 10), "red").save(buffer, format="JPEG")
+
+    # when
+    response = client.post(
+        "/api/posts",
+        data={"title": "test title", "content": "test content"},
+        files=[("files", ("test.png", io.BytesIO(buffer.getvalue()), "image/png"))],
+    )
+
+    # then
+    assert response.status_code == 201
+    s3_object = boto3.client("s3").head_object(
+        Bucket=settings.AWS_S3_BUCKET_NAME,
+        Key=utils._file_key(response.json()["images"][0]["url"]),
+    )
+    assert s3_object["ContentType"] == "image/jpeg"
+
+
+def test_create_post_with_image_derivatives(client, authorized_user, run_jobs):
+    # given
+    buffer = io.BytesIO()
+    PILImage.new("RGB", (800, 600), "red").save(buffer, format="PNG")
+    response = client.post(
+        "/api/posts",
+        data={"title": "test title", "content": "test content"},
+        files=[("files", ("test.png", io.BytesIO(buffer.getvalue()), "image/png"))],
+    )
+    assert response.json()["images"][0]["variants"] == []
+
+    # when
+    assert run_jobs() == 1
+
+    # then
+    response = client.get(f"/api/posts/{response.json()['code']}")
+    image = response.json()["images"][0]
+    assert (image["width"], image["height"]) == (800, 600)
+    assert image["size"] == len(buffer.getvalue())
+    assert [
+        (variant["format"], variant["width"], variant["height"])
+        for variant in image["variants"]
+    ] == [
+        ("webp", 320, 240),
+        ("jpeg", 320, 240),
+        ("webp", 640, 480),
+        ("jpeg", 640, 480),
+    ]
+    s3_client = boto3.client("s3")
+    for variant in image["variants"]:
+        s3_object = s3_client.head_object(
+            Bucket=settings.AWS_S3_BUCKET_NAME, Key=utils._file_key(variant["url"])
+        )
+        assert s3_object["ContentLength"] == variant["size"]
+        assert s3_object["ContentType"] == f"image/{variant['format']}"
+
+
+def test_create_post_with_undecodable_image(client, authorized_user, run_jobs):
+    # given
+    response = client.post(
+        "/api/posts",
+        data={"title": "test title", "content": "test content"},
+        files=[("files", ("test.png", io.BytesIO(IMAGE), "image/png"))],
+    )
+
+    # when
+    assert run_jobs() == 1
+
+    # then
+    response = client.get(f"/api/posts/{response.json()['code']}")
+    image = response.json()["images"][0]
+    assert image["width"] is None
+    assert image["size"] == len(IMAGE)
+    assert image["variants"] == []
+
+
+def test_create_post_with_large_image(client, authorized_user, monkeypatch):
+    # given
+    chunk_size = 5 * 1024 * 1024
+    monkeypatch.setattr(
+        utils,
+        "_TRANSFER_CONFIG",
+        TransferConfig(
+            multipart_threshold=chunk_size,
+            multipart_chunksize=chunk_size,
+            use_threads=False,
+        ),
+    )
+    content = b"\x89PNG\r\n\x1a\n" + b"x" * (chunk_size + 1024)
+
+    # when
+    response = client.post(
+        "/api/posts",
+        data={"title": "test title", "content": "test content"},
+        files=[("files", ("large.png", io.BytesIO(content), "image/png"))],
+    )
+
+    # then
+    assert response.status_code == 201
+    url = response.json()["images"][0]["url"]
+    s3_object = boto3.client("s3").head_object(
+        Bucket=settings.AWS_S3_BUCKET_NAME, Key=utils._file_key(url)
+    )
+    assert s3_object["ContentLength"] == len(content)
+    assert s3_object["ContentType"] == "image/png"
+    # multipart upload로 올린 객체의 ETag는 "<hash>-<part 수>" 형식입니다.
+    assert s3_object["ETag"].strip('"').endswith("-2")
+
+
+def test_create_post_with_too_large_image(client, db, authorized_user, monkeypatch):
+    # given
+    monkeypatch.setattr(settings, "UPLOAD_MAX_SIZE", 5)
+
+    # when
+    response = client.post(
+        "/api/posts",
+        data={"title": "test title", "content": "test content"},
+        files=[("files", ("test.png", io.BytesIO(IMAGE), "image/png"))],
+    )
+
+    # then
+    assert response.status_code == 413
+    assert db.scalar(select(func.count()).select_from(Post)) == 0
+
+
+def test_create_post_with_unsupported_file_type(client, authorized_user):
+    # when
+    response = client.post(
+        "/api/posts",
+        data={"title": "test title", "content": "test content"},
+        files=[("files", ("test.txt", io.BytesIO(b"text"), "text/plain"))],
+    )
+
+    # then
+    assert response.status_code == 415
+
+
 def test_create_post_401(client, user):
     # when
     response = client.post(
@@ -61,6 +277,105 @@ def test_get_posts(client, db, authorized_user):
     assert len(response.json()["items"]) == 3
 
 
+def test_get_posts_compressed(client, db, authorized_user):
+    # given
+    posts = [
+        Post(
+            author_id=authorized_user.id,
+            title="test title",
+            content="test content " * 20,
+        )
+        for _ in range(10)
+    ]
+    db.add_all(posts)
+    db.flush()
+
+    # when
+    response = client.get("/api/posts", headers={"Accept-Encoding": "gzip, br"})
+
+    # then
+    assert response.status_code == 200
+    assert response.headers["Content-Encoding"] == "br"
+    assert int(response.headers["Content-Length"]) < len(response.content)
+    assert len(response.json()["items"]) == 10
+
+
+def test_get_posts_is_interested(client, db, authorized_user):
+    # given
+    posts = [
+        Post(
+            author_id=authorized_user.id,
+            title="test title",
+            content="test content",
+        )
+        for _ in range(3)
+    ]
+    db.add_all(posts)
+    db.flush()
+    db.add(Interest(user_id=authorized_user.id, post_id=posts[1].id))
+    db.flush()
+
+    # when
+    response = client.get("/api/posts")
+
+    # then
+    assert response.status_code == 200
+    assert {
+        item["code"]: item["is_interested"] for item in response.json()["items"]
+    } == {posts[0].code: False, posts[1].code: True, posts[2].code: False}
+
+
+def test_get_posts_matches_get_post(client, db, authorized_user):
+    # given
+    post = Post(
+        author_id=authorized_user.id,
+        title="test title",
+        content="test content",
+        comment_count=2,
+    )
+    db.add(post)
+    db.flush()
+    variant = {
+        "url": "https://example.com/image/320w.webp",
+        "format": "WEBP",
+        "width": 320,
+        "height": 240,
+        "size": 100,
+    }
+    db.add_all(
+        [
+            Image(
+                post_id=post.id,
+                url="https://example.com/image.jpg",
+                width=640,
+                height=480,
+                size=1000,
+                variants=[variant],
+            ),
+            Image(post_id=post.id, url="https://example.com/other.jpg"),
+            Image(
+                post_id=post.id,
+                url="https://example.com/deleted.jpg",
+                deleted_at=datetime.now(UTC),
+            ),
+        ]
+    )
+    db.flush()
+
+    # when
+    response = client.get("/api/posts")
+
+    # then - 목록은 컬럼만 읽지만 상세 조회와 같은 응답을 돌려줍니다.
+    item = response.json()["items"][0]
+    assert item == client.get(f"/api/posts/{post.code}").json()
+    assert [image["url"] for image in item["images"]] == [
+        "https://example.com/image.jpg",
+        "https://example.com/other.jpg",
+    ]
+    assert item["images"][0]["variants"] == [variant]
+    assert item["comment_count"] == 2
+
+
 def test_get_posts_with_author_code(client, db, authorized_user):
     # given
     other_user = User(
@@ -107,6 +422,200 @@ def test_get_posts_401(client, user):
     assert response.status_code == 401
 
 
+def test_get_posts_without_count(client, db, authorized_user):
+    # given
+    db.add(Post(author_id=authorized_user.id, title="title", content="content"))
+    db.flush()
+
+    # when
+    response = client.get("/api/posts", params={"include_count": False})
+
+    # then
+    assert response.status_code == 200
+    assert response.json()["count"] is None
+    assert len(response.json()["items"]) == 1
+
+
+def test_get_posts_with_estimated_count(client, db, authorized_user, monkeypatch):
+    # given
+    db.add_all(
+        [
+            Post(author_id=authorized_user.id, title="title", content="content")
+            for _ in range(3)
+        ]
+        + [
+            Post(
+                author_id=authorized_user.id,
+                title="title",
+                content="content",
+                deleted_at=datetime.now(UTC),
+            )
+            for _ in range(2)
+        ]
+    )
+    db.flush()
+    db.execute(text("ANALYZE post"))
+    # 통계를 갱신한 뒤 추가된 게시글은 추정치에 반영되지 않습니다.
+    db.add(Post(author_id=authorized_user.id, title="title", content="content"))
+    db.flush()
+    monkeypatch.setattr(settings, "ESTIMATED_COUNT_MIN_ROWS", 0)
+
+    # when
+    unfiltered = client.get("/api/posts")
+    filtered = client.get("/api/posts", params={"author_code": authorized_user.code})
+
+    # then
+    assert unfiltered.json()["count"] == 3
+    assert filtered.json()["count"] == 4
+
+
+def test_get_posts_with_cursor(client, db, authorized_user):
+    # given
+    posts = [
+        Post(author_id=authorized_user.id, title=f"title {i}", content="content")
+        for i in range(5)
+    ]
+    db.add_all(posts)
+    db.flush()
+
+    # when
+    first = client.get("/api/posts", params={"page_size": 2})
+    second = client.get(
+        "/api/posts",
+        params={"page_size": 2, "cursor": first.json()["next_cursor"]},
+    )
+    third = client.get(
+        "/api/posts",
+        params={"page_size": 2, "cursor": second.json()["next_cursor"]},
+    )
+
+    # then
+    codes = [
+        item["code"]
+        for response in (first, second, third)
+        for item in response.json()["items"]
+    ]
+    assert codes == [post.code for post in reversed(posts)]
+    assert third.json()["count"] == 5
+    assert third.json()["next_cursor"] is None
+
+
+def test_get_posts_with_cursor_400(client, db, authorized_user):
+    # given
+    db.add_all(
+        [
+            Post(author_id=authorized_user.id, title="title", content="content")
+            for _ in range(2)
+        ]
+    )
+    db.flush()
+    cursor = client.get("/api/posts", params={"page_size": 1}).json()["next_cursor"]
+
+    # when
+    invalid = client.get("/api/posts", params={"cursor": "invalid"})
+    other_filters = client.get(
+        "/api/posts",
+        params={"cursor": cursor, "author_code": "other"},
+    )
+
+    # then
+    assert invalid.status_code == 400
+    assert other_filters.status_code == 400
+
+
+def test_get_posts_with_zero_page_size(client, db, authorized_user):
+    # given
+    db.add(Post(author_id=authorized_user.id, title="title", content="content"))
+    db.flush()
+
+    # when - page_size가 0이면 개수만 돌려줍니다.
+    response = client.get("/api/posts", params={"page_size": 0})
+
+    # then
+    assert response.status_code == 200
+    assert response.json()["count"] == 1
+    assert response.json()["items"] == []
+    assert response.json()["next_cursor"] is None
+
+
+@pytest.mark.parametrize("params", [{"page_size": -1}, {"page_size": 101}, {"page": 0}])
+def test_get_posts_with_invalid_page(client, authorized_user, params):
+    # when
+    response = client.get("/api/posts", params=params)
+
+    # then
+    assert response.status_code == 422
+
+
+def test_get_posts_from_replica(client, db, authorized_user, replica):
+    # given
+    db.add(Post(author_id=authorized_user.id, title="title", content="content"))
+    db.flush()
+
+    # when
+    response = client.get("/api/posts")
+
+    # then
+    assert response.status_code == 200
+    assert response.json()["count"] == 1
+    assert any("FROM post" in statement for statement in replica)
+
+
+def test_get_posts_after_write_from_primary(client, authorized_user, replica):
+    # given
+    client.post(
+        "/api/posts",
+        data={"title": "title", "content": "content"},
+        files=[("files", ("test.png", io.BytesIO(IMAGE), "image/png"))],
+    )
+    replica.clear()
+
+    # when
+    response = client.get("/api/posts")
+
+    # then
+    assert response.status_code == 200
+    assert response.json()["count"] == 1
+    assert replica == []
+
+
+def test_get_posts_after_interest_from_primary(client, db, authorized_user, replica):
+    # given
+    post = Post(author_id=authorized_user.id, title="title", content="content")
+    db.add(post)
+    db.flush()
+    client.post(f"/api/posts/{post.code}/interests")
+    replica.clear()
+
+    # when - 관심은 CTE로 쓰지만 쓰기로 기록되어 primary에서 읽습니다.
+    posts = client.get("/api/posts")
+    detail = client.get(f"/api/posts/{post.code}")
+
+    # then
+    assert posts.json()["items"][0]["is_interested"] is True
+    assert detail.json()["interest_count"] == 1
+    assert replica == []
+
+
+def test_get_posts_after_sticky_expired_from_replica(client, authorized_user, replica):
+    # given
+    client.post(
+        "/api/posts",
+        data={"title": "title", "content": "content"},
+        files=[("files", ("test.png", io.BytesIO(IMAGE), "image/png"))],
+    )
+    assert asyncio.run(writer_cache.get(str(authorized_user.id))) is True
+    asyncio.run(writer_cache.set(str(authorized_user.id), True, ttl=0))
+    replica.clear()
+
+    # when
+    response = client.get("/api/posts")
+
+    # then
+    assert response.status_code == 200
+    assert any("FROM post" in statement for statement in replica)
+
+
 def test_get_post(client, db, authorized_user):
     # given
     post = Post(
@@ -137,6 +646,191 @@ def test_get_post(client, db, authorized_user):
     assert len(response.json()["images"]) == len(images)
 
 
+def test_get_post_is_interested(client, db, authorized_user):
+    # given
+    post = Post(
+        author_id=authorized_user.id,
+        title="test title",
+        content="test content",
+    )
+    db.add(post)
+    db.flush()
+
+    # when
+    response = client.get(f"/api/posts/{post.code}")
+
+    # then
+    assert response.json()["is_interested"] is False
+
+    # when
+    db.add(Interest(user_id=authorized_user.id, post_id=post.id))
+    db.flush()
+    response = client.get(f"/api/posts/{post.code}")
+
+    # then
+    assert response.json()["is_interested"] is True
+
+
+def test_get_post_not_modified(client, db, authorized_user):
+    # given
+    post = Post(
+        author_id=authorized_user.id,
+        title="test title",
+        content="test content",
+    )
+    db.add(post)
+    db.flush()
+    response = client.get(f"/api/posts/{post.code}")
+    etag = response.headers["ETag"]
+    assert response.headers["Last-Modified"]
+
+    # when
+    response = client.get(f"/api/posts/{post.code}", headers={"If-None-Match": etag})
+
+    # then
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["ETag"] == etag
+
+    # when - updated_at을 바꾸지 않는 관심 수가 바뀌어도 다시 보냅니다.
+    client.post(f"/api/posts/{post.code}/interests")
+    response = client.get(f"/api/posts/{post.code}", headers={"If-None-Match": etag})
+
+    # then
+    assert response.status_code == 200
+    assert response.json()["interest_count"] == 1
+    assert response.headers["ETag"] != etag
+
+
+def test_get_post_from_cache(client, db, authorized_user):
+    # given
+    post = Post(
+        author_id=authorized_user.id,
+        title="test title",
+        content="test content",
+    )
+    db.add(post)
+    db.flush()
+    db.add(Image(post_id=post.id, url="https://example.com/image.jpg"))
+    db.flush()
+    first = client.get(f"/api/posts/{post.code}")
+    hits = post_cache.stats()["hits"]
+
+    # when
+    response = client.get(f"/api/posts/{post.code}")
+
+    # then
+    assert response.status_code == 200
+    assert response.content == first.content
+    assert post_cache.stats()["hits"] == hits + 1
+
+
+def test_get_post_from_cache_reads_state_once(client, db, authorized_user, replica):
+    # given
+    post = Post(
+        author_id=authorized_user.id,
+        title="test title",
+        content="test content",
+    )
+    db.add(post)
+    db.flush()
+    client.get(f"/api/posts/{post.code}")
+    replica.clear()
+
+    # when
+    response = client.get(f"/api/posts/{post.code}")
+
+    # then - ETag와 캐시 key를 한 번 읽은 상태로 함께 만듭니다.
+    assert response.status_code == 200
+    assert len([statement for statement in replica if "FROM post" in statement]) == 1
+
+
+def test_get_post_from_cache_with_current_counts(client, db, authorized_user):
+    # given
+    post = Post(
+        author_id=authorized_user.id,
+        title="test title",
+        content="test content",
+    )
+    db.add(post)
+    db.flush()
+    client.get(f"/api/posts/{post.code}")
+    hits = post_cache.stats()["hits"]
+
+    # when
+    client.post(f"/api/posts/{post.code}/interests")
+
+    # then
+    response = client.get(f"/api/posts/{post.code}")
+    assert response.json()["interest_count"] == 1
+    assert response.json()["is_interested"] is True
+    assert post_cache.stats()["hits"] == hits + 1
+
+
+def test_get_post_after_update_not_from_cache(client, db, authorized_user):
+    # given
+    post = Post(
+        author_id=authorized_user.id,
+        title="test title",
+        content="test content",
+    )
+    db.add(post)
+    db.flush()
+    client.get(f"/api/posts/{post.code}")
+
+    # when
+    client.put(
+        f"/api/posts/{post.code}",
+        data={"title": "new title", "content": "new content"},
+        files=[("files", ("test.png", io.BytesIO(IMAGE), "image/png"))],
+    )
+
+    # then
+    response = client.get(f"/api/posts/{post.code}")
+    assert response.json()["title"] == "new title"
+    assert post_cache.stats()["size"] == 1
+
+
+def test_get_post_after_author_update_not_from_cache(client, db, authorized_user):
+    # given
+    post = Post(
+        author_id=authorized_user.id,
+        title="test title",
+        content="test content",
+    )
+    db.add(post)
+    db.flush()
+    client.get(f"/api/posts/{post.code}")
+
+    # when
+    client.put("/api/users/me", json={"nickname": "geugeugood"})
+
+    # then
+    response = client.get(f"/api/posts/{post.code}")
+    assert response.json()["author"]["nickname"] == "geugeugood"
+
+
+def test_get_post_after_image_derivatives_not_from_cache(
+    client, authorized_user, run_jobs
+):
+    # given
+    buffer = io.BytesIO()
+    PILImage.new("RGB", (800, 600), "red").save(buffer, format="PNG")
+    code = client.post(
+        "/api/posts",
+        data={"title": "test title", "content": "test content"},
+        files=[("files", ("test.png", buffer.getvalue(), "image/png"))],
+    ).json()["code"]
+    client.get(f"/api/posts/{code}")
+
+    # when
+    run_jobs()
+
+    # then
+    response = client.get(f"/api/posts/{code}")
+    assert response.json()["images"][0]["variants"] != []
+
+
 def test_get_post_401(client, user):
     # when
     response = client.get("/api/posts/abcd123")
@@ -183,8 +877,8 @@ def test_update_post(client, db, authorized_user):
             "content": "new content",
         },
         files=[
-            ("files", ("test1.png", io.BytesIO(b"imagebytes"), "image/png")),
-            ("files", ("test2.png", io.BytesIO(b"imagebytes"), "image/png")),
+            ("files", ("test1.png", io.BytesIO(IMAGE), "image/png")),
+            ("files", ("test2.png", io.BytesIO(IMAGE), "image/png")),
         ],
     )
 
@@ -195,6 +889,70 @@ def test_update_post(client, db, authorized_user):
     assert len(response.json()["images"]) == 2
 
 
+def test_update_post_deletes_replaced_images(client, authorized_user, run_jobs):
+    # given
+    response = client.post(
+        "/api/posts",
+        data={"title": "test title", "content": "test content"},
+        files=[("files", ("test1.png", io.BytesIO(IMAGE), "image/png"))],
+    )
+    code = response.json()["code"]
+    old_url = response.json()["images"][0]["url"]
+    client.put(
+        f"/api/posts/{code}",
+        data={"title": "new title", "content": "new content"},
+        files=[("files", ("test2.png", io.BytesIO(IMAGE), "image/png"))],
+    )
+    s3_client = boto3.client("s3")
+    s3_client.head_object(
+        Bucket=settings.AWS_S3_BUCKET_NAME, Key=utils._file_key(old_url)
+    )
+
+    # when
+    run_jobs()
+
+    # then
+    with pytest.raises(ClientError):
+        s3_client.head_object(
+            Bucket=settings.AWS_S3_BUCKET_NAME, Key=utils._file_key(old_url)
+        )
+    new_url = client.get(f"/api/posts/{code}").json()["images"][0]["url"]
+    s3_client.head_object(
+        Bucket=settings.AWS_S3_BUCKET_NAME, Key=utils._file_key(new_url)
+    )
+
+
+def test_update_post_keeps_images_still_referenced(
+    client, db, authorized_user, run_jobs
+):
+    # given
+    response = client.post(
+        "/api/posts",
+        data={"title": "test title", "content": "test content"},
+        files=[("files", ("test1.png", io.BytesIO(IMAGE), "image/png"))],
+    )
+    code = response.json()["code"]
+    url = response.json()["images"][0]["url"]
+    other_post = Post(author_id=authorized_user.id, title="other", content="other")
+    db.add(other_post)
+    db.flush()
+    db.add(Image(post_id=other_post.id, url=url))
+    db.flush()
+
+    # when
+    client.put(
+        f"/api/posts/{code}",
+        data={"title": "new title", "content": "new content"},
+        files=[("files", ("test2.png", io.BytesIO(IMAGE), "image/png"))],
+    )
+    run_jobs()
+
+    # then - 다른 이미지가 아직 참조하는 파일은 지우지 않습니다.
+    boto3.client("s3").head_object(
+        Bucket=settings.AWS_S3_BUCKET_NAME, Key=utils._file_key(url)
+    )
+
+
 def test_update_post_403(client, db, authorized_user, hashed_password):
     # given
     author = User(
@@ -220,8 +978,8 @@ def test_update_post_403(client, db, authorized_user, hashed_password):
             "content": "new content",
         },
         files=[
-            ("files", ("test1.png", io.BytesIO(b"imagebytes"), "image/png")),
-            ("files", ("test2.png", io.BytesIO(b"imagebytes"), "image/png")),
+            ("files", ("test1.png", io.BytesIO(IMAGE), "image/png")),
+            ("files", ("test2.png", io.BytesIO(IMAGE), "image/png")),
         ],
     )
 
@@ -256,8 +1014,8 @@ def test_update_post_by_admin(client, db, authorized_user, hashed_password):
             "content": "new content",
         },
         files=[
-            ("files", ("test1.png", io.BytesIO(b"imagebytes"), "image/png")),
-            ("files", ("test2.png", io.BytesIO(b"imagebytes"), "image/png")),
+            ("files", ("test1.png", io.BytesIO(IMAGE), "image/png")),
+            ("files", ("test2.png", io.BytesIO(IMAGE), "image/png")),
         ],
     )
 
@@ -274,8 +1032,8 @@ def test_update_post_401(client, user):
             "content": "new content",
         },
         files=[
-            ("files", ("test1.png", io.BytesIO(b"imagebytes"), "image/png")),
-            ("files", ("test2.png", io.BytesIO(b"imagebytes"), "image/png")),
+            ("files", ("test1.png", io.BytesIO(IMAGE), "image/png")),
+            ("files", ("test2.png", io.BytesIO(IMAGE), "image/png")),
         ],
     )
 
@@ -295,8 +1053,8 @@ def test_update_post_404(client, authorized_user):
             "content": "new content",
         },
         files=[
-            ("files", ("test1.png", io.BytesIO(b"imagebytes"), "image/png")),
-            ("files", ("test2.png", io.BytesIO(b"imagebytes"), "image/png")),
+            ("files", ("test1.png", io.BytesIO(IMAGE), "image/png")),
+            ("files", ("test2.png", io.BytesIO(IMAGE), "image/png")),
         ],
     )
 
@@ -0,0 +1,296 @@
+import boto3
+import httpx
+
+from app import utils
+from app.core.config import settings
+from app.models import Job, Post
+
+# 업로드는 파일 앞부분의 시그니처로 형식을 확인하므로 PNG 시그니처로 시작합니다.
+IMAGE = b"\x89PNG\r\n\x1a\nimagebytes"
+
+
+def upload(client, files):
+    response = client.post(
+        "/api/uploads",
+        json={
+            "files": [
+                {"filename": name, "content_type": "image/png", "size": len(content)}
+                for name, content in files
+            ]
+        },
+    )
+    assert response.status_code == 201
+    for item, (_, content) in zip(response.json()["items"], files, strict=True):
+        s3_response = httpx.put(item["url"], content=content, headers=item["headers"])
+        assert s3_response.status_code == 200
+    return [item["key"] for item in response.json()["items"]]
+
+
+def test_create_uploads(client, authorized_user):
+    # when
+    response = client.post(
+        "/api/uploads",
+        json={
+            "files": [
+                {"filename": "test1.png", "content_type": "image/png", "size": 10},
+                {"filename": "test2.png", "content_type": "image/png", "size": 10},
+            ]
+        },
+    )
+
+    # then
+    assert response.status_code == 201
+    items = response.json()["items"]
+    assert len(items) == 2
+    assert items[0]["key"].startswith(f"uploads/{authorized_user.code}/")
+    assert items[0]["key"].endswith(".png")
+    assert items[0]["headers"] == {"Content-Type": "image/png"}
+
+
+def test_create_uploads_with_unsupported_file_type(client, authorized_user):
+    # when
+    response = client.post(
+        "/api/uploads",
+        json={
+            "files": [
+                {"filename": "test.txt", "content_type": "text/plain", "size": 10},
+            ]
+        },
+    )
+
+    # then
+    assert response.status_code == 415
+
+
+def test_create_uploads_401(client, user):
+    # when
+    response = client.post(
+        "/api/uploads",
+        json={
+            "files": [
+                {"filename": "test.png", "content_type": "image/png", "size": 10},
+            ]
+        },
+    )
+
+    # then
+    assert response.status_code == 401
+
+
+def test_create_post_with_uploaded_images(client, authorized_user):
+    # given
+    keys = upload(client, [("test1.png", IMAGE), ("test2.png", IMAGE + b"2")])
+
+    # when
+    response = client.post(
+        "/api/posts",
+        data={"title": "test title", "content": "test content", "image_keys": keys},
+    )
+
+    # then
+    assert response.status_code == 201
+    urls = [image["url"] for image in response.json()["images"]]
+    assert len(urls) == 2
+    assert {url.rsplit("/", 1)[1] for url in urls} == {
+        key.rsplit("/", 1)[1] for key in keys
+    }
+
+
+def test_create_post_with_missing_upload(client, db, authorized_user):
+    # given
+    response = client.post(
+        "/api/uploads",
+        json={
+            "files": [
+                {"filename": "test.png", "content_type": "image/png", "size": 10},
+            ]
+        },
+    )
+    key = response.json()["items"][0]["key"]
+
+    # when
+    response = client.post(
+        "/api/posts",
+        data={"title": "test title", "content": "test content", "image_keys": [key]},
+    )
+
+    # then
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Image is not uploaded"
+    assert db.query(Post).count() == 0
+
+
+def test_create_post_with_uploaded_non_image(client, db, authorized_user):
+    # given
+    keys = upload(client, [("test.png", b"<script></script>")])
+
+    # when
+    response = client.post(
+        "/api/posts",
+        data={"title": "test title", "content": "test content", "image_keys": keys},
+    )
+
+    # then
+    assert response.status_code == 415
+    assert db.query(Post).count() == 0
+
+
+def test_create_post_with_other_users_upload(client, authorized_user):
+    # when
+    response = client.post(
+        "/api/posts",
+        data={
+            "title": "test title",
+            "content": "test content",
+            "image_keys": ["uploads/other/test.png"],
+        },
+    )
+
+    # then
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid image key"
+
+
+def test_create_post_without_images(client, authorized_user):
+    # when
+    response = client.post(
+        "/api/posts",
+        data={"title": "test title", "content": "test content"},
+    )
+
+    # then
+    assert response.status_code == 400
+
+
+def test_create_drawing_with_uploaded_images(client, db, authorized_user):
+    # given
+    post = Post(
+        author_id=authorized_user.id,
+        title="test title",
+        content="test content",
+    )
+    db.add(post)
+    db.flush()
+    keys = upload(client, [("test.png", IMAGE)])
+
+    # when
+    response = client.post(
+        "/api/drawings",
+        data={"post_code": post.code, "content": "test content", "image_keys": keys},
+    )
+
+    # then
+    assert response.status_code == 201
+    assert len(response.json()["images"]) == 1
+
+
+def test_update_profile_image_with_uploaded_image(client, authorized_user):
+    # given
+    [key] = upload(client, [("profile.png", IMAGE)])
+
+    # when
+    response = client.put("/api/users/me/profile-image", data={"image_key": key})
+
+    # then
+    assert response.status_code == 200
+    assert response.json()["profile_image_url"].endswith(key)
+
+
+def test_create_post_with_used_upload(client, db, authorized_user):
+    # given
+    keys = upload(client, [("test.png", IMAGE)])
+    client.post(
+        "/api/posts",
+        data={"title": "test title", "content": "test content", "image_keys": keys},
+    )
+
+    # when - 이미 붙인 key는 다른 post에 다시 붙일 수 없습니다.
+    response = client.post(
+        "/api/posts",
+        data={"title": "other title", "content": "test content", "image_keys": keys},
+    )
+
+    # then
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Image key already used"
+    assert db.query(Post).count() == 1
+
+
+def test_create_post_with_duplicate_upload_keys(client, db, authorized_user):
+    # given
+    keys = upload(client, [("test.png", IMAGE)])
+
+    # when
+    response = client.post(
+        "/api/posts",
+        data={
+            "title": "test title",
+            "content": "test content",
+            "image_keys": keys * 2,
+        },
+    )
+
+    # then
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Image key already used"
+    assert db.query(Post).count() == 0
+
+
+def test_create_post_with_profile_image_upload(client, db, authorized_user):
+    # given
+    keys = upload(client, [("profile.png", IMAGE)])
+    client.put("/api/users/me/profile-image", data={"image_key": keys[0]})
+
+    # when
+    response = client.post(
+        "/api/posts",
+        data={"title": "test title", "content": "test content", "image_keys": keys},
+    )
+
+    # then
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Image key already used"
+
+
+def test_update_profile_image_with_used_upload(client, authorized_user):
+    # given
+    keys = upload(client, [("test.png", IMAGE)])
+    client.post(
+        "/api/posts",
+        data={"title": "test title", "content": "test content", "image_keys": keys},
+    )
+
+    # when
+    response = client.put("/api/users/me/profile-image", data={"image_key": keys[0]})
+
+    # then
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Image key already used"
+
+
+def test_update_post_with_own_image_key(client, db, authorized_user):
+    # given
+    keys = upload(client, [("test.png", IMAGE)])
+    response = client.post(
+        "/api/posts",
+        data={"title": "test title", "content": "test content", "image_keys": keys},
+    )
+    code = response.json()["code"]
+    url = response.json()["images"][0]["url"]
+
+    # when
+    response = client.put(
+        f"/api/posts/{code}",
+        data={"title": "new title", "content": "new content", "image_keys": keys},
+    )
+
+    # then - 거절하고 기존 이미지와 파일을 그대로 둡니다.
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Image key already used"
+    assert [
+        image["url"] for image in client.get(f"/api/posts/{code}").json()["images"]
+    ] == [url]
+    assert db.query(Job).filter(Job.kind == "delete_files").count() == 0
+    boto3.client("s3").head_object(
+        Bucket=settings.AWS_S3_BUCKET_NAME, Key=utils._file_key(url)
+    )
@@ -2,6 +2,7 @@ from datetime import UTC, datetime
 
 import pytest
 
+from app.core.cache import user_cache
 from app.models import User
 
 
@@ -117,6 +118,21 @@ def test_get_me_401(client, user):
     assert response.status_code == 401
 
 
+def test_get_me_with_cached_user(client, user, auth_headers):
+    # given
+    client.get("/api/users/me", headers=auth_headers)
+    hits = user_cache.stats()["hits"]
+
+    # when
+    response = client.get("/api/users/me", headers=auth_headers)
+
+    # then
+    assert response.status_code == 200
+    assert response.json()["code"] == user.code
+    assert response.json()["email"] == user.email
+    assert user_cache.stats()["hits"] == hits + 1
+
+
 def test_update_me(client, authorized_user):
     # given
     new_nickname = "geugeugood"
@@ -129,6 +145,18 @@ def test_update_me(client, authorized_user):
     assert response.json()["nickname"] == new_nickname
 
 
+def test_update_me_invalidates_cached_user(client, user, auth_headers):
+    # given
+    client.get("/api/users/me", headers=auth_headers)
+
+    # when
+    client.put("/api/users/me", json={"nickname": "geugeugood"}, headers=auth_headers)
+
+    # then
+    response = client.get("/api/users/me", headers=auth_headers)
+    assert response.json()["nickname"] == "geugeugood"
+
+
 def test_update_me_401(client, user):
     # given
     new_nickname = "geugeugood"
@@ -152,6 +180,18 @@ def test_delete_me(client, db, authorized_user):
     assert authorized_user.deleted_at is not None
 
 
+def test_delete_me_invalidates_cached_user(client, user, auth_headers):
+    # given
+    client.get("/api/users/me", headers=auth_headers)
+
+    # when
+    client.delete("/api/users/me", headers=auth_headers)
+
+    # then
+    response = client.get("/api/users/me", headers=auth_headers)
+    assert response.status_code == 401
+
+
 def test_delete_me_401(client, user):
     # when
     response = client.delete("/api/users/me")
@@ -0,0 +1,153 @@
+import gzip
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, Response
+from fastapi.testclient import TestClient
+
+from app.core.compression import CompressionMiddleware, choose_encoding, compress
+from app.core.executors import BoundedExecutor
+from app.core.responses import FastJSONResponse
+
+BODY = {"items": [{"title": "제목", "content": "content " * 20}] * 20}
+
+
+@pytest.fixture()
+def executor():
+    executor = BoundedExecutor("test-compression", 1)
+    yield executor
+    executor.shutdown()
+
+
+def create_client(executor: BoundedExecutor, **options) -> TestClient:
+    app = FastAPI()
+    app.add_middleware(
+        CompressionMiddleware,
+        executor=executor,
+        **{
+            "minimum_size": 100,
+            "content_types": ["application/json"],
+            "offload_size": 1024 * 1024,
+            "gzip_level": 6,
+            "brotli_quality": 4,
+        }
+        | options,
+    )
+
+    @app.get("/json")
+    def get_json():
+        return FastJSONResponse(BODY, headers={"ETag": '"strong"'})
+
+    @app.get("/small")
+    def get_small():
+        return FastJSONResponse({"ok": True})
+
+    @app.get("/text")
+    def get_text():
+        return PlainTextResponse("text " * 100)
+
+    @app.get("/encoded")
+    def get_encoded():
+        body = gzip.compress(b"x" * 1000)
+        return Response(
+            body,
+            media_type="application/json",
+            headers={"Content-Encoding": "gzip"},
+        )
+
+    return TestClient(app)
+
+
+@pytest.mark.parametrize(
+    ("accept_encoding", "expected"),
+    [
+        ("gzip, deflate, br", "br"),
+        ("gzip", "gzip"),
+        ("br;q=0.5, gzip", "gzip"),
+        ("br;q=0, gzip;q=0", None),
+        ("*", "br"),
+        ("*;q=0, gzip", "gzip"),
+        ("identity", None),
+        ("", None),
+    ],
+)
+def test_choose_encoding(accept_encoding, expected):
+    assert choose_encoding(accept_encoding) == expected
+
+
+@pytest.mark.parametrize("encoding", ["br", "gzip"])
+def test_compress_json(executor, encoding):
+    # given
+    client = create_client(executor)
+    body = FastJSONResponse(BODY).body
+
+    # when
+    response = client.get("/json", headers={"Accept-Encoding": encoding})
+
+    # then
+    assert response.headers["Content-Encoding"] == encoding
+    assert response.headers["Vary"] == "Accept-Encoding"
+    assert response.headers["ETag"] == 'W/"strong"'
+    assert int(response.headers["Content-Length"]) == len(
+        compress(body, encoding, 6, 4)
+    )
+    assert response.content == body
+    assert executor.stats()["completed"] == 0
+
+
+def test_compress_large_body_in_executor(executor):
+    # given
+    client = create_client(executor, offload_size=1000)
+
+    # when
+    response = client.get("/json", headers={"Accept-Encoding": "br"})
+
+    # then
+    assert response.headers["Content-Encoding"] == "br"
+    assert response.json() == BODY
+    assert executor.stats()["completed"] == 1
+
+
+@pytest.mark.parametrize(
+    ("path", "accept_encoding"),
+    [
+        ("/small", "br"),
+        ("/json", "identity"),
+    ],
+)
+def test_not_compress(executor, path, accept_encoding):
+    # given
+    client = create_client(executor)
+
+    # when
+    response = client.get(path, headers={"Accept-Encoding": accept_encoding})
+
+    # then
+    assert "Content-Encoding" not in response.headers
+    assert response.headers["Vary"] == "Accept-Encoding"
+    assert int(response.headers["Content-Length"]) == len(response.content)
+
+
+def test_not_compress_content_type(executor):
+    # given
+    client = create_client(executor)
+
+    # when
+    response = client.get("/text", headers={"Accept-Encoding": "br"})
+
+    # then
+    assert "Content-Encoding" not in response.headers
+    assert "Vary" not in response.headers
+    assert response.text == "text " * 100
+
+
+def test_not_compress_encoded_response(executor):
+    # given
+    client = create_client(executor)
+
+    # when
+    response = client.get("/encoded", headers={"Accept-Encoding": "br"})
+
+    # then
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert response.content == b"x" * 1000
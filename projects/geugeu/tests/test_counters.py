@@ -0,0 +1,49 @@
+import asyncio
+
+from app.models import Comment, Drawing, Interest, Post
+from app.services.counters import reconcile_counts
+
+
+def test_reconcile_counts(db, async_session_factory, user):
+    # given - 서비스를 거치지 않고 추가해서 수가 맞지 않는 행
+    posts = [Post(author_id=user.id, title="", content="") for _ in range(3)]
+    db.add_all(posts)
+    db.flush()
+    drawing = Drawing(post_id=posts[0].id, author_id=user.id, content="")
+    db.add(drawing)
+    db.flush()
+    db.add_all(
+        [
+            Interest(user_id=user.id, post_id=posts[0].id),
+            Comment(author_id=user.id, post_id=posts[0].id, content=""),
+            Comment(author_id=user.id, post_id=posts[0].id, content=""),
+            Comment(author_id=user.id, drawing_id=drawing.id, content=""),
+        ]
+    )
+    posts[2].comment_count = 5
+    db.flush()
+    updated_at = posts[0].updated_at
+
+    # when
+    async def reconcile():
+        async with async_session_factory() as session:
+            return await reconcile_counts(session, batch_size=2)
+
+    fixed = asyncio.run(reconcile())
+
+    # then
+    assert fixed == 3
+    for row in [*posts, drawing]:
+        db.refresh(row)
+    assert (posts[0].interest_count, posts[0].comment_count) == (1, 2)
+    assert posts[0].drawing_count == 1
+    assert posts[2].comment_count == 0
+    assert drawing.comment_count == 1
+    # 수만 바뀐 것은 수정으로 보지 않습니다.
+    assert posts[0].updated_at == updated_at
+
+    # when - 이미 맞는 수는 고치지 않습니다.
+    fixed = asyncio.run(reconcile())
+
+    # then
+    assert fixed == 0
@@ -0,0 +1,39 @@
+import io
+
+from PIL import Image
+
+from app.images import make_derivatives
+
+
+def image_bytes(width: int, height: int) -> bytes:
+    buffer = io.BytesIO()
+    Image.new("RGB", (width, height), "red").save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def test_make_derivatives():
+    # when
+    info = make_derivatives(image_bytes(800, 600), [320, 1280], 80)
+
+    # then
+    assert info is not None
+    assert (info.width, info.height) == (800, 600)
+    assert [(d.format, d.width, d.height) for d in info.derivatives] == [
+        ("webp", 320, 240),
+        ("jpeg", 320, 240),
+    ]
+
+
+def test_make_derivatives_undecodable():
+    assert make_derivatives(b"imagebytes", [320], 80) is None
+
+
+def test_make_derivatives_decompression_bomb(monkeypatch):
+    # given
+    monkeypatch.setattr(Image, "MAX_IMAGE_PIXELS", 100)
+
+    # when
+    info = make_derivatives(image_bytes(20, 20), [10], 80)
+
+    # then
+    assert info is None
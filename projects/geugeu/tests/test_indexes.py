@@ -0,0 +1,187 @@
+import pytest
+from sqlalchemy import select, text
+from sqlalchemy.dialects import postgresql
+
+from app.models import Comment, Drawing, Image, Interest, Post
+from app.services.comment_threads import comment_list_state
+
+ACTIVE_POSTS_BY_AUTHOR = (
+    select(Post)
+    .where(Post.author_id == 1, Post.deleted_at.is_(None))
+    .order_by(Post.id.desc())
+    .limit(10)
+)
+ACTIVE_DRAWINGS_BY_POST = (
+    select(Drawing)
+    .where(Drawing.post_id == 1, Drawing.deleted_at.is_(None))
+    .order_by(Drawing.id.desc())
+    .limit(10)
+)
+ACTIVE_DRAWINGS_BY_AUTHOR = (
+    select(Drawing)
+    .where(Drawing.author_id == 1, Drawing.deleted_at.is_(None))
+    .order_by(Drawing.id.desc())
+    .limit(10)
+)
+ACTIVE_IMAGES_BY_POST = select(Image).where(
+    Image.post_id.in_([1, 2]), Image.deleted_at.is_(None)
+)
+ACTIVE_IMAGES_BY_DRAWING = select(Image).where(
+    Image.drawing_id.in_([1, 2]), Image.deleted_at.is_(None)
+)
+ACTIVE_TOP_LEVEL_COMMENTS_BY_POST = (
+    select(Comment)
+    .where(
+        Comment.post_id == 1,
+        Comment.parent_id.is_(None),
+        Comment.deleted_at.is_(None),
+    )
+    .order_by(Comment.created_at, Comment.id)
+    .limit(20)
+)
+ACTIVE_REPLIES_BY_POST = (
+    select(Comment)
+    .where(
+        Comment.post_id == 1,
+        Comment.parent_id == 1,
+        Comment.deleted_at.is_(None),
+    )
+    .order_by(Comment.created_at, Comment.id)
+    .limit(20)
+)
+ACTIVE_TOP_LEVEL_COMMENTS_BY_DRAWING = (
+    select(Comment)
+    .where(
+        Comment.drawing_id == 1,
+        Comment.parent_id.is_(None),
+        Comment.deleted_at.is_(None),
+    )
+    .order_by(Comment.created_at, Comment.id)
+    .limit(20)
+)
+ACTIVE_REPLIES_BY_DRAWING = (
+    select(Comment)
+    .where(
+        Comment.drawing_id == 1,
+        Comment.parent_id == 1,
+        Comment.deleted_at.is_(None),
+    )
+    .order_by(Comment.created_at, Comment.id)
+    .limit(20)
+)
+ACTIVE_INTERESTS_BY_POST = (
+    select(Interest)
+    .where(Interest.post_id == 1, Interest.deleted_at.is_(None))
+    .order_by(Interest.created_at.desc())
+    .limit(10)
+)
+ACTIVE_INTERESTS_BY_USER = (
+    select(Interest)
+    .where(Interest.user_id == 1, Interest.deleted_at.is_(None))
+    .order_by(Interest.created_at.desc())
+    .limit(10)
+)
+
+# comment_list_validator가 실행하는 쿼리
+COMMENT_VALIDATOR_BY_POST = comment_list_state(Comment.post_id == 1)
+COMMENT_VALIDATOR_BY_DRAWING = comment_list_state(Comment.drawing_id == 1)
+
+
+SEED = [
+    'INSERT INTO "user" (code, email, nickname, is_admin, profile_image_url)'
+    " SELECT 'u' || i, 'u' || i || '@example.com', '', false, ''"
+    " FROM generate_series(1, 100) AS i",
+    "INSERT INTO post (code, author_id, title, content)"
+    " SELECT 'p' || i, i % 100 + 1, '', '' FROM generate_series(1, 1000) AS i",
+    # 유저는 post마다 삭제되지 않은 drawing을 하나만 가집니다.
+    "INSERT INTO drawing (code, post_id, author_id, content)"
+    " SELECT 'd' || i, i % 1000 + 1, i / 1000 % 100 + 1, ''"
+    " FROM generate_series(1, 5000) AS i",
+    "INSERT INTO image (code, post_id, drawing_id, url)"
+    " SELECT 'i' || i,"
+    " CASE WHEN i % 2 = 0 THEN i % 1000 + 1 END,"
+    " CASE WHEN i % 2 = 1 THEN i % 5000 + 1 END, ''"
+    " FROM generate_series(1, 10000) AS i",
+    "INSERT INTO comment (code, author_id, post_id, drawing_id, content)"
+    " SELECT 'c' || i, i % 100 + 1,"
+    " CASE WHEN i % 2 = 0 THEN i % 1000 + 1 END,"
+    " CASE WHEN i % 2 = 1 THEN i % 5000 + 1 END, ''"
+    " FROM generate_series(1, 10000) AS i",
+    "INSERT INTO interest (code, user_id, post_id)"
+    " SELECT 'n' || i, i % 100 + 1, i / 5 % 1000 + 1 FROM generate_series(1, 5000) AS i",
+    "UPDATE comment SET parent_id = id - 2 WHERE id % 3 = 0",
+    # 삭제된 행은 부분 인덱스에 들어가지 않습니다.
+    "UPDATE comment SET deleted_at = now() WHERE id % 10 = 0",
+    "ANALYZE",
+]
+
+
+QUERIES = {
+    "ix_post_author_id_id": ACTIVE_POSTS_BY_AUTHOR,
+    "ix_drawing_post_id_id": ACTIVE_DRAWINGS_BY_POST,
+    "ix_drawing_author_id_id": ACTIVE_DRAWINGS_BY_AUTHOR,
+    "ix_image_post_id": ACTIVE_IMAGES_BY_POST,
+    "ix_image_drawing_id": ACTIVE_IMAGES_BY_DRAWING,
+    "ix_comment_top_level_post_id_created_at": ACTIVE_TOP_LEVEL_COMMENTS_BY_POST,
+    "ix_comment_post_id_parent_id_created_at": ACTIVE_REPLIES_BY_POST,
+    "ix_comment_top_level_drawing_id_created_at": ACTIVE_TOP_LEVEL_COMMENTS_BY_DRAWING,
+    "ix_comment_drawing_id_parent_id_created_at": ACTIVE_REPLIES_BY_DRAWING,
+    "ix_interest_post_id_created_at": ACTIVE_INTERESTS_BY_POST,
+    "ix_interest_user_id_created_at": ACTIVE_INTERESTS_BY_USER,
+}
+VALIDATOR_QUERIES = {
+    "ix_comment_post_id_updated_at": COMMENT_VALIDATOR_BY_POST,
+    "ix_comment_drawing_id_updated_at": COMMENT_VALIDATOR_BY_DRAWING,
+}
+
+
+@pytest.fixture(scope="module")
+def plans(engine) -> dict[str, str]:
+    # 실제와 비슷한 통계를 만든 뒤 실행 계획을 모으고, 데이터는 롤백합니다.
+    plans = {}
+    with engine.connect() as connection:
+        transaction = connection.begin()
+        for statement in SEED:
+            connection.execute(text(statement))
+        # 테스트 데이터가 작아서 순차 스캔이나 bitmap scan 후 정렬하는 계획을 고를 수
+        # 있으므로, 인덱스만으로 조건과 정렬을 처리할 수 있는지 확인합니다.
+        connection.execute(text("SET LOCAL enable_seqscan = off"))
+        connection.execute(text("SET LOCAL enable_bitmapscan = off"))
+        for index_name, stmt in QUERIES.items():
+            sql = stmt.compile(
+                dialect=postgresql.dialect(),
+                compile_kwargs={"literal_binds": True},
+            )
+            rows = connection.execute(text(f"EXPLAIN {sql}")).scalars().all()
+            plans[index_name] = "\n".join(rows)
+        transaction.rollback()
+    return plans
+
+
+@pytest.mark.parametrize("index_name", QUERIES)
+def test_list_query_uses_partial_index(plans, index_name):
+    # when
+    plan = plans[index_name]
+
+    # then
+    assert index_name in plan
+    assert "Sort" not in plan
+
+
+@pytest.mark.parametrize("index_name", VALIDATOR_QUERIES)
+def test_comment_list_validator_reads_index_only(db, index_name):
+    # given - index-only scan은 visibility map이 있어야 하므로 커밋하고 VACUUM합니다.
+    # 데이터는 db fixture가 테스트가 끝나면 지웁니다.
+    for statement in SEED[:-1]:
+        db.execute(text(statement))
+    db.execute(text("VACUUM ANALYZE"))
+    sql = VALIDATOR_QUERIES[index_name].compile(
+        dialect=postgresql.dialect(),
+        compile_kwargs={"literal_binds": True},
+    )
+
+    # when
+    plan = "\n".join(db.execute(text(f"EXPLAIN {sql}")).scalars().all())
+
+    # then - 작성자를 함께 읽어도 댓글 행은 읽지 않고 인덱스만으로 ETag를 만듭니다.
+    assert f"Index Only Scan using {index_name}" in plan
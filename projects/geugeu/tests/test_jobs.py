@@ -0,0 +1,133 @@
+import asyncio
+from datetime import UTC, datetime
+
+import pytest
+from sqlalchemy import select
+
+from app.core import jobs
+from app.core.config import settings
+from app.core.jobs import enqueue, run_next_job, run_pending_jobs
+from app.models import Job
+
+
+@pytest.fixture()
+def handlers(monkeypatch):
+    registry: dict = {}
+    monkeypatch.setattr(jobs, "handlers", registry)
+    return registry
+
+
+def add_jobs(async_session_factory, *payloads, kind="test"):
+    async def add():
+        async with async_session_factory() as session:
+            for payload in payloads:
+                enqueue(session, kind, payload)
+            await session.commit()
+
+    asyncio.run(add())
+
+
+def test_run_pending_jobs(db, async_session_factory, handlers):
+    # given
+    seen = []
+
+    async def handle(ctx, payload):
+        seen.append(payload["n"])
+
+    handlers["test"] = handle
+    add_jobs(async_session_factory, {"n": 1}, {"n": 2})
+
+    # when
+    count = asyncio.run(run_pending_jobs(async_session_factory, None))
+
+    # then
+    assert count == 2
+    assert seen == [1, 2]
+    assert db.scalars(select(Job)).all() == []
+
+
+def test_run_job_with_retry(db, async_session_factory, handlers):
+    # given
+    async def handle(ctx, payload):
+        raise RuntimeError("boom")
+
+    handlers["test"] = handle
+    add_jobs(async_session_factory, {})
+
+    # when
+    count = asyncio.run(run_pending_jobs(async_session_factory, None))
+
+    # then
+    assert count == 1
+    job = db.scalars(select(Job)).one()
+    assert job.attempts == 1
+    assert job.failed_at is None
+    assert "boom" in job.last_error
+    # 다시 시도할 시각이 될 때까지는 꺼내지 않습니다.
+    assert job.run_at > datetime.now(UTC)
+    assert not asyncio.run(run_next_job(async_session_factory, None))
+
+
+def test_run_job_until_max_attempts(db, async_session_factory, handlers, monkeypatch):
+    # given
+    monkeypatch.setattr(settings, "JOB_MAX_ATTEMPTS", 2)
+    monkeypatch.setattr(settings, "JOB_RETRY_BASE_SECONDS", 0)
+
+    async def handle(ctx, payload):
+        raise RuntimeError("boom")
+
+    handlers["test"] = handle
+    add_jobs(async_session_factory, {})
+
+    # when
+    count = asyncio.run(run_pending_jobs(async_session_factory, None))
+
+    # then
+    assert count == 2
+    job = db.scalars(select(Job)).one()
+    assert job.attempts == 2
+    assert job.failed_at is not None
+
+
+def test_run_job_rolls_back_handler_writes(db, async_session_factory, handlers):
+    # given
+    async def handle(ctx, payload):
+        enqueue(ctx.db, "other", {})
+        await ctx.db.flush()
+        raise RuntimeError("boom")
+
+    handlers["test"] = handle
+    add_jobs(async_session_factory, {})
+
+    # when
+    asyncio.run(run_next_job(async_session_factory, None))
+
+    # then
+    assert [job.kind for job in db.scalars(select(Job))] == ["test"]
+
+
+def test_run_jobs_concurrently_skips_locked(db, async_session_factory, handlers):
+    # given
+    seen = []
+
+    async def handle(ctx, payload):
+        # 두 워커가 동시에 작업을 잡고 있는 동안 같은 작업을 꺼내지 않아야 합니다.
+        seen.append(payload["n"])
+        await asyncio.sleep(0.2)
+
+    handlers["test"] = handle
+    add_jobs(async_session_factory, {"n": 1}, {"n": 2})
+
+    # when
+    async def run_two():
+        return await asyncio.gather(
+            run_next_job(async_session_factory, None),
+            run_next_job(async_session_factory, None),
+        )
+
+    results = asyncio.run(run_two())
+
+    # then
+    assert results == [True, True]
+    assert sorted(seen) == [1, 2]
+    assert db.scalars(select(Job)).all() == []
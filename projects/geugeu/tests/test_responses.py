@@ -0,0 +1,58 @@
+from datetime import UTC, datetime, timedelta, timezone
+
+from fastapi import Request
+
+from app.core.responses import FastJSONResponse, Validator
+from app.schemas.posts import PostListSchema, PostSchema, UserSchema
+
+
+def test_render_schema_like_pydantic():
+    # given
+    post = PostSchema(
+        code="code",
+        author=UserSchema(code="user", email="user@example.com"),
+        title="제목",
+        content="content",
+        images=[],
+        is_interested=None,
+        created_at=datetime(2026, 1, 1, 0, 0, 0, 120000, tzinfo=UTC),
+        updated_at=datetime(2026, 1, 1, 9, tzinfo=timezone(timedelta(hours=9))),
+    )
+    page = PostListSchema(items=[post], next_cursor="cursor")
+
+    # when
+    response = FastJSONResponse(page)
+
+    # then
+    assert response.body == page.model_dump_json().encode()
+    assert response.media_type == "application/json"
+
+
+def test_render_pre_encoded_bytes():
+    # when
+    response = FastJSONResponse(b'{"cached":true}')
+
+    # then
+    assert response.body == b'{"cached":true}'
+
+
+def test_validator_not_modified():
+    # given
+    updated_at = datetime(2026, 1, 1, 9, tzinfo=timezone(timedelta(hours=9)))
+    validator = Validator.create([updated_at, None], 3)
+
+    def request(if_none_match):
+        headers = [] if if_none_match is None else [(b"if-none-match", if_none_match)]
+        return Request({"type": "http", "headers": headers})
+
+    # then
+    assert validator.headers["Last-Modified"] == "Thu, 01 Jan 2026 00:00:00 GMT"
+    assert validator.not_modified(request(None)) is None
+    assert validator.not_modified(request(b'W/"other"')) is None
+    for header in [validator.etag, validator.etag.removeprefix("W/"), b"*"]:
+        if isinstance(header, str):
+            header = f'W/"other", {header}'.encode()
+        assert validator.not_modified(request(header)).status_code == 304
+    # 값이 하나라도 다르면 ETag도 다릅니다.
+    assert Validator.create([updated_at, None], 4).etag != validator.etag
+    assert Validator.create([None, updated_at], 3).etag != validator.etag